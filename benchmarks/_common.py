@@ -0,0 +1,89 @@
+"""Shared helpers for the Aldes benchmarks (run without Home Assistant)."""
+
+import json
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parent.parent
+PAYLOADS = Path(__file__).resolve().parent / "payloads"
+
+# Mock Home Assistant before custom_components is imported, like the tests do
+for _module in (
+    "homeassistant",
+    "homeassistant.const",
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.data_entry_flow",
+    "homeassistant.util",
+    "homeassistant.util.dt",
+    "homeassistant.helpers",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.entity_registry",
+    "homeassistant.helpers.device_registry",
+    "homeassistant.helpers.entity",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.storage",
+    "homeassistant.components",
+    "homeassistant.components.http",
+    "homeassistant.components.sensor",
+    "homeassistant.components.sensor.const",
+    "homeassistant.components.binary_sensor",
+    "homeassistant.components.climate",
+    "homeassistant.components.climate.const",
+    "homeassistant.components.select",
+    "homeassistant.components.number",
+    "homeassistant.components.button",
+    "homeassistant.components.text",
+    "voluptuous",
+):
+    sys.modules.setdefault(_module, MagicMock())
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def load_payload(name: str) -> list[dict[str, Any]]:
+    """Return a recorded /products payload from benchmarks/payloads."""
+    return json.loads((PAYLOADS / f"{name}.json").read_text(encoding="utf-8"))
+
+
+def payload_names() -> list[str]:
+    """Return the names of all recorded payloads."""
+    return sorted(path.stem for path in PAYLOADS.glob("*.json"))
+
+
+def measure(func: Callable[[], Any], repeat: int = 200) -> dict[str, float]:
+    """Run func repeatedly and return timing statistics in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Return mean, median and worst of timing samples in milliseconds."""
+    return {
+        "mean": statistics.fmean(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+    }
+
+
+def report(title: str, rows: dict[str, dict[str, float]]) -> None:
+    """Print timing statistics as a small table."""
+    print(f"\n{title}")
+    print(f"{'case':<32}{'mean ms':>12}{'median ms':>12}{'max ms':>12}")
+    for name, stats in rows.items():
+        print(
+            f"{name:<32}{stats['mean']:>12.3f}{stats['median']:>12.3f}"
+            f"{stats['max']:>12.3f}"
+        )
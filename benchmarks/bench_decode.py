@@ -0,0 +1,67 @@
+"""
+/products decoding benchmark: raw response bytes to device models.
+
+Measures one poll over the recorded AIR and AquaAIR payloads, and over
+synthetic accounts of 10 and 100 devices built from them:
+
+- json decode: standard library json.loads of the raw bytes
+- orjson decode: orjson.loads of the raw bytes (skipped if not installed)
+- decode + parse: the decoder used by the API, then typed model building
+- decode + update: the same, updating the devices of the previous poll
+
+Usage: python benchmarks/bench_decode.py
+"""
+
+import copy
+import json
+
+from _common import load_payload, measure, payload_names, report
+
+from custom_components.aldes import decoder
+from custom_components.aldes.api import parse_products, update_products
+
+
+def _raw(products: list) -> bytes:
+    """Return a payload encoded like the API response body."""
+    return json.dumps(products).encode("utf-8")
+
+
+def _account(devices: int) -> list:
+    """Return a payload of the given number of devices from the corpus."""
+    corpus = [item for name in payload_names() for item in load_payload(name)]
+    products = []
+    for index in range(devices):
+        item = copy.deepcopy(corpus[index % len(corpus)])
+        item["modem"] = f"{item['modem']}-{index}"
+        products.append(item)
+    return products
+
+
+def main() -> None:
+    """Run the benchmark on the corpus and on large accounts."""
+    cases = {name: load_payload(name) for name in payload_names()}
+    cases["10 devices"] = _account(10)
+    cases["100 devices"] = _account(100)
+
+    rows: dict[str, dict[str, float]] = {}
+    for name, products in cases.items():
+        raw = _raw(products)
+        previous = parse_products(decoder.loads(raw))
+        rows[f"{name} json decode"] = measure(lambda raw=raw: json.loads(raw))
+        if decoder.orjson is not None:
+            rows[f"{name} orjson decode"] = measure(
+                lambda raw=raw: decoder.orjson.loads(raw)
+            )
+        rows[f"{name} decode + parse"] = measure(
+            lambda raw=raw: parse_products(decoder.loads(raw))
+        )
+        rows[f"{name} decode + update"] = measure(
+            lambda raw=raw, previous=previous: update_products(
+                decoder.loads(raw), previous
+            )
+        )
+    report(f"/products poll, decoder backend: {decoder.JSON_BACKEND}", rows)
+
+
+if __name__ == "__main__":
+    main()
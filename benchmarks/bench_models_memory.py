@@ -0,0 +1,95 @@
+"""
+Model memory benchmark: footprint of the coordinator data per device.
+
+Parses a /products payload of 1, 10 and 100 devices, built from the
+recorded payloads, and reports with tracemalloc:
+
+- bytes per device: memory kept alive by the parsed models, excluding the
+  raw payload (which is kept anyway for the snapshot)
+- blocks per device: memory blocks kept alive by the parsed models
+- allocations per parse: memory blocks the parse leaves allocated
+- peak bytes per parse: highest traced memory while parsing, which also
+  covers the temporary allocations
+
+The same statistics are reported for a poll that updates the devices of
+the previous one from an unchanged payload (update_products), which reuses
+the models instead of rebuilding them.
+
+Usage: python benchmarks/bench_models_memory.py
+"""
+
+import copy
+import gc
+import tracemalloc
+from typing import Any
+
+from _common import load_payload, payload_names
+
+from custom_components.aldes.api import parse_products, update_products
+
+
+def _products(devices: int) -> list[dict[str, Any]]:
+    """Return a payload of the given number of devices with distinct modems."""
+    recorded = [item for name in payload_names() for item in load_payload(name)]
+    products = []
+    for index in range(devices):
+        item = copy.deepcopy(recorded[index % len(recorded)])
+        item["modem"] = f"{item['modem']}-{index}"
+        products.append(item)
+    return products
+
+
+def _allocated_blocks(snapshot: tracemalloc.Snapshot) -> int:
+    """Return the number of live blocks of a snapshot."""
+    return sum(stat.count for stat in snapshot.statistics("filename"))
+
+
+def _measure(
+    products: list[dict[str, Any]], previous: dict[str, Any] | None = None
+) -> dict[str, float]:
+    """Return the memory statistics of parsing or updating from a payload."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    start_size, _ = tracemalloc.get_traced_memory()
+
+    if previous is None:
+        devices = parse_products(products)
+    else:
+        devices, _ = update_products(products, previous)
+
+    size, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    blocks = _allocated_blocks(after) - _allocated_blocks(before)
+    count = len(devices)
+    return {
+        "bytes/device": (size - start_size) / count,
+        "blocks/device": blocks / count,
+        "allocations": blocks,
+        "peak bytes": peak - start_size,
+    }
+
+
+def main() -> None:
+    """Run the benchmark for 1, 10 and 100 devices."""
+    columns = ("bytes/device", "blocks/device", "allocations", "peak bytes")
+    print("\nParsed /products models per device")
+    print(f"{'devices':<12}" + "".join(f"{column:>16}" for column in columns))
+    for devices in (1, 10, 100):
+        products = _products(devices)
+        previous = parse_products(products)
+        for case, stats in (
+            ("parse", _measure(products)),
+            ("update", _measure(copy.deepcopy(products), previous)),
+        ):
+            print(
+                f"{f'{devices} {case}':<12}"
+                + "".join(f"{stats[column]:>16.0f}" for column in columns)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Startup benchmark: time until devices are available to create entities.
+
+Compares the cold path (authenticate, then GET /products, as done by
+async_config_entry_first_refresh) with the snapshot path (load the payload
+persisted by the coordinator and rebuild the devices). The cloud is simulated
+with a fixed round-trip time, 400 ms by default.
+
+Usage: python benchmarks/bench_startup.py [round_trip_ms]
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from _common import load_payload, payload_names, report, summarize
+
+from custom_components.aldes.api import AldesApi, parse_products
+from custom_components.aldes.rate_limiter import AdaptiveRateLimiter
+
+
+class _SimulatedResponse:
+    """Response returned after the simulated round trip."""
+
+    def __init__(self, status: int, payload: Any, round_trip: float) -> None:
+        self.status = status
+        self.headers: dict[str, str] = {}
+        self._payload = payload
+        self._round_trip = round_trip
+
+    async def __aenter__(self) -> "_SimulatedResponse":
+        await asyncio.sleep(self._round_trip)
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+    def raise_for_status(self) -> None:
+        return None
+
+    async def json(self) -> Any:
+        return self._payload
+
+    def close(self) -> None:
+        return None
+
+
+class _SimulatedCloud:
+    """Session answering the token and products endpoints like the cloud."""
+
+    def __init__(self, products: list[dict[str, Any]], round_trip: float) -> None:
+        self._products = products
+        self._round_trip = round_trip
+
+    async def get(self, url: str, **kwargs: Any) -> _SimulatedResponse:
+        # The status is known once the round trip is over, even for a 401
+        await asyncio.sleep(self._round_trip)
+        authorized = kwargs["headers"]["Authorization"].endswith("token")
+        return _SimulatedResponse(200 if authorized else 401, self._products, 0)
+
+    def post(self, url: str, **kwargs: Any) -> _SimulatedResponse:
+        return _SimulatedResponse(200, {"access_token": "token"}, self._round_trip)
+
+
+async def _cold_start(products: list[dict[str, Any]], round_trip: float) -> float:
+    """Return the time to devices when starting from the cloud."""
+    api = AldesApi("user", "pass", _SimulatedCloud(products, round_trip))
+    api._rate_limiter = AdaptiveRateLimiter(rate=100, max_rate=100)
+    start = time.perf_counter()
+    devices = await api.fetch_data()
+    elapsed = time.perf_counter() - start
+    await api.async_close()
+    assert devices
+    return elapsed * 1000
+
+
+def _snapshot_start(snapshot_file: Path) -> float:
+    """Return the time to devices when starting from the persisted snapshot."""
+    start = time.perf_counter()
+    snapshot = json.loads(snapshot_file.read_text(encoding="utf-8"))
+    devices = parse_products(snapshot["data"]["products"])
+    elapsed = time.perf_counter() - start
+    assert devices
+    return elapsed * 1000
+
+
+def main() -> None:
+    """Run the benchmark for every recorded payload."""
+    round_trip = (float(sys.argv[1]) if len(sys.argv) > 1 else 400) / 1000
+    rows: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in payload_names():
+            products = load_payload(name)
+            # Same layout as a Home Assistant Store file
+            snapshot_file = Path(tmp) / f"{name}.json"
+            snapshot_file.write_text(
+                json.dumps({"version": 1, "data": {"products": products}}),
+                encoding="utf-8",
+            )
+            rows[f"{name} cold"] = summarize(
+                [asyncio.run(_cold_start(products, round_trip)) for _ in range(5)]
+            )
+            rows[f"{name} snapshot"] = summarize(
+                [_snapshot_start(snapshot_file) for _ in range(200)]
+            )
+    report(f"Time to devices, cloud round trip {round_trip * 1000:.0f} ms", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Thermostat lookup benchmark: one coordinator tick over every room.
+
+On each tick every climate entity and thermostat sensor looks up its own
+thermostat on the device. This compares the former linear scan of
+indicator.thermostats with the id index built at parse time, for a device
+with 8 rooms and a synthetic one with 200 rooms.
+
+Usage: python benchmarks/bench_thermostat_lookup.py
+"""
+
+import copy
+from typing import Any
+
+from _common import load_payload, measure, report
+
+from custom_components.aldes.models import DataApiEntity
+
+# Each room has a climate entity and a temperature sensor
+_ENTITIES_PER_ROOM = 2
+
+
+def _device_with_rooms(rooms: int) -> dict[str, Any]:
+    """Return the recorded AIR payload with the given number of thermostats."""
+    device = copy.deepcopy(load_payload("tone_air")[0])
+    template = device["indicator"]["thermostats"][0]
+    device["indicator"]["thermostats"] = [
+        {**template, "ThermostatId": 1000 + room, "Name": f"Room {room}"}
+        for room in range(rooms)
+    ]
+    return device
+
+
+def _linear_tick(device: DataApiEntity, ids: list[int]) -> None:
+    """Look every thermostat up by scanning the list."""
+    for thermostat_id in ids:
+        next(
+            (t for t in device.indicator.thermostats if t.id == thermostat_id),
+            None,
+        )
+
+
+def _indexed_tick(device: DataApiEntity, ids: list[int]) -> None:
+    """Look every thermostat up through the id index."""
+    for thermostat_id in ids:
+        device.indicator.get_thermostat(thermostat_id)
+
+
+def main() -> None:
+    """Run the benchmark for 8 and 200 rooms."""
+    rows: dict[str, dict[str, float]] = {}
+    for rooms in (8, 200):
+        payload = _device_with_rooms(rooms)
+        device = DataApiEntity(payload)
+        ids = [t.id for t in device.indicator.thermostats] * _ENTITIES_PER_ROOM
+        rows[f"{rooms} rooms linear scan"] = measure(
+            lambda device=device, ids=ids: _linear_tick(device, ids)
+        )
+        rows[f"{rooms} rooms index"] = measure(
+            lambda device=device, ids=ids: _indexed_tick(device, ids)
+        )
+        rows[f"{rooms} rooms parse with index"] = measure(
+            lambda payload=payload: DataApiEntity(payload)
+        )
+    report("Thermostat lookups per coordinator tick", rows)
+
+
+if __name__ == "__main__":
+    main()
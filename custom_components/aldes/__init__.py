@@ -11,6 +11,7 @@ from datetime import date as dt_date
 from datetime import time as dt_time
 from functools import partial
 from pathlib import Path
+from typing import Any
 
 import voluptuous as vol
 from homeassistant.components.http import StaticPathConfig
@@ -20,24 +21,36 @@ from homeassistant.core import HomeAssistant, ServiceCall, Event
 from homeassistant.helpers import aiohttp_client
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 
 from .api import AldesApi
 from .const import (
+    CACHE_MAX_BYTES,
+    COMMAND_LOG_SIZE,
+    CONF_CACHE_MAX_BYTES,
+    CONF_COMMAND_LOG_SIZE,
+    CONF_MAX_CONCURRENT_COMMANDS,
     CONF_PASSWORD,
     CONF_PERFORMANCE_LOGS,
     CONF_USERNAME,
+    DEFAULT_MAX_CONCURRENT_COMMANDS,
     DOMAIN,
     PLATFORMS,
+    SNAPSHOT_STORAGE_VERSION,
 )
 from .coordinator import AldesDataUpdateCoordinator
 from .entity import DataApiEntity
+from .prometheus import CONTENT_TYPE, render_metrics
 
 _LOGGER = logging.getLogger(__name__)
 
 
 API_DATE_FORMAT_LENGTH = 15
 
+# hass.data flag of the metrics view, which outlives the config entries
+METRICS_VIEW_KEY = f"{DOMAIN}_metrics_view"
+
 
 def coerce_time(value: str | dt_time | None) -> dt_time:
     """Convert string to time object."""
@@ -99,30 +112,46 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _register_lovelace_resource)
 
     token = entry.options.get("token", "")
-    coordinator = AldesDataUpdateCoordinator(hass, None)
-    
-    # We need a callback that the API can call to refresh the coordinator
-    def _refresh_coordinator():
-        coordinator.async_update_listeners()
+    store: Store[dict[str, Any]] = Store(
+        hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.snapshot"
+    )
+    coordinator = AldesDataUpdateCoordinator(hass, None, store)
 
     api = AldesApi(
         entry.data[CONF_USERNAME],
         entry.data[CONF_PASSWORD],
         aiohttp_client.async_get_clientsession(hass),
         token,
-        update_callback=_refresh_coordinator,
+        max_concurrent_commands=entry.options.get(
+            CONF_MAX_CONCURRENT_COMMANDS, DEFAULT_MAX_CONCURRENT_COMMANDS
+        ),
+        cache_max_bytes=entry.options.get(CONF_CACHE_MAX_BYTES, CACHE_MAX_BYTES),
+        command_log_size=entry.options.get(CONF_COMMAND_LOG_SIZE, COMMAND_LOG_SIZE),
     )
     
     coordinator.api = api
-    await coordinator.async_config_entry_first_refresh()
+    # Create entities from the last known state, the cloud is queried after
+    restored = await coordinator.async_load_snapshot()
+    if not restored:
+        await coordinator.async_config_entry_first_refresh()
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    # Renew the token before it expires for as long as the entry is loaded
+    api.start_token_refresh(
+        lambda coro: entry.async_create_background_task(
+            hass, coro, f"{DOMAIN}_token_refresh"
+        )
+    )
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    await coordinator.async_request_refresh()
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN}_initial_refresh"
+        )
 
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     # Register web resources for Lovelace card
     await _register_lovelace_resources(hass)
+    _register_metrics_view(hass)
 
     # Register services
     await _register_services(hass)
@@ -136,11 +165,20 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok:
         coordinator = hass.data[DOMAIN].get(entry.entry_id)
         if coordinator:
+            await coordinator.async_shutdown()
             await coordinator.api.async_close()
         hass.data[DOMAIN].pop(entry.entry_id)
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the persisted snapshot when the entry is removed."""
+    store: Store[dict[str, Any]] = Store(
+        hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.snapshot"
+    )
+    await store.async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     _LOGGER.info("Reloading Aldes integration...")
@@ -182,6 +220,33 @@ async def _register_lovelace_resources(hass: HomeAssistant) -> None:
     _LOGGER.info("Aldes planning card view registered at /aldes_planning_card.js")
 
 
+def _register_metrics_view(hass: HomeAssistant) -> None:
+    """Register the Prometheus metrics endpoint, once for all the entries."""
+    if hass.data.get(METRICS_VIEW_KEY):
+        return
+
+    from aiohttp import web
+    from homeassistant.components.http import HomeAssistantView
+
+    class AldesMetricsView(HomeAssistantView):
+        """View to export the integration metrics in Prometheus format."""
+
+        requires_auth = True
+        url = "/api/aldes/metrics"
+        name = "api:aldes:metrics"
+
+        async def get(self, _request: web.Request) -> web.Response:
+            """Serve the metrics of every config entry."""
+            return web.Response(
+                body=render_metrics(hass.data.get(DOMAIN, {})).encode("utf-8"),
+                headers={"Content-Type": CONTENT_TYPE},
+            )
+
+    hass.http.register_view(AldesMetricsView())
+    hass.data[METRICS_VIEW_KEY] = True
+    _LOGGER.debug("Aldes metrics view registered at /api/aldes/metrics")
+
+
 def _get_primary_device(
     coordinator: AldesDataUpdateCoordinator | None,
 ) -> DataApiEntity | None:
@@ -336,6 +401,39 @@ async def _handle_set_week_planning(hass: HomeAssistant, call: ServiceCall) -> N
     await coordinator.async_request_refresh()
 
 
+async def _handle_set_temperatures(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Set target temperatures of several thermostats in a single request."""
+    temperatures: dict[str, float] = call.data["temperatures"]
+
+    coordinator, device = _get_coordinator_and_device(hass, call)
+    if not coordinator or not device:
+        return
+
+    if not device.modem:
+        _LOGGER.error("Modem not available")
+        return
+
+    changes = []
+    for key, temperature in temperatures.items():
+        # Thermostats can be referenced by id or by name
+        thermostat = (
+            device.indicator.get_thermostat(int(key)) if key.isdigit() else None
+        ) or next(
+            (t for t in device.indicator.thermostats if t.name == key),
+            None,
+        )
+        if thermostat is None:
+            _LOGGER.error("Thermostat %s not found on modem %s", key, device.modem)
+            continue
+        changes.append((thermostat.id, thermostat.name, int(temperature)))
+
+    if not changes:
+        return
+
+    await coordinator.api.set_target_temperatures(device.modem, changes)
+    await coordinator.async_request_refresh()
+
+
 async def _handle_set_holidays(hass: HomeAssistant, call: ServiceCall) -> None:
     """Set holidays mode for an Aldes device."""
     start_date_input = call.data["start_date"]
@@ -445,6 +543,19 @@ async def _register_services(hass: HomeAssistant) -> None:
         ),
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        "set_temperatures",
+        partial(_handle_set_temperatures, hass),
+        schema=vol.Schema(
+            {
+                vol.Optional("device_id"): str,
+                vol.Optional("entity_id"): str,
+                vol.Required("temperatures"): {vol.Coerce(str): vol.Coerce(float)},
+            }
+        ),
+    )
+
     hass.services.async_register(
         DOMAIN,
         "set_holidays",
@@ -1,28 +1,53 @@
 """Aldes API client."""
 
 import asyncio
-import base64
-import json
 import logging
-from collections.abc import Awaitable, Callable
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Coroutine
 from contextlib import suppress
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any, NoReturn
 
 import aiohttp
 import backoff
-from aiohttp import ClientError, ClientResponseError, ClientTimeout
-
+from aiohttp import ClientError, ClientTimeout
+
+from .cache import ResponseCache, normalize_cache_key
+from .command_log import (
+    OUTCOME_FAILURE,
+    OUTCOME_SUCCESS,
+    CommandLog,
+    CommandRecord,
+)
 from .const import (
-    REQUEST_DELAY,
-    STATE_CHANGE_BACKOFF_MAX_TRIES,
+    CACHE_MAX_BYTES,
+    COMMAND_LOG_SIZE,
+    COMMAND_MAX_ATTEMPTS,
+    COMMAND_RETRY_DEADLINE,
+    DEFAULT_MAX_CONCURRENT_COMMANDS,
+    REQUEST_MAX_ATTEMPTS,
+    REQUEST_RETRY_DEADLINE,
+    REQUEST_TIMEOUT,
+    TEMPERATURE_BATCH_WINDOW,
+    WORKER_ERROR_DELAY,
 )
-from .models import ApiHealthState, CommandUid, DataApiEntity
+from .decoder import JSON_BACKEND, PayloadError, dumps, loads
+from .metrics import ApiMetrics
+from .models import ApiEvent, ApiHealthState, CommandUid, DataApiEntity
+from .rate_limiter import AdaptiveRateLimiter, parse_retry_after
+from .retry import RetryBudget, RetryBudgetExhaustedError, run_with_retries
+from .single_flight import SingleFlight
+from .token_manager import TokenManager, decode_jwt_claims
 
 _LOGGER = logging.getLogger(__name__)
 
 HTTP_OK = 200
 HTTP_UNAUTHORIZED = 401
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_SERVER_ERROR = 500
 
 
 def _raise_client_error(message: str) -> NoReturn:
@@ -43,9 +68,141 @@ def _backoff_handler(details: dict[str, Any]) -> None:
     )
 
 
-def _is_reauth_error(e: BaseException) -> bool:
-    """Return True if this is an error that should trigger re-authentication."""
-    return isinstance(e, ClientResponseError) and e.status == HTTP_UNAUTHORIZED
+@dataclass
+class QueuedCommand:
+    """A command waiting in the AldesApi command queue."""
+
+    func: Callable[..., Awaitable[Any]]
+    args: tuple = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    description: str = "unnamed command"
+    queue_time: datetime = field(default_factory=lambda: datetime.now(UTC))
+    # Commands sharing a key target the same setting: only the newest is sent.
+    # The first element of the key is the modem, which selects the lane.
+    key: tuple[Any, ...] | None = None
+    # Attempts and time left for the requests of the command
+    budget: RetryBudget | None = None
+
+
+@dataclass
+class CommandLane:
+    """Queue and worker for the commands of a single modem."""
+
+    modem: str
+    pending: deque[QueuedCommand] = field(default_factory=deque)
+    # Set when a command is queued, so the worker can sleep until then
+    command_available: asyncio.Event = field(default_factory=asyncio.Event)
+    # Set when nothing is queued or running, used by stop_worker to drain
+    idle: asyncio.Event = field(default_factory=asyncio.Event)
+    worker_task: asyncio.Task[None] | None = None
+    current_command: str | None = None
+    # Outcome counters, exported as metrics
+    succeeded: int = 0
+    failed: int = 0
+    verification_retries: int = 0
+
+    def __post_init__(self) -> None:
+        """Start idle."""
+        self.idle.set()
+
+    @property
+    def worker_active(self) -> bool:
+        """Return True if the lane worker is running."""
+        return self.worker_task is not None and not self.worker_task.done()
+
+
+# Record of the command being executed, for the requests it sends
+_CURRENT_COMMAND: ContextVar[CommandRecord | None] = ContextVar(
+    "aldes_current_command", default=None
+)
+
+# Retry budget of the command or call the current requests are sent for
+_CURRENT_BUDGET: ContextVar[RetryBudget | None] = ContextVar(
+    "aldes_current_budget", default=None
+)
+
+# Set while re-sending a command the device did not apply
+_VERIFICATION_RETRY: ContextVar[bool] = ContextVar(
+    "aldes_verification_retry", default=False
+)
+
+# Number of history lines shown by the pending commands sensor
+HISTORY_DISPLAY_SIZE = 5
+
+
+def _command_record(modem: str, command: QueuedCommand) -> CommandRecord:
+    """Return the record of a command starting now."""
+    command_type, target = "unnamed", None
+    if command.key is not None and len(command.key) > 1:
+        kind = str(command.key[1])
+        detail = command.key[2] if len(command.key) > 2 else None
+        if detail is None:
+            command_type = kind
+        elif kind == "command":
+            # Device commands are named after their API method
+            command_type = str(detail)
+        else:
+            command_type = kind
+            target = (
+                ",".join(str(item) for item in detail)
+                if isinstance(detail, tuple)
+                else str(detail)
+            )
+    return CommandRecord(
+        command_type=command_type,
+        modem=modem,
+        target=target,
+        description=command.description,
+        queued_at=command.queue_time,
+        started_at=datetime.now(UTC),
+    )
+
+
+def parse_products(data: Any) -> dict[str, DataApiEntity]:
+    """Build the devices, keyed by modem, from a /products payload."""
+    devices, _ = update_products(data, None)
+    return devices
+
+
+def update_products(
+    data: Any, previous: dict[str, DataApiEntity] | None
+) -> tuple[dict[str, DataApiEntity], dict[str, frozenset[str] | None]]:
+    """
+    Update the devices of the previous poll from a /products payload.
+
+    Unchanged devices are reused as is and changed ones share their unchanged
+    parts. Also returns, per modem, the paths of the fields that changed;
+    added and removed devices map to None. A device whose payload has
+    unexpected types keeps its previous model, or is left out if new.
+    """
+    devices: dict[str, DataApiEntity] = {}
+    changes: dict[str, frozenset[str] | None] = {}
+    if not isinstance(data, list):
+        return devices, changes
+    previous = previous or {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        modem = item.get("modem")
+        if not modem:
+            continue
+        current = previous.get(modem)
+        try:
+            if current is None:
+                devices[modem] = DataApiEntity(item)
+                changes[modem] = None
+                continue
+            devices[modem], changed = current.updated(item)
+        except PayloadError as err:
+            _LOGGER.warning("Ignoring invalid data for device %s: %s", modem, err)
+            if current is not None:
+                devices[modem] = current
+            continue
+        if changed:
+            changes[modem] = changed
+    for modem in previous.keys() - devices.keys():
+        changes[modem] = None
+    return devices, changes
 
 
 class AldesApi:
@@ -69,100 +226,318 @@ class AldesApi:
         password: str,
         session: aiohttp.ClientSession,
         token: str = "",
-        update_callback: Callable[[], Any] | None = None,
+        max_concurrent_commands: int = DEFAULT_MAX_CONCURRENT_COMMANDS,
+        cache_max_bytes: int = CACHE_MAX_BYTES,
+        command_log_size: int = COMMAND_LOG_SIZE,
     ) -> None:
         """Initialize Aldes API client."""
         self._username = username
         self._password = password
         self._session = session
-        self._token = token
-        self._timeout = ClientTimeout(total=30)
-        self._cache: dict[str, Any] = {}
-        self._cache_timestamp: dict[str, datetime] = {}
-        self.health_state: ApiHealthState = ApiHealthState.ONLINE
-        self._worker_task: asyncio.Task[None] | None = None
-        self._update_callback = update_callback
-        # Track pending commands and history
-        self._pending_commands: list[str] = []
-        self._command_history: list[str] = []
-        self._failed_commands: list[str] = []
-        self._current_command: str | None = None
+        # Renews the access token in the background before it expires
+        self._token_manager = TokenManager(
+            self._refresh_grant, self.authenticate, access_token=token
+        )
+        self._timeout = ClientTimeout(total=REQUEST_TIMEOUT)
+        # Raw payload behind the last devices returned by fetch_data
+        self.last_products_payload: list[Any] | None = None
+        # Changed field paths per modem of the last fetch_data, see update_products
+        self.last_changes: dict[str, frozenset[str] | None] = {}
+        # Time the last /products payload blocked the event loop to be parsed
+        self.last_parse_ms = 0.0
+        # Request counts, errors and latencies per endpoint
+        self.metrics = ApiMetrics()
+        # Last good GET responses, served when the API is unreachable
+        self._cache = ResponseCache(max_bytes=cache_max_bytes)
+        self._health_state = ApiHealthState.ONLINE
+        # Called on health, queue and history changes, see async_add_listener
+        self._listeners: list[
+            tuple[Callable[[ApiEvent, str | None], None], frozenset[ApiEvent]]
+        ] = []
+        # Paces every API request, adapting to throttling and latency
+        self._rate_limiter = AdaptiveRateLimiter()
+        # Shares in-flight authentications and identical GETs between callers
+        self._single_flight = SingleFlight()
+        # One command lane per modem so that independent devices run in
+        # parallel, with an account-wide cap on commands executing at once.
+        # Request pacing is left to the rate limiter.
+        self._lanes: dict[str, CommandLane] = {}
+        self._max_concurrent_commands = max(1, max_concurrent_commands)
+        self._command_semaphore = asyncio.Semaphore(self._max_concurrent_commands)
+        # Last executed commands with their timings and outcome
+        self.command_log = CommandLog(command_log_size)
+        # Number of queued commands superseded by a newer one before being sent
+        self._coalesced_commands = 0
+        # Retry budget of the last command queued for each key
+        self._budgets: dict[tuple[Any, ...], RetryBudget] = {}
         # Track pending command verifications for retry if not applied
         self._pending_verifications: dict[str, Any] = {}
 
-    async def _ensure_worker_started(self) -> None:
-        """Ensure the command worker task is started."""
-        if self._worker_task is None or self._worker_task.done():
-            _LOGGER.debug("Starting command worker task")
-            self._worker_task = asyncio.create_task(self._command_worker())
+    def _get_lane(self, modem: str) -> CommandLane:
+        """Return the command lane of a modem, creating it if needed."""
+        lane = self._lanes.get(modem)
+        if lane is None:
+            lane = self._lanes[modem] = CommandLane(modem)
+        return lane
+
+    async def _ensure_worker_started(self, lane: CommandLane) -> None:
+        """Ensure the command worker task of a lane is started."""
+        if not lane.worker_active:
+            _LOGGER.debug("Starting command worker task for modem %s", lane.modem)
+            lane.worker_task = asyncio.create_task(self._command_worker(lane))
         else:
             _LOGGER.debug("Command worker task already running")
 
     async def stop_worker(self) -> None:
-        """Stop the command worker and wait for queue to empty."""
-        if self._worker_task and not self._worker_task.done():
+        """Stop the command workers and wait for their queues to empty."""
+        for lane in list(self._lanes.values()):
+            if not lane.worker_active:
+                continue
             # Wait for queue to be processed
-            while self._pending_commands:
-                await asyncio.sleep(1)
+            await lane.idle.wait()
 
             # Cancel the worker task
-            self._worker_task.cancel()
-            with suppress(asyncio.CancelledError):
-                await self._worker_task
+            if lane.worker_task:
+                lane.worker_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await lane.worker_task
+
+    def get_pending_commands(self, modem: str | None = None) -> list[QueuedCommand]:
+        """Return pending commands of one modem, or of all modems."""
+        lanes = (
+            list(self._lanes.values())
+            if modem is None
+            else [self._lanes[modem]] if modem in self._lanes else []
+        )
+        return [command for lane in lanes for command in lane.pending]
+
+    def get_current_command(self, modem: str) -> str | None:
+        """Return the description of the command a modem is executing."""
+        lane = self._lanes.get(modem)
+        return lane.current_command if lane else None
+
+    @property
+    def command_history(self) -> list[str]:
+        """Return the history lines of the last successful commands."""
+        return [
+            record.history_entry()
+            for record in self.command_log.records(
+                OUTCOME_SUCCESS, HISTORY_DISPLAY_SIZE
+            )
+        ]
+
+    @property
+    def failed_commands(self) -> list[str]:
+        """Return the history lines of the last failed commands."""
+        return [
+            record.history_entry()
+            for record in self.command_log.records(
+                OUTCOME_FAILURE, HISTORY_DISPLAY_SIZE
+            )
+        ]
+
+    @property
+    def health_state(self) -> ApiHealthState:
+        """Return the connectivity state of the API."""
+        return self._health_state
+
+    @health_state.setter
+    def health_state(self, state: ApiHealthState) -> None:
+        """Set the connectivity state, publishing it if it changed."""
+        if state != self._health_state:
+            self._health_state = state
+            self._publish(ApiEvent.HEALTH)
+
+    def async_add_listener(
+        self,
+        update_callback: Callable[[ApiEvent, str | None], None],
+        events: frozenset[ApiEvent] = frozenset(ApiEvent),
+    ) -> Callable[[], None]:
+        """
+        Call update_callback with each change event of the given types.
+
+        The callback also gets the modem of queue and history changes. Returns
+        a function that removes the listener.
+        """
+        listener = (update_callback, events)
+        self._listeners.append(listener)
+
+        def remove_listener() -> None:
+            with suppress(ValueError):
+                self._listeners.remove(listener)
+
+        return remove_listener
+
+    def _publish(self, event: ApiEvent, modem: str | None = None) -> None:
+        """Call the listeners of an event."""
+        for update_callback, events in list(self._listeners):
+            if event in events:
+                try:
+                    update_callback(event, modem)
+                except Exception:
+                    _LOGGER.exception("Error in API %s listener", event)
+
+    @property
+    def lanes(self) -> dict[str, CommandLane]:
+        """Return the command lanes by modem."""
+        return self._lanes
+
+    @property
+    def cache(self) -> ResponseCache:
+        """Return the emergency response cache."""
+        return self._cache
 
-    async def _command_worker(self) -> None:
-        """Process command requests from list with delay between each."""
-        _LOGGER.info("Command worker started for API instance: %d", id(self))
+    @property
+    def coalesced_commands(self) -> int:
+        """Return the number of commands replaced by a newer one."""
+        return self._coalesced_commands
+
+    @property
+    def request_rate(self) -> float:
+        """Return the current request rate allowed by the rate limiter."""
+        return self._rate_limiter.rate
+
+    async def retry_unapplied_command(
+        self, modem: str, retry_fn: Callable[[], Awaitable[Any]]
+    ) -> bool:
+        """
+        Re-send a command the device did not apply, within its retry budget.
+
+        retry_fn queues the command again. Returns False, without sending
+        anything, if the budget of the original command is spent.
+        """
+        token = _VERIFICATION_RETRY.set(True)
+        try:
+            await retry_fn()
+        except RetryBudgetExhaustedError as err:
+            _LOGGER.warning("Not re-sending command for modem %s: %s", modem, err)
+            return False
+        finally:
+            _VERIFICATION_RETRY.reset(token)
+        self._get_lane(modem).verification_retries += 1
+        return True
+
+    @property
+    def worker_active(self) -> bool:
+        """Return True if any command worker is running."""
+        return any(lane.worker_active for lane in self._lanes.values())
+
+    async def _command_worker(self, lane: CommandLane) -> None:
+        """Process queued commands of a lane as they arrive."""
+        _LOGGER.info(
+            "Command worker started for modem %s on API instance: %d",
+            lane.modem,
+            id(self),
+        )
         while True:
             try:
-                if not self._pending_commands:
-                    await asyncio.sleep(1)
+                if not lane.pending:
+                    lane.idle.set()
+                    lane.command_available.clear()
+                    _LOGGER.debug("Worker for modem %s waiting...", lane.modem)
+                    await lane.command_available.wait()
                     continue
 
-                _LOGGER.debug("Worker waiting...")
-                command = self._pending_commands.pop(0)
-                func, args, kwargs, description, queue_time = command
-                self._current_command = description
-                queue_str = queue_time.strftime("%H:%M:%S")
+                command = lane.pending.popleft()
+                lane.current_command = command.description
+                self._publish(ApiEvent.QUEUE, lane.modem)
+                if command.key is not None and command.key[1] == "temperature":
+                    command = await self._collect_temperature_batch(lane, command)
+                    lane.current_command = command.description
+                    self._publish(ApiEvent.QUEUE, lane.modem)
 
-                _LOGGER.debug("Worker processing command: %s", description)
-                
+                _LOGGER.debug("Worker processing command: %s", command.description)
+
+                record = _command_record(lane.modem, command)
+                token = _CURRENT_COMMAND.set(record)
+                budget_token = _CURRENT_BUDGET.set(command.budget)
                 try:
-                    await func(*args, **kwargs)
-                    
+                    async with self._command_semaphore:
+                        await command.func(*command.args, **command.kwargs)
+
                     # Command successful: add to history
-                    done_str = datetime.now(UTC).strftime("%H:%M:%S")
-                    entry = f"{queue_str}→{done_str} - {description}"
-                    self._command_history.append(entry)
-                    if len(self._command_history) > 5:
-                        self._command_history.pop(0)
-                    _LOGGER.debug("Command added to history: %s", entry)
+                    record.finish(datetime.now(UTC), OUTCOME_SUCCESS)
+                    lane.succeeded += 1
+                    _LOGGER.debug(
+                        "Command added to history: %s", record.history_entry()
+                    )
 
                 except Exception:
                     _LOGGER.exception(
                         "Error executing command '%s'.",
-                        description,
+                        command.description,
                     )
                     # Add to failed history
-                    done_str = datetime.now(UTC).strftime("%H:%M:%S")
-                    entry = f"{queue_str}→{done_str} - {description}"
-                    self._failed_commands.append(entry)
-                    if len(self._failed_commands) > 5:
-                        self._failed_commands.pop(0)
+                    record.finish(datetime.now(UTC), OUTCOME_FAILURE)
+                    lane.failed += 1
                 finally:
-                    self._current_command = None
-                    if self._update_callback:
-                        self._update_callback()
-
-                _LOGGER.debug("Worker sleeping for %s seconds", REQUEST_DELAY)
-                await asyncio.sleep(REQUEST_DELAY)
+                    _CURRENT_COMMAND.reset(token)
+                    _CURRENT_BUDGET.reset(budget_token)
+                    if record.outcome is not None:
+                        self.command_log.add(record)
+                        self._publish(ApiEvent.HISTORY, lane.modem)
+                    lane.current_command = None
+                    if not lane.pending:
+                        lane.idle.set()
+                    self._publish(ApiEvent.QUEUE, lane.modem)
 
             except asyncio.CancelledError:
-                _LOGGER.info("Command worker cancelled")
+                _LOGGER.info("Command worker for modem %s cancelled", lane.modem)
                 break
             except Exception:
                 _LOGGER.exception("Unexpected error in command worker")
-                await asyncio.sleep(REQUEST_DELAY)
+                await asyncio.sleep(WORKER_ERROR_DELAY)
+
+    async def _collect_temperature_batch(
+        self, lane: CommandLane, command: QueuedCommand
+    ) -> QueuedCommand:
+        """
+        Merge pending temperature changes for the same modem into one command.
+
+        Waits until the command has been queued for TEMPERATURE_BATCH_WINDOW
+        seconds so that changes made together end up in the same request.
+        """
+        elapsed = (datetime.now(UTC) - command.queue_time).total_seconds()
+        if elapsed < TEMPERATURE_BATCH_WINDOW:
+            await asyncio.sleep(TEMPERATURE_BATCH_WINDOW - elapsed)
+
+        modem = lane.modem
+        batch = [command] + [
+            pending
+            for pending in lane.pending
+            if pending.key is not None and pending.key[1] == "temperature"
+        ]
+        if len(batch) == 1:
+            return command
+
+        for pending in batch[1:]:
+            lane.pending.remove(pending)
+        # Re-sends of any of the batched changes draw from the batch budget
+        budget = command.budget
+        for queued in batch:
+            if queued.key is not None:
+                self._budgets[queued.key] = budget
+
+        # Later entries are newer: keep the last setpoint for each thermostat
+        thermostats: dict[int, tuple[int, str, Any]] = {}
+        for queued in batch:
+            _, thermostat_id, thermostat_name, target_temperature = queued.args
+            thermostats[thermostat_id] = (
+                thermostat_id,
+                thermostat_name,
+                target_temperature,
+            )
+        _LOGGER.info(
+            "Batching %d temperature changes for modem %s", len(thermostats), modem
+        )
+        return QueuedCommand(
+            self._change_temperatures_direct,
+            args=(modem, list(thermostats.values())),
+            description=", ".join(queued.description for queued in batch),
+            queue_time=batch[0].queue_time,
+            key=(modem, "temperature", tuple(thermostats)),
+            budget=budget,
+        )
 
     async def _queue_command(
         self,
@@ -170,11 +545,68 @@ class AldesApi:
         args: tuple = (),
         kwargs: dict | None = None,
         description: str = "unnamed command",
+        key: tuple[Any, ...] | None = None,
     ) -> None:
-        """Add a command to the queue."""
-        await self._ensure_worker_started()
+        """
+        Add a command to the queue.
+
+        Commands run on the lane of the modem named by the first element of
+        their key. If a pending command has the same key, it is replaced in
+        place by this one so that only the newest value is sent to the API.
+        """
+        lane = self._get_lane(str(key[0]) if key else "")
+        budget = self._command_budget(key)
+        await self._ensure_worker_started(lane)
+        if key is not None:
+            for pending in lane.pending:
+                if pending.key == key:
+                    _LOGGER.info(
+                        "Coalescing command '%s' into pending '%s'",
+                        description,
+                        pending.description,
+                    )
+                    pending.func = func
+                    pending.args = args
+                    pending.kwargs = kwargs or {}
+                    pending.description = description
+                    pending.budget = budget
+                    self._coalesced_commands += 1
+                    self._publish(ApiEvent.QUEUE, lane.modem)
+                    return
+
         _LOGGER.info("Queueing command: %s", description)
-        self._pending_commands.append((func, args, kwargs or {}, description, datetime.now(UTC)))
+        lane.pending.append(
+            QueuedCommand(
+                func, args, kwargs or {}, description, key=key, budget=budget
+            )
+        )
+        lane.idle.clear()
+        lane.command_available.set()
+        self._publish(ApiEvent.QUEUE, lane.modem)
+
+    def _command_budget(self, key: tuple[Any, ...] | None) -> RetryBudget:
+        """
+        Return the retry budget of a command being queued.
+
+        A user action gets a new budget. A re-send of a command the device
+        did not apply draws from the budget of the original command, and is
+        refused with RetryBudgetExhaustedError once that budget is spent.
+        """
+        if _VERIFICATION_RETRY.get() and key is not None:
+            budget = self._budgets.get(key)
+            if budget is not None:
+                if budget.exhausted:
+                    msg = f"No retry left for command {key}"
+                    raise RetryBudgetExhaustedError(msg)
+                return budget
+
+        budget = RetryBudget(COMMAND_MAX_ATTEMPTS, COMMAND_RETRY_DEADLINE)
+        # Forget the budgets of the commands that cannot be re-sent anymore
+        for spent in [k for k, b in self._budgets.items() if b.exhausted]:
+            del self._budgets[spent]
+        if key is not None:
+            self._budgets[key] = budget
+        return budget
 
     def _log_request_details(
         self, method: str, url: str, headers: dict, data: Any = None
@@ -208,6 +640,24 @@ class AldesApi:
             duration_ms,
         )
 
+    async def _request_token(self, data: dict[str, str]) -> dict[str, Any]:
+        """Post a grant to the OAuth2 token endpoint and return the response."""
+        headers = {
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Accept": "application/json",
+            "User-Agent": self._USER_AGENT,
+            "apikey": self._API_KEY,
+            "sdkVersion": self._SDK_VERSION,
+        }
+
+        self._log_request_details("POST", self._API_URL_TOKEN, headers, data)
+
+        async with self._session.post(
+            self._API_URL_TOKEN, data=data, headers=headers, timeout=self._timeout
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+
     @backoff.on_exception(
         backoff.expo,
         (ClientError, TimeoutError),
@@ -215,18 +665,10 @@ class AldesApi:
         max_time=60,
         on_backoff=_backoff_handler,
     )
-    async def authenticate(self) -> None:
+    async def _authenticate(self) -> None:
         """Authenticate and retrieve access token from Aldes API."""
         _LOGGER.info("Authenticating with Aldes API...")
 
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Accept": "application/json",
-            "User-Agent": self._USER_AGENT,
-            "apikey": self._API_KEY,
-            "sdkVersion": self._SDK_VERSION,
-        }
-
         data: dict[str, str] = {
             "grant_type": "password",
             "username": self._username,
@@ -234,26 +676,44 @@ class AldesApi:
             "scope": "openid profile email offline_access",
         }
 
-        self._log_request_details("POST", self._API_URL_TOKEN, headers, data)
-
         try:
-            async with self._session.post(
-                self._API_URL_TOKEN, data=data, headers=headers, timeout=self._timeout
-            ) as response:
-                response.raise_for_status()
-                json_resp = await response.json()
-                self._token = json_resp["access_token"]
-                self.health_state = ApiHealthState.ONLINE
-                _LOGGER.info("Successfully authenticated with Aldes API")
+            json_resp = await self._request_token(data)
+            self._token_manager.update(json_resp)
+            self.health_state = ApiHealthState.ONLINE
+            _LOGGER.info("Successfully authenticated with Aldes API")
         except (ClientError, TimeoutError) as err:
             self.health_state = ApiHealthState.OFFLINE
             error_msg = f"Authentication request failed: {err}"
             _LOGGER.exception(error_msg)
             raise AuthenticationError(error_msg) from err
 
+    async def authenticate(self) -> None:
+        """Authenticate, joining an authentication already in progress."""
+        await self._single_flight.run("authenticate", self._authenticate)
+
+    async def _refresh_grant(self, refresh_token: str) -> dict[str, Any]:
+        """Exchange the refresh token for a new access token."""
+        return await self._request_token(
+            {
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token,
+                "scope": "openid profile email offline_access",
+            }
+        )
+
+    def start_token_refresh(
+        self,
+        create_task: Callable[
+            [Coroutine[Any, Any, None]], asyncio.Task[None]
+        ] = asyncio.create_task,
+    ) -> None:
+        """Renew the access token in the background until async_close."""
+        self._token_manager.start(create_task)
+
     async def async_close(self) -> None:
         """Cleanup background tasks."""
         await self.stop_worker()
+        await self._token_manager.stop()
 
     def register_pending_verification(
         self, verification_id: str, metadata: dict[str, Any]
@@ -309,46 +769,122 @@ class AldesApi:
                 pending[vid] = data["metadata"]
         return pending
 
-    @backoff.on_exception(
-        backoff.expo,
-        (ClientError, TimeoutError, ClientResponseError),
-        max_tries=5,
-        max_time=300,
-        on_backoff=_backoff_handler,
-        giveup=lambda e: isinstance(e, ClientResponseError) and 400 <= e.status < 500,
-    )
     async def _api_request(
-        self, method: str, url: str, **kwargs: Any
+        self,
+        method: str,
+        url: str,
+        budget: RetryBudget | None = None,
+        **kwargs: Any,
+    ) -> list[Any] | dict[str, Any]:
+        """
+        Execute API request, sharing one GET between concurrent callers.
+
+        Callers joining a shared GET wait for it within the budget of the
+        caller that started it.
+        """
+        if method.lower() != "get" or kwargs:
+            return await self._execute_request(method, url, budget, **kwargs)
+        return await self._single_flight.run(
+            f"{method}:{url}", lambda: self._execute_request(method, url, budget)
+        )
+
+    async def _execute_request(
+        self,
+        method: str,
+        url: str,
+        budget: RetryBudget | None = None,
+        **kwargs: Any,
     ) -> list[Any] | dict[str, Any]:
-        """Execute API request with retry, timeout and error handling."""
-        cache_key = f"{method}:{url}"
-        start_time = datetime.now(UTC)
+        """
+        Execute API request, retried within a retry budget.
 
+        Without a budget given, requests of a command draw from the budget
+        of the command and other calls get their own. Request timeouts and
+        retry waits are shortened to end by the budget deadline.
+        """
+        if "json" in kwargs:
+            # Encoded once for every attempt, and measured from the body sent
+            kwargs["data"] = dumps(kwargs.pop("json"))
+            kwargs["headers"] = {
+                **kwargs.get("headers", {}),
+                "Content-Type": "application/json",
+            }
+        if budget is None:
+            budget = _CURRENT_BUDGET.get()
+        if budget is None:
+            budget = RetryBudget(REQUEST_MAX_ATTEMPTS, REQUEST_RETRY_DEADLINE)
+        # Set for this call so that the auth interceptor draws from it too
+        token = _CURRENT_BUDGET.set(budget)
         try:
-            if "timeout" not in kwargs:
-                kwargs["timeout"] = self._timeout
+            return await run_with_retries(
+                budget,
+                lambda: self._execute_attempt(method, url, **kwargs),
+                (ClientError, TimeoutError),
+                on_retry=lambda err, wait: self._on_retry(method, url, err, wait),
+            )
+        finally:
+            _CURRENT_BUDGET.reset(token)
+
+    def _on_retry(
+        self, method: str, url: str, err: BaseException, wait: float
+    ) -> None:
+        """Log a request retry and update health state."""
+        self.health_state = ApiHealthState.RETRYING
+        self.metrics.record_retry(method, url)
+        _LOGGER.warning(
+            "Backing off %s %s for %.1fs (%s)", method.upper(), url, wait, err
+        )
+
+    async def _execute_attempt(
+        self, method: str, url: str, **kwargs: Any
+    ) -> list[Any] | dict[str, Any]:
+        """Send an API request once, with timeout and error handling."""
+        cache_key = normalize_cache_key(method, url)
+        cacheable = method.lower() == "get"
+        metrics = self.metrics.endpoint(method, url)
+        bytes_out = len(kwargs["data"]) if "data" in kwargs else 0
+        bytes_in = 0
+        # Replaced once the attempt completes, so cancellations are counted
+        error: str | None = "CancelledError"
+        status: int | None = None
+        await self._acquire_request_slot()
+        start_time = time.monotonic()
 
+        try:
             request_func = getattr(self._session, method.lower())
 
             async with await self._request_with_auth_interceptor(
                 request_func, url, **kwargs
             ) as response:
+                status = response.status
                 if response.status == HTTP_OK:
-                    duration_ms = (
-                        datetime.now(UTC) - start_time
-                    ).total_seconds() * 1000
+                    duration_ms = (time.monotonic() - start_time) * 1000
                     response.raise_for_status()
-                    data = await response.json()
-                    self._cache[cache_key] = data
-                    self._cache_timestamp[cache_key] = datetime.now(UTC)
+                    raw = await response.read()
+                    bytes_in = len(raw)
+                    data = loads(raw)
+                    error = None
+                    if cacheable:
+                        self._cache.put(cache_key, data, size=bytes_in)
+                        _LOGGER.debug("Stored data in emergency cache for %s", cache_key)
                     self.health_state = ApiHealthState.ONLINE
+                    self._rate_limiter.record_success(duration_ms / 1000)
                     self._log_api_performance(url, method, response.status, duration_ms)
-                    _LOGGER.debug("Stored data in emergency cache for %s", cache_key)
                     return data
+                if (
+                    response.status == HTTP_TOO_MANY_REQUESTS
+                    or response.status >= HTTP_SERVER_ERROR
+                ):
+                    self._rate_limiter.record_throttled(
+                        parse_retry_after(response.headers.get("Retry-After"))
+                    )
+                error = f"HTTP {response.status}"
                 msg = f"API request failed with status {response.status}"
                 _LOGGER.error(msg)
                 _raise_client_error(msg)
         except Exception as err:
+            if error is None or error == "CancelledError":
+                error = type(err).__name__
             if isinstance(err, ClientError | TimeoutError):
                 _LOGGER.exception("API request error")
             elif isinstance(err, KeyError | ValueError):
@@ -356,33 +892,32 @@ class AldesApi:
             else:
                 _LOGGER.exception("Unexpected error during API request")
 
-            if cache_key in self._cache:
-                cache_age = datetime.now(UTC) - self._cache_timestamp.get(
-                    cache_key, datetime.min.replace(tzinfo=UTC)
-                )
+            cached = self._cache.get(cache_key) if cacheable else None
+            if cached is not None:
+                data, cache_age = cached
                 self.health_state = ApiHealthState.DEGRADED
                 _LOGGER.warning(
-                    "Using cached data as fallback due to error: %s (age: %s)",
+                    "Using cached data as fallback due to error: %s (age: %.0fs)",
                     type(err).__name__,
                     cache_age,
                 )
-                return self._cache[cache_key]
+                return data
 
             self.health_state = ApiHealthState.OFFLINE
             if isinstance(err, KeyError | ValueError):
                 msg = f"Invalid API response: {err}"
                 raise ClientError(msg) from err
             raise
+        finally:
+            metrics.record(
+                (time.monotonic() - start_time) * 1000, bytes_in, bytes_out, error
+            )
+            record = _CURRENT_COMMAND.get()
+            if record is not None:
+                record.note_attempt(status)
 
-    @backoff.on_exception(
-        backoff.expo,
-        (ClientError, TimeoutError),
-        max_tries=STATE_CHANGE_BACKOFF_MAX_TRIES,
-        max_time=30,
-        logger=None,  # Disable backoff logger to avoid duplicate logs
-    )
     async def _change_mode_direct(self, modem: str, mode: str, uid: CommandUid) -> Any:
-        """Perform actual mode change with backoff."""
+        """Perform actual mode change."""
         return await self._send_command(modem, "changeMode", uid, mode)
 
     async def change_mode(self, modem: str, mode: str, uid: CommandUid) -> None:
@@ -393,34 +928,43 @@ class AldesApi:
             self._change_mode_direct,
             args=(modem, mode, uid),
             description=f"change {mode_type} mode to {mode}",
+            key=(modem, "mode", int(uid)),
         )
 
-    async def fetch_data(self) -> dict[str, DataApiEntity]:
-        """Fetch data."""
+    async def fetch_data(
+        self,
+        previous: dict[str, DataApiEntity] | None = None,
+        deadline: float = REQUEST_RETRY_DEADLINE,
+    ) -> dict[str, DataApiEntity]:
+        """
+        Fetch data, updating the devices of a previous fetch if given.
+
+        Retries are best effort within deadline seconds: no request is sent
+        and no request runs past it. Unlike asyncio.timeout, the call is not
+        cancelled at the deadline but returns what it has, so callers wrap it
+        in asyncio.timeout with some grace as a last resort.
+        """
         _LOGGER.debug("Fetching data from Aldes API...")
+        budget = RetryBudget(REQUEST_MAX_ATTEMPTS, deadline)
         try:
-            data = await self._api_request("get", self._API_URL_PRODUCTS)
+            data = await self._api_request("get", self._API_URL_PRODUCTS, budget)
         except (ClientError, TimeoutError):
             _LOGGER.exception("Failed to fetch data")
             return {}
         else:
             _LOGGER.debug("Fetched data: %s", data)
 
-            if isinstance(data, list) and len(data) > 0:
-                devices: dict[str, DataApiEntity] = {}
-                for item in data:
-                    if not isinstance(item, dict):
-                        continue
-                    modem = item.get("modem")
-                    if not modem:
-                        continue
-                    devices[modem] = DataApiEntity(item)
-                if devices:
-                    _LOGGER.debug(
-                        "Successfully retrieved Aldes device data: %d devices",
-                        len(devices),
-                    )
-                    return devices
+            start = time.monotonic()
+            devices, changes = update_products(data, previous)
+            self.last_parse_ms = (time.monotonic() - start) * 1000
+            if devices:
+                self.last_products_payload = data
+                self.last_changes = changes
+                _LOGGER.debug(
+                    "Successfully retrieved Aldes device data: %d devices",
+                    len(devices),
+                )
+                return devices
 
             _LOGGER.warning("No data received from Aldes API")
             return {}
@@ -442,15 +986,25 @@ class AldesApi:
             self._change_temperature_direct,
             args=(modem, thermostat_id, thermostat_name, target_temperature),
             description=f"set temperature for {thermostat_name} to {target_temperature}",
+            key=(modem, "temperature", thermostat_id),
         )
 
-    @backoff.on_exception(
-        backoff.expo,
-        (ClientError, TimeoutError),
-        max_tries=STATE_CHANGE_BACKOFF_MAX_TRIES,
-        max_time=30,
-        logger=None,  # Disable backoff logger to avoid duplicate logs
-    )
+    async def set_target_temperatures(
+        self,
+        modem: str,
+        thermostats: list[tuple[int, str, Any]],
+    ) -> None:
+        """
+        Queue target temperature changes for several thermostats of one modem.
+
+        Each change is queued like set_target_temperature; the worker then
+        sends all of them in a single updateThermostats request.
+        """
+        for thermostat_id, thermostat_name, target_temperature in thermostats:
+            await self.set_target_temperature(
+                modem, thermostat_id, thermostat_name, target_temperature
+            )
+
     async def _change_temperature_direct(
         self,
         modem: str,
@@ -458,38 +1012,24 @@ class AldesApi:
         thermostat_name: str,
         target_temperature: Any,
     ) -> Any:
-        """Actual temperature change with backoff."""
-        _LOGGER.info(
-            "Changing temperature for thermostat %s (%s) to %s°C",
-            thermostat_id,
-            thermostat_name,
-            target_temperature,
+        """Actual temperature change for a single thermostat."""
+        return await self._change_temperatures_direct(
+            modem, [(thermostat_id, thermostat_name, target_temperature)]
         )
-        try:
-            result = await self._api_request(
-                "patch",
-                f"{self._API_URL_PRODUCTS}/{modem}/updateThermostats",
-                json=[
-                    {
-                        "ThermostatId": thermostat_id,
-                        "Name": thermostat_name,
-                        "TemperatureSet": int(target_temperature),
-                    }
-                ],
+
+    async def _change_temperatures_direct(
+        self,
+        modem: str,
+        thermostats: list[tuple[int, str, Any]],
+    ) -> Any:
+        """Change temperature of one or more thermostats."""
+        for thermostat_id, thermostat_name, target_temperature in thermostats:
+            _LOGGER.info(
+                "Changing temperature for thermostat %s (%s) to %s°C",
+                thermostat_id,
+                thermostat_name,
+                target_temperature,
             )
-        except (ClientError, TimeoutError):
-            _LOGGER.exception("Failed to change temperature")
-            raise
-        else:
-            _LOGGER.debug("Temperature change response: %s", result)
-            return result
-        """Change temperature of thermostat with automatic retry on failure."""
-        _LOGGER.info(
-            "Changing temperature for thermostat %s (%s) to %s°C",
-            thermostat_id,
-            thermostat_name,
-            target_temperature,
-        )
         try:
             result = await self._api_request(
                 "patch",
@@ -500,6 +1040,9 @@ class AldesApi:
                         "Name": thermostat_name,
                         "TemperatureSet": int(target_temperature),
                     }
+                    for thermostat_id, thermostat_name, target_temperature in (
+                        thermostats
+                    )
                 ],
             )
         except (ClientError, TimeoutError):
@@ -509,45 +1052,78 @@ class AldesApi:
             _LOGGER.debug("Temperature change response: %s", result)
             return result
 
-    @backoff.on_exception(
-        backoff.expo,
-        ClientResponseError,
-        max_tries=2,
-        giveup=lambda e: not _is_reauth_error(e),
-        on_backoff=_backoff_handler,
-    )
     async def _request_with_auth_interceptor(
         self, request: Any, url: str, **kwargs: Any
     ) -> aiohttp.ClientResponse:
         """Execute request with automatic re-authentication if needed."""
+        sent_token = self._token_manager.access_token
         headers = kwargs.get("headers", {})
         headers[self._AUTHORIZATION_HEADER_KEY] = self._build_authorization()
         headers["apikey"] = self._API_KEY
         headers["User-Agent"] = self._USER_AGENT
         headers["sdkVersion"] = self._SDK_VERSION
         kwargs["headers"] = headers
+        kwargs["timeout"] = self._request_timeout()
 
-        self._log_request_details("REQ", url, headers, kwargs.get("json"))
+        self._log_request_details("REQ", url, headers, kwargs.get("data"))
 
         response = await request(url, **kwargs)
 
         if response.status == HTTP_UNAUTHORIZED:
             _LOGGER.info("Token expired (401), re-authenticating...")
             response.close()  # Close the initial response
-            await self.authenticate()
+            self.metrics.record_retry(getattr(request, "__name__", "request"), url)
+            # Requests rejected together renew once; later ones reuse the result
+            if self._token_manager.access_token == sent_token:
+                await self._token_manager.renew()
+
+            # The replay is one more request of the command
+            budget = _CURRENT_BUDGET.get()
+            if budget is not None:
+                budget.consume()
 
             # Update token in headers for the retry
             kwargs["headers"][
                 self._AUTHORIZATION_HEADER_KEY
             ] = self._build_authorization()
+            # Renewal took some of the time left
+            kwargs["timeout"] = self._request_timeout()
             # This will be the last attempt, so we return the response directly
             return await request(url, **kwargs)
 
         return response
 
+    async def _acquire_request_slot(self) -> None:
+        """Wait for the rate limiter, as long as the budget deadline allows."""
+        budget = _CURRENT_BUDGET.get()
+        if budget is None:
+            await self._rate_limiter.acquire()
+            return
+        try:
+            await self._rate_limiter.acquire(max_wait=budget.remaining_time())
+        except TimeoutError as err:
+            msg = f"Deadline reached before the request could be sent: {err}"
+            raise RetryBudgetExhaustedError(msg) from err
+
+    def _request_timeout(self) -> ClientTimeout:
+        """
+        Return the timeout of a request, ending at the budget deadline.
+
+        Raises RetryBudgetExhaustedError once the deadline has passed, since a
+        zero ClientTimeout would disable the timeout instead.
+        """
+        budget = _CURRENT_BUDGET.get()
+        if budget is None:
+            return self._timeout
+        remaining = budget.remaining_time()
+        if remaining <= 0:
+            msg = "Deadline reached before the request could be sent"
+            raise RetryBudgetExhaustedError(msg)
+        return ClientTimeout(total=min(REQUEST_TIMEOUT, remaining))
+
     def _build_authorization(self) -> str:
         """Build Authorization header value."""
-        return f"{self._TOKEN_TYPE} {self._token}"
+        return f"{self._TOKEN_TYPE} {self._token_manager.access_token}"
 
     async def change_people(self, modem: str, people: str) -> None:
         """Queue household composition setting change."""
@@ -555,6 +1131,7 @@ class AldesApi:
             self._send_command,
             args=(modem, "changePeople", 0, people),
             description=f"change household composition to {people}",
+            key=(modem, "command", "changePeople"),
         )
 
     async def change_antilegio(self, modem: str, antilegio: str) -> None:
@@ -563,6 +1140,7 @@ class AldesApi:
             self._send_command,
             args=(modem, "antilegio", 0, antilegio),
             description=f"change antilegionella cycle to {antilegio}",
+            key=(modem, "command", "antilegio"),
         )
 
     async def change_week_planning(
@@ -574,6 +1152,7 @@ class AldesApi:
             self._send_command,
             args=(modem, method, 1, planning_str),
             description=f"change week planning (mode {mode})",
+            key=(modem, "command", method),
         )
 
     async def set_holidays_mode(
@@ -585,6 +1164,7 @@ class AldesApi:
             self._send_command,
             args=(modem, "changeMode", 1, param),
             description=f"set holidays mode from {start_date} to {end_date}",
+            key=(modem, "command", "changeMode"),
         )
 
     async def cancel_holidays_mode(self, modem: str) -> None:
@@ -594,6 +1174,7 @@ class AldesApi:
             self._send_command,
             args=(modem, "changeMode", 1, param),
             description="cancel holidays mode",
+            key=(modem, "command", "changeMode"),
         )
 
     async def set_kwh_prices(
@@ -607,6 +1188,7 @@ class AldesApi:
             self._send_command,
             args=(modem, "prixkwh", 1, param),
             description=f"set kWh prices (peak={kwh_pleine}, off-peak={kwh_creuse})",
+            key=(modem, "command", "prixkwh"),
         )
 
     async def set_frost_protection_mode(self, modem: str, start_date: str) -> None:
@@ -616,6 +1198,7 @@ class AldesApi:
             self._send_command,
             args=(modem, "changeMode", 1, param),
             description=f"set frost protection mode from {start_date}",
+            key=(modem, "command", "changeMode"),
         )
 
     async def reset_filter(self, modem: str) -> None:
@@ -624,17 +1207,11 @@ class AldesApi:
             self._reset_filter_direct,
             args=(modem,),
             description="reset filter",
+            key=(modem, "command", "resetFilter"),
         )
 
-    @backoff.on_exception(
-        backoff.expo,
-        (ClientError, TimeoutError),
-        max_tries=STATE_CHANGE_BACKOFF_MAX_TRIES,
-        max_time=30,
-        logger=None,  # Disable backoff logger to avoid duplicate logs
-    )
     async def _reset_filter_direct(self, modem: str) -> Any:
-        """Actual filter reset with backoff."""
+        """Actual filter reset."""
         _LOGGER.info("Resetting filter for modem %s", modem)
         try:
             result = await self._api_request(
@@ -648,15 +1225,8 @@ class AldesApi:
             _LOGGER.debug("Reset filter response: %s", result)
             return result
 
-    @backoff.on_exception(
-        backoff.expo,
-        (ClientError, TimeoutError),
-        max_tries=STATE_CHANGE_BACKOFF_MAX_TRIES,
-        max_time=30,
-        logger=None,  # Disable backoff logger to avoid duplicate logs
-    )
     async def _send_command(self, modem: str, method: str, uid: int, param: str) -> Any:
-        """Send JSON-RPC command to device with automatic retry on failure."""
+        """Send JSON-RPC command to device."""
         json_payload = {
             "jsonrpc": "2.0",
             "method": method,
@@ -699,13 +1269,10 @@ class AldesApi:
 
     async def check_token_validity(self) -> bool:
         """Check if the current token is still valid."""
-        if not self._token:
+        if not self.token:
             return False
         try:
-            payload = self._token.split(".")[1]
-            payload += "=" * (-len(payload) % 4)
-            decoded = json.loads(base64.b64decode(payload).decode("utf-8"))
-            exp = decoded.get("exp", 0)
+            exp = decode_jwt_claims(self.token).get("exp", 0)
             if exp and datetime.now(UTC).timestamp() > exp:
                 _LOGGER.info("Token expired according to 'exp' field")
                 return False
@@ -717,29 +1284,62 @@ class AldesApi:
         else:
             return True
 
-    def get_diagnostic_info(self) -> dict[str, Any]:
-        """Get diagnostic information about API client state."""
-        cache_info = {
-            "cached_endpoints": len(self._cache),
-            "cache_details": [
-                {
-                    "key": key,
-                    "age_seconds": (datetime.now(UTC) - timestamp).total_seconds(),
-                }
-                for key, timestamp in self._cache_timestamp.items()
-            ],
+    def get_health_info(self) -> dict[str, Any]:
+        """
+        Return the API state shown by the health sensor attributes.
+
+        Unlike get_diagnostic_info, latencies, ages, countdowns and request
+        counters are left out: they move on every poll, and the sensor is
+        only written when what it shows changes.
+        """
+        token_info = self._token_info()
+        cache_info = self._cache.get_diagnostic_info()
+        return {
+            "api_url_base": self._API_URL_BASE,
+            "json_backend": JSON_BACKEND,
+            "health_state": self.health_state.value,
+            "token": {
+                key: token_info[key]
+                for key in (
+                    "token_present",
+                    "refresh_token_present",
+                    "token_expires",
+                    "token_decode_error",
+                )
+                if key in token_info
+            },
+            "cache": {
+                key: cache_info[key]
+                for key in (
+                    "cached_endpoints",
+                    "max_bytes",
+                    "hits",
+                    "misses",
+                    "evictions",
+                )
+            },
+            "queue_active": self.worker_active,
+            "max_concurrent_commands": self._max_concurrent_commands,
+            "lanes": {
+                modem: {"succeeded": lane.succeeded, "failed": lane.failed}
+                for modem, lane in self._lanes.items()
+            },
+            "command_log": self.command_log.summary(),
+            "coalesced_commands": self._coalesced_commands,
         }
 
-        token_info = {
-            "token_present": bool(self._token),
-            "token_length": len(self._token) if self._token else 0,
+    def _token_info(self) -> dict[str, Any]:
+        """Return the access token state, without the token itself."""
+        token = self.token
+        token_info: dict[str, Any] = {
+            "token_present": bool(token),
+            "token_length": len(token) if token else 0,
+            **self._token_manager.get_diagnostic_info(),
         }
 
-        if self._token:
+        if token:
             try:
-                payload = self._token.split(".")[1]
-                payload += "=" * (-len(payload) % 4)
-                decoded = json.loads(base64.b64decode(payload).decode("utf-8"))
+                decoded = decode_jwt_claims(token)
                 token_info["token_expires"] = datetime.fromtimestamp(
                     decoded.get("exp", 0), tz=UTC
                 ).isoformat()
@@ -748,26 +1348,45 @@ class AldesApi:
                 ).isoformat()
             except Exception as e:
                 token_info["token_decode_error"] = str(e)
+        return token_info
 
+    def get_diagnostic_info(self) -> dict[str, Any]:
+        """Get diagnostic information about API client state."""
         return {
             "api_url_base": self._API_URL_BASE,
-            "cache": cache_info,
-            "token": token_info,
+            "json_backend": JSON_BACKEND,
+            "metrics": self.metrics.get_diagnostic_info(),
+            "cache": self._cache.get_diagnostic_info(),
+            "token": self._token_info(),
             "health_state": self.health_state.value,
-            "queue_active": (
-                self._worker_task is not None and not self._worker_task.done()
-            ),
+            "rate_limiter": self._rate_limiter.get_diagnostic_info(),
+            "queue_active": self.worker_active,
+            "max_concurrent_commands": self._max_concurrent_commands,
+            "lanes": {
+                modem: {
+                    "pending": len(lane.pending),
+                    "current": lane.current_command,
+                    "worker_active": lane.worker_active,
+                    "succeeded": lane.succeeded,
+                    "failed": lane.failed,
+                    "verification_retries": lane.verification_retries,
+                }
+                for modem, lane in self._lanes.items()
+            },
+            "command_log": self.command_log.summary(),
+            "coalesced_commands": self._coalesced_commands,
+            "shared_requests": self._single_flight.shared_count,
         }
 
     @property
     def token(self) -> str:
         """Return the current access token."""
-        return self._token
+        return self._token_manager.access_token
 
     @token.setter
     def token(self, value: str) -> None:
         """Set the current access token."""
-        self._token = value
+        self._token_manager.access_token = value
 
 
 class AuthenticationError(Exception):
@@ -11,7 +11,7 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 
-from .const import DOMAIN, FRIENDLY_NAMES, MANUFACTURER
+from .const import DATA_GROUP_DEVICE, DOMAIN, FRIENDLY_NAMES, MANUFACTURER
 from .entity import AldesEntity, DeviceContext
 
 if TYPE_CHECKING:
@@ -50,6 +50,7 @@ async def async_setup_entry(
 class AldesBinarySensorEntity(AldesEntity, BinarySensorEntity):
     """Define an Aldes binary sensor."""
 
+    _data_groups = frozenset({DATA_GROUP_DEVICE})
     _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
 
     def __init__(
@@ -97,6 +98,7 @@ class AldesBinarySensorEntity(AldesEntity, BinarySensorEntity):
 class AldesFilterSensorEntity(AldesEntity, BinarySensorEntity):
     """Define an Aldes filter wear binary sensor."""
 
+    _data_groups = frozenset({DATA_GROUP_DEVICE})
     _attr_device_class = BinarySensorDeviceClass.PROBLEM
 
     def __init__(
@@ -42,6 +42,7 @@ async def async_setup_entry(
 class AldesResetFilterButton(AldesEntity, ButtonEntity):
     """Define an Aldes reset filter button."""
 
+    _data_groups: frozenset[str] = frozenset()
     _attr_icon = "mdi:air-filter"
 
     @property
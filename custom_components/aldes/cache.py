@@ -0,0 +1,136 @@
+"""Bounded emergency cache for Aldes API responses."""
+
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .const import CACHE_MAX_AGE, CACHE_MAX_BYTES
+
+_LOGGER = logging.getLogger(__name__)
+
+# Statistics URLs embed the requested period, which moves with every call
+_STATISTICS_PERIOD = re.compile(r"/statistics/[^/]+/[^/]+/")
+
+
+def normalize_cache_key(method: str, url: str) -> str:
+    """Return the cache key of a request, ignoring per-call URL parameters."""
+    return f"{method.lower()}:{_STATISTICS_PERIOD.sub('/statistics/*/*/', url)}"
+
+
+def estimate_size(value: Any) -> int:
+    """Return the approximate size in bytes of a decoded JSON value."""
+    return len(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+
+@dataclass
+class CacheEntry:
+    """A cached response with its size and storage time."""
+
+    value: Any
+    size: int
+    stored_at: float
+
+
+class ResponseCache:
+    """
+    Size-accounted LRU of the last good response per endpoint.
+
+    Used as a fallback when the API is unreachable. The total size of the
+    entries is kept under ``max_bytes`` by evicting the least recently used
+    ones, and entries older than ``max_age`` seconds are never served.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = CACHE_MAX_BYTES,
+        max_age: float = CACHE_MAX_AGE,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize an empty cache."""
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+        self._clock = clock
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if key is cached, whatever its age."""
+        return key in self._entries
+
+    @property
+    def size(self) -> int:
+        """Return the total size of the cached entries in bytes."""
+        return self._size
+
+    def put(self, key: str, value: Any, size: int | None = None) -> None:
+        """
+        Store a response, evicting old entries to stay under the cap.
+
+        size is the length of the raw response when known, otherwise it is
+        estimated by encoding the value again.
+        """
+        if size is None:
+            size = estimate_size(value)
+        self._remove(key)
+        if size > self._max_bytes:
+            _LOGGER.debug("Response for %s too large to cache (%d bytes)", key, size)
+            return
+        self._entries[key] = CacheEntry(value, size, self._clock())
+        self._size += size
+        while self._size > self._max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def get(self, key: str) -> tuple[Any, float] | None:
+        """Return the cached value and its age in seconds, or None."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self._clock() - entry.stored_at
+            if age <= self._max_age:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value, age
+            self._remove(key)
+            self.evictions += 1
+        self.misses += 1
+        return None
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry and release its size."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def get_diagnostic_info(self) -> dict[str, Any]:
+        """Return the cache state for diagnostics."""
+        now = self._clock()
+        return {
+            "cached_endpoints": len(self._entries),
+            "size_bytes": self._size,
+            "max_bytes": self._max_bytes,
+            "max_age": self._max_age,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "cache_details": [
+                {
+                    "key": key,
+                    "size_bytes": entry.size,
+                    "age_seconds": round(now - entry.stored_at, 1),
+                }
+                for key, entry in self._entries.items()
+            ],
+        }
@@ -0,0 +1,171 @@
+"""Records of the executed Aldes commands."""
+
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from .const import COMMAND_LOG_SIZE
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_FAILURE = "failure"
+
+
+@dataclass(slots=True)
+class CommandRecord:
+    """One executed command, updated while it runs."""
+
+    command_type: str
+    modem: str
+    # Thermostat ids or command UID the command applies to, if any
+    target: str | None
+    description: str
+    queued_at: datetime
+    started_at: datetime
+    ended_at: datetime | None = None
+    # Requests sent, retries included
+    attempts: int = 0
+    # Status of the last response, None if no response was received
+    http_status: int | None = None
+    outcome: str | None = None
+
+    @property
+    def queue_wait(self) -> float:
+        """Return the seconds between queueing and execution."""
+        return (self.started_at - self.queued_at).total_seconds()
+
+    @property
+    def duration(self) -> float | None:
+        """Return the execution time in seconds, None while running."""
+        if self.ended_at is None:
+            return None
+        return (self.ended_at - self.started_at).total_seconds()
+
+    def note_attempt(self, http_status: int | None) -> None:
+        """Count a request sent for this command."""
+        self.attempts += 1
+        self.http_status = http_status
+
+    def finish(self, ended_at: datetime, outcome: str) -> None:
+        """Record the end of the execution."""
+        self.ended_at = ended_at
+        self.outcome = outcome
+
+    def history_entry(self) -> str:
+        """Return the "queued→ended - description" history line."""
+        ended_at = self.ended_at or self.started_at
+        return (
+            f"{self.queued_at.strftime('%H:%M:%S')}→"
+            f"{ended_at.strftime('%H:%M:%S')} - {self.description}"
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record for diagnostics."""
+        duration = self.duration
+        return {
+            "type": self.command_type,
+            "modem": self.modem,
+            "target": self.target,
+            "description": self.description,
+            "queued_at": self.queued_at.isoformat(),
+            "started_at": self.started_at.isoformat(),
+            "ended_at": self.ended_at.isoformat() if self.ended_at else None,
+            "queue_wait_s": round(self.queue_wait, 3),
+            "duration_s": round(duration, 3) if duration is not None else None,
+            "attempts": self.attempts,
+            "http_status": self.http_status,
+            "outcome": self.outcome,
+        }
+
+
+class CommandLog:
+    """
+    Fixed-capacity ring buffer of finished command records.
+
+    The oldest record is dropped when a new one is added to a full log.
+    Totals of the buffered records are kept up to date on each addition, so
+    the summary statistics are read without scanning the records.
+    """
+
+    def __init__(self, capacity: int = COMMAND_LOG_SIZE) -> None:
+        """Initialize an empty log."""
+        self._records: deque[CommandRecord] = deque(maxlen=max(1, capacity))
+        self._wait_total = 0.0
+        self._duration_total = 0.0
+        self._failures = 0
+
+    def __len__(self) -> int:
+        """Return the number of buffered records."""
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[CommandRecord]:
+        """Iterate over the records, oldest first."""
+        return iter(self._records)
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of records."""
+        return self._records.maxlen or 0
+
+    def add(self, record: CommandRecord) -> None:
+        """Add a finished record, dropping the oldest one if full."""
+        if len(self._records) == self.capacity:
+            self._account(self._records[0], -1)
+        self._records.append(record)
+        self._account(record, 1)
+
+    def _account(self, record: CommandRecord, sign: int) -> None:
+        """Add a record to the totals, or remove it with sign -1."""
+        self._wait_total += sign * record.queue_wait
+        self._duration_total += sign * (record.duration or 0.0)
+        if record.outcome == OUTCOME_FAILURE:
+            self._failures += sign
+
+    def records(
+        self, outcome: str | None = None, limit: int | None = None
+    ) -> list[CommandRecord]:
+        """Return the newest records, oldest first, optionally of an outcome."""
+        records = [
+            record
+            for record in self._records
+            if outcome is None or record.outcome == outcome
+        ]
+        return records[-limit:] if limit else records
+
+    @property
+    def mean_queue_wait(self) -> float | None:
+        """Return the mean seconds between queueing and execution."""
+        return self._wait_total / len(self._records) if self._records else None
+
+    @property
+    def mean_duration(self) -> float | None:
+        """Return the mean execution time in seconds."""
+        return self._duration_total / len(self._records) if self._records else None
+
+    @property
+    def failure_ratio(self) -> float | None:
+        """Return the share of failed commands."""
+        return self._failures / len(self._records) if self._records else None
+
+    def summary(self) -> dict[str, Any]:
+        """Return the summary statistics."""
+        return {
+            "commands": len(self._records),
+            "capacity": self.capacity,
+            "mean_queue_wait_s": _round(self.mean_queue_wait),
+            "mean_duration_s": _round(self.mean_duration),
+            "failure_ratio": _round(self.failure_ratio),
+        }
+
+    def get_diagnostic_info(self) -> dict[str, Any]:
+        """Return the summary and the records for diagnostics."""
+        return {
+            **self.summary(),
+            "records": [record.as_dict() for record in self._records],
+        }
+
+
+def _round(value: float | None) -> float | None:
+    """Round a statistic for display."""
+    return round(value, 3) if value is not None else None
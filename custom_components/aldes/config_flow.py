@@ -4,13 +4,20 @@ from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .api import AldesApi, AuthenticationError
 from .const import (
+    CACHE_MAX_BYTES,
+    COMMAND_LOG_SIZE,
+    CONF_CACHE_MAX_BYTES,
+    CONF_COMMAND_LOG_SIZE,
+    CONF_MAX_CONCURRENT_COMMANDS,
     CONF_PASSWORD,
+    CONF_PERFORMANCE_LOGS,
     CONF_USERNAME,
+    DEFAULT_MAX_CONCURRENT_COMMANDS,
     DOMAIN,
 )
 
@@ -25,6 +32,14 @@ class AldesFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize."""
         self._errors = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        _config_entry: config_entries.ConfigEntry,
+    ) -> "AldesOptionsFlowHandler":
+        """Return the options flow."""
+        return AldesOptionsFlowHandler()
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> Any:
         """Handle a flow initialized by the user."""
         self._errors = {}
@@ -65,14 +80,16 @@ class AldesFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def _test_credentials(self, username: str, password: str) -> bool:
         """Return true if credentials is valid."""
+        session = async_create_clientsession(self.hass)
+        api = AldesApi(username, password, session)
         try:
-            session = async_create_clientsession(self.hass)
-            api = AldesApi(username, password, session)
             await api.authenticate()
         except AuthenticationError:
             return False
         else:
             return True
+        finally:
+            await api.async_close()
 
     async def async_migrate_entry(
         self, hass: HomeAssistant, entry: config_entries.ConfigEntry
@@ -84,3 +101,43 @@ class AldesFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 options={**entry.options, "token": ""},
             )
         return True
+
+
+class AldesOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for Aldes, the entry is reloaded on changes."""
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> Any:
+        """Manage the options."""
+        options = self.config_entry.options
+        if user_input is not None:
+            # Keep the options not shown in the form, e.g. the stored token
+            return self.async_create_entry(title="", data={**options, **user_input})
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_PERFORMANCE_LOGS,
+                        default=options.get(CONF_PERFORMANCE_LOGS, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_MAX_CONCURRENT_COMMANDS,
+                        default=options.get(
+                            CONF_MAX_CONCURRENT_COMMANDS,
+                            DEFAULT_MAX_CONCURRENT_COMMANDS,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                    vol.Optional(
+                        CONF_CACHE_MAX_BYTES,
+                        default=options.get(CONF_CACHE_MAX_BYTES, CACHE_MAX_BYTES),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=64 * 1024, max=64 * 1024 * 1024)
+                    ),
+                    vol.Optional(
+                        CONF_COMMAND_LOG_SIZE,
+                        default=options.get(CONF_COMMAND_LOG_SIZE, COMMAND_LOG_SIZE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
+                }
+            ),
+        )
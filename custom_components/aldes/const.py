@@ -18,6 +18,9 @@ VERSION = "3.8.3"
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_PERFORMANCE_LOGS = "performance_logs"
+CONF_MAX_CONCURRENT_COMMANDS = "max_concurrent_commands"
+CONF_CACHE_MAX_BYTES = "cache_max_bytes"
+CONF_COMMAND_LOG_SIZE = "command_log_size"
 
 MANUFACTURER = "Aldes"
 PLATFORMS: list[Platform] = [
@@ -62,12 +65,68 @@ WATER_LEVEL_THRESHOLDS = {
 }
 
 # API Configuration
-REQUEST_DELAY = 5  # Delay between queued requests in seconds
+WORKER_ERROR_DELAY = 5  # Pause after an unexpected command worker error (s)
+TEMPERATURE_BATCH_WINDOW = 1  # Window to group temperature changes (seconds)
+DEFAULT_MAX_CONCURRENT_COMMANDS = 2  # Commands executing at once per account
+COMMAND_LOG_SIZE = 50  # Executed commands kept with their timings
+
+# Adaptive rate limiter (token bucket shared by all requests of an account)
+RATE_LIMIT_INITIAL_RATE = 0.5  # Requests per second when starting
+RATE_LIMIT_MIN_RATE = 0.05  # Floor during incidents (one request every 20 s)
+RATE_LIMIT_MAX_RATE = 2.0  # Ceiling when the API is healthy
+RATE_LIMIT_BURST = 5  # Requests allowed back to back
+RATE_LIMIT_INCREASE_STEP = 0.05  # Rate added after each fast success
+RATE_LIMIT_SLOW_LATENCY = 2.0  # Average latency above which the rate drops (s)
+RATE_LIMIT_DEFAULT_BACKOFF = 5  # Pause after 429/5xx without Retry-After (s)
+RATE_LIMIT_MAX_DELAY = 60  # Longest pause honoured from a Retry-After (s)
 CACHE_TTL = 300  # Cache TTL in seconds (5 minutes)
+CACHE_MAX_BYTES = 2 * 1024 * 1024  # Memory cap of the emergency cache
+SNAPSHOT_STORAGE_VERSION = 1  # Version of the persisted /products snapshot
+SNAPSHOT_SAVE_DELAY = 10  # Delay before the snapshot is written to disk (s)
+CACHE_MAX_AGE = 24 * 3600  # Older cached responses are not used as fallback (s)
 OPTIMISTIC_HOLD_DURATION = 60  # Duration for optimistic state (seconds)
-STATE_CHANGE_BACKOFF_MAX_TRIES = (
-    4  # Max tries with exponential backoff for state changes
-)
+API_STATE_CHECK_INTERVAL = 60  # Health sensor attributes checked this often (s)
+TOKEN_REFRESH_MARGIN = 300  # Renew the access token this long before expiry (s)
+TOKEN_REFRESH_RETRY_DELAY = 60  # Pause after a failed background renewal (s)
+# Retry budgets: every request sent for a command, retries and re-sends of
+# commands the device did not apply included, counts against the same budget
+COMMAND_MAX_ATTEMPTS = 6  # Requests per user command
+COMMAND_RETRY_DEADLINE = 300  # No request is sent for a command after this (s)
+REQUEST_MAX_ATTEMPTS = 5  # Requests per poll or other standalone call
+REQUEST_RETRY_DEADLINE = 300  # Standalone calls give up after this (s)
+REQUEST_TIMEOUT = 30  # Longest time for one request, shortened near a deadline (s)
+RETRY_MIN_ATTEMPT_TIME = 1  # No retry is made with less time left for it (s)
+RETRY_BACKOFF_BASE = 1  # First wait before a retry, doubled each time (s)
+RETRY_BACKOFF_MAX = 30  # Longest wait before a retry (s)
+
+UPDATE_API_TIMEOUT = 10  # Requests of a coordinator update end by this (s)
+UPDATE_TIMEOUT_GRACE = 5  # Time after it before the update is cancelled (s)
+_UPDATE_TIMEOUT_MS = (UPDATE_API_TIMEOUT + UPDATE_TIMEOUT_GRACE) * 1000
+
+# System alert evaluation: (warning, critical) thresholds per measurement
+PERFORMANCE_THRESHOLDS = {
+    "api_p95_latency_ms": (2000, 5000),
+    "api_error_rate": (0.1, 0.3),  # Failed share of the request attempts
+    "api_retry_rate": (0.2, 0.5),  # Retries per request attempt
+    "queue_age_s": (60, 300),  # Wait of the oldest queued command
+    # Updates are cancelled after UPDATE_API_TIMEOUT plus the grace
+    "update_duration_ms": (_UPDATE_TIMEOUT_MS / 3, _UPDATE_TIMEOUT_MS * 0.9),
+    "data_staleness_s": (1800, 7200),  # Age of the device lastUpdatedDate
+    "loop_blocking_ms": (100, 500),  # Longest synchronous integration section
+}
+PERFORMANCE_WINDOW = 300  # Rolling window of the API measurements (s)
+PERFORMANCE_MIN_REQUESTS = 5  # Fewer requests in the window give no API checks
+PERFORMANCE_HYSTERESIS = 0.2  # A level is left once 20% below its threshold
+
+# Slices of device data that entities subscribe to for coordinator updates
+DATA_GROUP_INDICATOR = "indicator"  # Modes, main temperature, hot water, limits
+DATA_GROUP_THERMOSTATS = "thermostats"
+DATA_GROUP_PLANNINGS = "plannings"
+DATA_GROUP_SETTINGS = "settings"
+DATA_GROUP_DEVICE = "device"  # Identity, connectivity and filter
+DATA_GROUP_LAST_UPDATE = "last_update"  # lastUpdatedDate, changes on every poll
+DATA_GROUP_SCHEDULE = "schedule"  # The planning hour slot moved on
+DATA_GROUP_PERFORMANCE = "performance"  # System alert level or bottleneck
 
 
 class AirMode(StrEnum):
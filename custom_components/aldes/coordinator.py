@@ -2,33 +2,125 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
+import time
+from collections import Counter
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
-import async_timeout
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import (
+    DATA_GROUP_DEVICE,
+    DATA_GROUP_INDICATOR,
+    DATA_GROUP_LAST_UPDATE,
+    DATA_GROUP_PERFORMANCE,
+    DATA_GROUP_PLANNINGS,
+    DATA_GROUP_SCHEDULE,
+    DATA_GROUP_SETTINGS,
+    DATA_GROUP_THERMOSTATS,
+    DOMAIN,
+    UPDATE_API_TIMEOUT,
+    UPDATE_TIMEOUT_GRACE,
+)
+from .device_state import DeviceState, compute_device_state
+from .metrics import LatencyHistogram
+from .performance import PerformanceEvaluator, PerformanceReport, data_staleness
+from .planning import PROGRAM_PLANNINGS
+from .snapshot import DeviceSnapshot
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
-
-    from .models import DataApiEntity
+    from homeassistant.helpers.storage import Store
 
     from .api import AldesApi
+    from .models import DataApiEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+# Groups the derived device state is computed from
+_STATE_GROUPS = frozenset(
+    {DATA_GROUP_INDICATOR, DATA_GROUP_PLANNINGS, DATA_GROUP_SCHEDULE}
+)
+
+_DEVICE_GROUPS = frozenset(
+    {
+        DATA_GROUP_INDICATOR,
+        DATA_GROUP_THERMOSTATS,
+        DATA_GROUP_PLANNINGS,
+        DATA_GROUP_SETTINGS,
+        DATA_GROUP_DEVICE,
+        DATA_GROUP_LAST_UPDATE,
+    }
+)
+
+# Data group of the top-level device fields, the others belong to the device
+_FIELD_GROUPS = {
+    "week_planning": DATA_GROUP_PLANNINGS,
+    "week_planning2": DATA_GROUP_PLANNINGS,
+    "week_planning3": DATA_GROUP_PLANNINGS,
+    "week_planning4": DATA_GROUP_PLANNINGS,
+    "holidays_start": DATA_GROUP_INDICATOR,
+    "holidays_end": DATA_GROUP_INDICATOR,
+    "hors_gel": DATA_GROUP_INDICATOR,
+    "last_updated_date": DATA_GROUP_LAST_UPDATE,
+}
+
+
+def _field_group(path: str) -> str:
+    """Return the data group of a changed field path."""
+    if path.startswith("indicator.thermostats"):
+        return DATA_GROUP_THERMOSTATS
+    if path.startswith("indicator.settings."):
+        return DATA_GROUP_SETTINGS
+    if path.startswith("indicator."):
+        return DATA_GROUP_INDICATOR
+    return _FIELD_GROUPS.get(path, DATA_GROUP_DEVICE)
+
+
+def _add_group(
+    changes: dict[str, frozenset[str]], device_keys: set[str], group: str
+) -> dict[str, frozenset[str]]:
+    """Return the changed groups with a group added for some devices."""
+    if not device_keys:
+        return changes
+    changes = dict(changes)
+    for device_key in device_keys:
+        changes[device_key] = changes.get(device_key, frozenset()) | {group}
+    return changes
+
+
+def changed_groups(
+    changes: dict[str, frozenset[str] | None],
+) -> dict[str, frozenset[str]]:
+    """Return, per device key, the data groups of the changed field paths."""
+    return {
+        key: _DEVICE_GROUPS
+        if paths is None
+        else frozenset(_field_group(path) for path in paths)
+        for key, paths in changes.items()
+    }
+
 
 class AldesDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Aldes data coordinator."""
 
-    _API_TIMEOUT = 10
+    _API_TIMEOUT = UPDATE_API_TIMEOUT
+    # Time left after the API deadline for re-authentication and parsing
+    _API_TIMEOUT_GRACE = UPDATE_TIMEOUT_GRACE
     skip_next_update: bool = False
     data: dict[str, DataApiEntity]
 
-    def __init__(self, hass: HomeAssistant, api: AldesApi) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: AldesApi,
+        store: Store[dict[str, Any]] | None = None,
+    ) -> None:
         """Initialize."""
         super().__init__(
             hass,
@@ -37,27 +129,256 @@ class AldesDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             update_interval=timedelta(minutes=1),
         )
         self.api = api
+        # Persists the last good /products payload for the next startup
+        self._snapshot = DeviceSnapshot(store)
+        # Groups changed by the last update per device, None notifies everyone
+        self._changes: dict[str, frozenset[str]] | None = None
+        # Changed field paths per device of the last poll, None for new devices
+        self.field_changes: dict[str, frozenset[str] | None] = {}
+        self._notified_success: bool | None = None
+        # Duration of the updates, exported as metrics
+        self.update_duration = LatencyHistogram()
+        self._last_update_started: datetime | None = None
+        self._last_update_ms: float | None = None
+        # Time spent notifying the listeners, which write states synchronously
+        self._listeners_ms = 0.0
+        self._performance: PerformanceEvaluator | None = None
+        # State writes of the entities since start, by platform
+        self.state_writes: Counter[str] = Counter()
+        # Fires at the next planning transition of a device in program mode
+        self._cancel_transition: CALLBACK_TYPE | None = None
+        self._transitions: dict[str, datetime] = {}
+        # Derived state per device, shared by all the entities of the device
+        self.device_states: dict[str, DeviceState] = {}
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose device data slice changed."""
+        start = time.monotonic()
+        changes, self._changes = self._changes, None
+        self._update_device_states(changes)
+        alerts_changed = self._evaluate_performance()
+        if changes is not None:
+            changes = _add_group(changes, alerts_changed, DATA_GROUP_PERFORMANCE)
+        # Modes or plannings may have changed: plan the next transition again
+        self._async_schedule_transition()
+        try:
+            self._notify_listeners(changes)
+        finally:
+            self._listeners_ms = (time.monotonic() - start) * 1000
+
+    def _notify_listeners(self, changes: dict[str, frozenset[str]] | None) -> None:
+        """Call the listeners of the changed device data slices."""
+        if changes is None or self.last_update_success != self._notified_success:
+            # Availability or the whole data set changed: update everyone
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None:
+                if changes:
+                    update_callback()
+                continue
+            device_key, groups = context
+            changed = changes.get(device_key)
+            if changed and (groups is None or changed & groups):
+                update_callback()
+
+    def _evaluate_performance(self) -> set[str]:
+        """Evaluate every device, returning those whose alert changed."""
+        if self.api is None or not self.data:
+            return set()
+        if self._performance is None:
+            self._performance = PerformanceEvaluator(self.api.metrics)
+        now = dt_util.utcnow()
+        update_ms = self._last_update_ms
+        blocking_ms = max(self.api.last_parse_ms, self._listeners_ms)
+        devices = {}
+        for device_key, device in self.data.items():
+            lane = self.api.lanes.get(device.modem)
+            queued = [command.queue_time for command in lane.pending] if lane else []
+            devices[device_key] = {
+                "queue_age_s": (now - min(queued)).total_seconds() if queued else 0.0,
+                "update_duration_ms": update_ms,
+                "data_staleness_s": data_staleness(device.last_updated_date, now),
+                "loop_blocking_ms": blocking_ms,
+            }
+        previous = self._performance.reports
+        reports = self._performance.evaluate(devices)
+        return {
+            device_key
+            for device_key, report in reports.items()
+            if (old := previous.get(device_key)) is None
+            or (old.level, old.bottleneck) != (report.level, report.bottleneck)
+        }
+
+    def get_performance_report(self, device_key: str) -> PerformanceReport | None:
+        """Return the last performance evaluation of a device."""
+        if self._performance is None:
+            return None
+        return self._performance.reports.get(device_key)
+
+    def get_device_state(self, device_key: str) -> DeviceState | None:
+        """Return the derived state of a device."""
+        return self.device_states.get(device_key)
+
+    def _update_device_states(self, changes: dict[str, frozenset[str]] | None) -> None:
+        """Derive the state of the devices whose mode or plannings changed."""
+        devices = self.data or {}
+        now = dt_util.now()
+        for key, device in devices.items():
+            if (
+                changes is None
+                or key not in self.device_states
+                or changes.get(key, frozenset()) & _STATE_GROUPS
+            ):
+                self.device_states[key] = compute_device_state(device, now)
+        for key in self.device_states.keys() - devices.keys():
+            del self.device_states[key]
+
+    def _track_changes(self, changes: dict[str, frozenset[str] | None]) -> None:
+        """Record which device fields and data groups the new poll changed."""
+        self.field_changes = changes
+        self._changes = changed_groups(changes)
+
+    def _next_transitions(self) -> dict[str, datetime]:
+        """Return the next planning transition of each device in program mode."""
+        now = dt_util.now()
+        transitions = {}
+        for key, device in (self.data or {}).items():
+            planning_key = PROGRAM_PLANNINGS.get(device.indicator.current_air_mode)
+            if planning_key is None:
+                continue
+            next_change = device.get_planning_timeline(planning_key).next_change(now)
+            if next_change is not None:
+                transitions[key] = next_change
+        return transitions
+
+    @callback
+    def _async_schedule_transition(self) -> None:
+        """Wake up at the next planning transition of any device."""
+        if self._cancel_transition:
+            self._cancel_transition()
+            self._cancel_transition = None
+        self._transitions = self._next_transitions()
+        if self._transitions:
+            self._cancel_transition = async_track_point_in_time(
+                self.hass,
+                self._async_handle_transition,
+                min(self._transitions.values()),
+            )
+
+    @callback
+    def _async_handle_transition(self, now: datetime) -> None:
+        """Re-evaluate the entities of the devices whose program changed."""
+        self._cancel_transition = None
+        self._changes = {
+            key: frozenset({DATA_GROUP_SCHEDULE})
+            for key, transition in self._transitions.items()
+            if transition <= now
+        }
+        _LOGGER.debug("Planning transition for %s", list(self._changes))
+        self.async_update_listeners()
+
+    def count_state_write(self, platform: str) -> None:
+        """Count a state written by an entity of a platform."""
+        self.state_writes[platform] += 1
+
+    def get_diagnostic_info(self) -> dict[str, Any]:
+        """Return the update timing and entity activity for diagnostics."""
+        started = self._last_update_started
+        return {
+            "update_interval": (
+                self.update_interval.total_seconds() if self.update_interval else None
+            ),
+            "last_update_success": self.last_update_success,
+            "last_update_started": started.isoformat() if started else None,
+            "last_update_ms": (
+                round(self._last_update_ms, 1)
+                if self._last_update_ms is not None
+                else None
+            ),
+            "update_duration": self.update_duration.as_dict(),
+            "devices": len(self.data) if self.data else 0,
+            "next_transitions": {
+                device_key: when.isoformat()
+                for device_key, when in self._transitions.items()
+            },
+            "state_writes": dict(self.state_writes),
+            "performance": {
+                device_key: report.as_dict()
+                for device_key, report in (
+                    self._performance.reports if self._performance else {}
+                ).items()
+            },
+        }
+
+    async def async_shutdown(self) -> None:
+        """Cancel the planning transition timer."""
+        if self._cancel_transition:
+            self._cancel_transition()
+            self._cancel_transition = None
+        await super().async_shutdown()
+
+    async def async_load_snapshot(self) -> bool:
+        """
+        Restore the devices from the last persisted /products payload.
+
+        Returns True if devices were restored, so entities can be created
+        without waiting for the cloud.
+        """
+        devices = await self._snapshot.async_load()
+        if devices is None:
+            return False
+        self.async_set_updated_data(devices)
+        return True
+
+    def _save_snapshot(self) -> None:
+        """Schedule persisting the payload of the last successful fetch."""
+        self._snapshot.save(self.api.last_products_payload, self.api.last_changes)
 
     async def _async_update_data(self) -> dict[str, DataApiEntity]:
-        """Update data via library."""
+        """Update data via library, recording how long it took."""
+        self._last_update_started = dt_util.utcnow()
+        start = time.monotonic()
+        try:
+            return await self._async_fetch_data()
+        finally:
+            self._last_update_ms = (time.monotonic() - start) * 1000
+            self.update_duration.record(self._last_update_ms)
+
+    async def _async_fetch_data(self) -> dict[str, DataApiEntity]:
+        """Fetch the devices, keeping the existing ones on errors."""
+        self._changes = None
         if self.skip_next_update:
             self.skip_next_update = False
+            self._changes = {}
             # Return existing data instead of None to avoid losing state
             return self.data if hasattr(self, "data") and self.data else {}
         try:
-            async with async_timeout.timeout(self._API_TIMEOUT):
-                data = await self.api.fetch_data()
+            async with asyncio.timeout(self._API_TIMEOUT + self._API_TIMEOUT_GRACE):
+                # Devices are updated from the previous ones, not rebuilt.
+                # Requests and retries end by the deadline instead of being
+                # cancelled by the timeout above.
+                data = await self.api.fetch_data(
+                    getattr(self, "data", None), deadline=self._API_TIMEOUT
+                )
                 # If we got no data, keep existing data
                 if not data and hasattr(self, "data") and self.data:
                     _LOGGER.warning(
                         "Received empty data from API, keeping existing data"
                     )
+                    self._changes = {}
                     return self.data
+                self._save_snapshot()
+                self._track_changes(self.api.last_changes if data else {})
                 return data or {}
         except Exception as exception:
             # On error, keep existing data if available
             if hasattr(self, "data") and self.data:
                 _LOGGER.exception("Error updating data, keeping existing")
+                self._changes = {}
                 return self.data
             raise UpdateFailed(exception) from exception
         finally:
@@ -97,15 +418,21 @@ class AldesDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                         "Pending command %s was NOT applied, retrying...",
                         verification_id,
                     )
-                    # Retry the command
+                    # Retry the command, within the retry budget of the first send
                     try:
-                        await retry_fn()
+                        retried = await self.api.retry_unapplied_command(
+                            metadata.get("modem", ""), retry_fn
+                        )
                     except Exception:
                         _LOGGER.exception(
                             "Failed to retry pending command %s",
                             verification_id,
                         )
-                    # Note: We don't unregister yet - will check again next time
+                    else:
+                        # Nothing left to retry with once the budget is spent
+                        if not retried:
+                            self.api.unregister_pending_verification(verification_id)
+                    # Note: Otherwise we don't unregister yet - will check again
             except Exception:
                 _LOGGER.exception(
                     "Error verifying pending command %s",
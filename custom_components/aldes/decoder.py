@@ -0,0 +1,91 @@
+"""Typed decoding of Aldes API payloads."""
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Name of the JSON backend in use, for diagnostics
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+_MISSING = object()
+
+
+class PayloadError(ValueError):
+    """A payload does not have the expected structure or types."""
+
+
+def loads(raw: bytes | str) -> Any:
+    """Decode a JSON document, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a JSON document, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+@dataclass(frozen=True, slots=True)
+class Field:
+    """
+    A model slot read from a payload key, with its accepted types.
+
+    Mutable defaults are given as a default_factory, called for each model.
+    """
+
+    slot: str
+    key: str
+    types: type | tuple[type, ...]
+    default: Any = None
+    required: bool = False
+    default_factory: Callable[[], Any] | None = None
+
+
+def decode_fields(data: Any, fields: tuple[Field, ...], path: str) -> dict[str, Any]:
+    """
+    Return the slot values of a payload object, checking their types.
+
+    A missing object is treated as an empty one: missing keys take the field
+    default. None is accepted for every field that is not required, and
+    integers for boolean fields.
+    """
+    if data is None:
+        data = {}
+    elif not isinstance(data, dict):
+        msg = f"{path}: expected an object, got {type(data).__name__}"
+        raise PayloadError(msg)
+
+    values = {}
+    for field in fields:
+        value = data.get(field.key, _MISSING)
+        if value is _MISSING:
+            if field.required:
+                msg = f"{path}: missing {field.key}"
+                raise PayloadError(msg)
+            value = (
+                field.default_factory()
+                if field.default_factory is not None
+                else field.default
+            )
+        elif field.types is bool and isinstance(value, int):
+            # The API also sends flags as 0/1 integers
+            value = bool(value)
+        elif (value is not None or field.required) and not isinstance(
+            value, field.types
+        ):
+            msg = (
+                f"{path}.{field.key}: unexpected type {type(value).__name__}"
+                f" ({value!r})"
+            )
+            raise PayloadError(msg)
+        values[field.slot] = value
+    return values
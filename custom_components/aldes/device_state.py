@@ -0,0 +1,107 @@
+"""Device-wide state derived from the Aldes data."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from homeassistant.components.climate.const import HVACMode
+
+from .const import (
+    ECO_MODE_TEMPERATURE_OFFSET,
+    PROGRAM_COMFORT,
+    PROGRAM_ECO,
+    PROGRAM_OFF,
+    AirMode,
+)
+from .planning import PROGRAM_PLANNINGS
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .models import DataApiEntity
+
+# Effective air mode of each program character
+_HEATING_PROGRAM_MODES = {
+    PROGRAM_OFF: AirMode.OFF,
+    PROGRAM_COMFORT: AirMode.HEAT_COMFORT,
+    PROGRAM_ECO: AirMode.HEAT_ECO,
+}
+# Cooling planning only uses: 0=Off, B=Comfort (no Eco mode)
+_COOLING_PROGRAM_MODES = {
+    PROGRAM_OFF: AirMode.OFF,
+    PROGRAM_COMFORT: AirMode.COOL_COMFORT,
+}
+_PROGRAM_MODES = {
+    AirMode.HEAT_PROG_A: _HEATING_PROGRAM_MODES,
+    AirMode.HEAT_PROG_B: _HEATING_PROGRAM_MODES,
+    AirMode.COOL_PROG_A: _COOLING_PROGRAM_MODES,
+    AirMode.COOL_PROG_B: _COOLING_PROGRAM_MODES,
+}
+
+_HVAC_MODES = {
+    AirMode.OFF: HVACMode.OFF,
+    AirMode.HEAT_COMFORT: HVACMode.HEAT,
+    AirMode.HEAT_ECO: HVACMode.HEAT,
+    AirMode.HEAT_PROG_A: HVACMode.HEAT,
+    AirMode.HEAT_PROG_B: HVACMode.HEAT,
+    AirMode.COOL_COMFORT: HVACMode.COOL,
+    AirMode.COOL_BOOST: HVACMode.COOL,
+    AirMode.COOL_PROG_A: HVACMode.COOL,
+    AirMode.COOL_PROG_B: HVACMode.COOL,
+}
+
+_NOT_HEATING_MODES = (AirMode.COOL_COMFORT, AirMode.COOL_BOOST, AirMode.OFF)
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceState:
+    """
+    State shared by all the entities of a device.
+
+    ``effective_air_mode`` is the air mode in force right now: for program
+    modes, the mode selected by the active planning slot. ``temperature_offset``
+    is subtracted from set points for display (ECO runs 2°C below comfort).
+    """
+
+    air_mode: AirMode | None
+    effective_air_mode: AirMode | None
+    program_char: str | None
+    hvac_mode: HVACMode
+    min_temp: float | None
+    max_temp: float | None
+    temperature_offset: int
+
+
+def compute_device_state(device: DataApiEntity, now: datetime) -> DeviceState:
+    """Derive the device-wide state of a device at a local time."""
+    indicator = device.indicator
+    air_mode = indicator.current_air_mode
+
+    program_char = None
+    effective_mode = air_mode
+    planning_key = PROGRAM_PLANNINGS.get(air_mode)
+    if planning_key is not None:
+        program_char = device.get_planning_timeline(planning_key).program_at(now)
+        effective_mode = _PROGRAM_MODES[air_mode].get(program_char) or air_mode
+
+    # Heating limits are cmist/cmast, cooling ones fmist/fmast
+    if effective_mode in _NOT_HEATING_MODES:
+        min_temp, max_temp = indicator.fmist, indicator.fmast
+    else:
+        min_temp, max_temp = indicator.cmist, indicator.cmast
+
+    offset = ECO_MODE_TEMPERATURE_OFFSET if effective_mode == AirMode.HEAT_ECO else 0
+    if offset:
+        min_temp = min_temp - offset if min_temp is not None else None
+        max_temp = max_temp - offset if max_temp is not None else None
+
+    return DeviceState(
+        air_mode=air_mode,
+        effective_air_mode=effective_mode,
+        program_char=program_char,
+        hvac_mode=_HVAC_MODES.get(effective_mode, HVACMode.AUTO),
+        min_temp=min_temp,
+        max_temp=max_temp,
+        temperature_offset=offset,
+    )
@@ -0,0 +1,107 @@
+"""Diagnostics support for Aldes."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.helpers import entity_registry as er
+
+from .const import CONF_PASSWORD, CONF_USERNAME, DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import AldesDataUpdateCoordinator
+    from .metrics import LatencyHistogram
+
+TO_REDACT = {
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    "token",
+    "access_token",
+    "refresh_token",
+    "serial_number",
+}
+
+
+def anonymize_modems(data: Any, modems: list[str]) -> Any:
+    """
+    Replace the modem identifiers in keys and strings by device numbers.
+
+    Modems appear in dict keys, URLs and cache keys, which redaction by key
+    does not reach. The same modem gets the same alias across the snapshot.
+    """
+    aliases = {modem: f"device_{index}" for index, modem in enumerate(modems, 1)}
+
+    def _replace(value: Any) -> Any:
+        if isinstance(value, str):
+            for modem, alias in aliases.items():
+                value = value.replace(modem, alias)
+            return value
+        if isinstance(value, dict):
+            return {_replace(key): _replace(item) for key, item in value.items()}
+        if isinstance(value, list | tuple):
+            return [_replace(item) for item in value]
+        return value
+
+    return _replace(data) if aliases else data
+
+
+def histogram_buckets(histogram: LatencyHistogram) -> dict[str, int]:
+    """Return the cumulative counts of a histogram, from its first sample on."""
+    buckets: dict[str, int] = {}
+    for bound_ms, count in histogram.buckets():
+        if count:
+            buckets[f"<={bound_ms:g}ms"] = count
+        if count == histogram.count:
+            break
+    return buckets
+
+
+def _entity_counts(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the registered and disabled entities of the entry per platform."""
+    entries = er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    return {
+        "total": dict(Counter(entity.domain for entity in entries)),
+        "disabled": dict(
+            Counter(
+                entity.domain for entity in entries if entity.disabled_by is not None
+            )
+        ),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return a performance snapshot of a config entry."""
+    coordinator: AldesDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    api = coordinator.api
+
+    api_info = api.get_diagnostic_info()
+    # "token" is redacted as a whole, this only holds its expiry and counters
+    api_info["token_info"] = api_info.pop("token")
+    # Too large for state attributes, the records are only exported here
+    api_info["command_log"] = api.command_log.get_diagnostic_info()
+    for key, metrics in api.metrics.endpoints.items():
+        api_info["metrics"][key]["buckets"] = histogram_buckets(metrics.latency)
+    coordinator_info = coordinator.get_diagnostic_info()
+    coordinator_info["update_duration"]["buckets"] = histogram_buckets(
+        coordinator.update_duration
+    )
+
+    snapshot = {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "api": api_info,
+        "coordinator": coordinator_info,
+        "entities": _entity_counts(hass, entry),
+        "last_products_payload": api.last_products_payload,
+    }
+    modems = list(coordinator.data) if coordinator.data else []
+    return async_redact_data(anonymize_modems(snapshot, modems), TO_REDACT)
@@ -0,0 +1,199 @@
+"""In-process request metrics for the Aldes API client."""
+
+import re
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+# Bucket upper bounds in ms, 4 per doubling from 1 ms to about 2 minutes
+_LATENCY_BOUNDS = tuple(2 ** (index / 4) for index in range(69))
+
+# Per-device URL parts, replaced so endpoints stay a small fixed set
+_ENDPOINT_PATTERNS = (
+    (re.compile(r"/products/[^/]+"), "/products/{modem}"),
+    (re.compile(r"/statistics/.*$"), "/statistics/{period}"),
+)
+
+
+def endpoint_name(url: str) -> str:
+    """Return the endpoint of a URL, without host and per-device parts."""
+    path = urlsplit(url).path
+    for pattern, replacement in _ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+class LatencyHistogram:
+    """
+    Latency histogram with fixed, logarithmically spaced buckets.
+
+    Memory does not grow with the number of samples. Percentiles are
+    estimated within about 20% (the ratio between two bucket bounds),
+    and capped by the largest latency seen.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        # The last bucket holds everything above the highest bound
+        self._counts = [0] * (len(_LATENCY_BOUNDS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float) -> None:
+        """Add a latency sample in milliseconds."""
+        self._counts[bisect_left(_LATENCY_BOUNDS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the latency below which percent of the samples fall."""
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index == len(_LATENCY_BOUNDS):
+                    return self.max_ms
+                return min(_LATENCY_BOUNDS[index], self.max_ms)
+        return self.max_ms
+
+    @classmethod
+    def combined(cls, histograms: Iterable["LatencyHistogram"]) -> "LatencyHistogram":
+        """Return a histogram of the samples of several histograms."""
+        result = cls()
+        for histogram in histograms:
+            result._add(histogram._counts, histogram.count, histogram.total_ms)
+            result.max_ms = max(result.max_ms, histogram.max_ms)
+        return result
+
+    def since(self, earlier: "LatencyHistogram") -> "LatencyHistogram":
+        """
+        Return a histogram of the samples recorded after an earlier copy.
+
+        The largest latency of the interval is not known: the one of the
+        whole histogram caps its percentiles instead.
+        """
+        result = LatencyHistogram()
+        result._add(self._counts, self.count, self.total_ms)
+        result._add(
+            [-count for count in earlier._counts], -earlier.count, -earlier.total_ms
+        )
+        result.max_ms = self.max_ms if result.count else 0.0
+        return result
+
+    def _add(self, counts: list[int], count: int, total_ms: float) -> None:
+        """Add bucket counts and totals to this histogram."""
+        self._counts = [
+            mine + other for mine, other in zip(self._counts, counts, strict=True)
+        ]
+        self.count += count
+        self.total_ms += total_ms
+
+    def buckets(self) -> list[tuple[float, int]]:
+        """Return (upper bound in ms, samples up to it) at each doubling."""
+        buckets = []
+        seen = 0
+        for index, bound in enumerate(_LATENCY_BOUNDS):
+            seen += self._counts[index]
+            if index % 4 == 0:
+                buckets.append((bound, seen))
+        return buckets
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the summary statistics in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p50_ms": _round(self.percentile(50)),
+            "p95_ms": _round(self.percentile(95)),
+            "p99_ms": _round(self.percentile(99)),
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+def _round(value: float | None) -> float | None:
+    """Round a latency for display."""
+    return round(value, 1) if value is not None else None
+
+
+@dataclass
+class EndpointMetrics:
+    """Counters of one endpoint and method."""
+
+    requests: int = 0
+    retries: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    # Failed requests by error class, e.g. "TimeoutError" or "HTTP 503"
+    errors: dict[str, int] = field(default_factory=dict)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def error_count(self) -> int:
+        """Return the number of failed requests."""
+        return sum(self.errors.values())
+
+    def record(
+        self,
+        duration_ms: float,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+        error: str | None = None,
+    ) -> None:
+        """Record one request attempt."""
+        self.requests += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.latency.record(duration_ms)
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.error_count,
+            "error_rate": (
+                round(self.error_count / self.requests, 3) if self.requests else 0
+            ),
+            "errors_by_class": dict(self.errors),
+            "retries": self.retries,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            **self.latency.as_dict(),
+        }
+
+
+class ApiMetrics:
+    """Request metrics of the API client, per method and endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize with no request recorded."""
+        self._endpoints: dict[str, EndpointMetrics] = {}
+
+    def endpoint(self, method: str, url: str) -> EndpointMetrics:
+        """Return the metrics of a request, created on first use."""
+        key = f"{method.upper()} {endpoint_name(url)}"
+        metrics = self._endpoints.get(key)
+        if metrics is None:
+            metrics = self._endpoints[key] = EndpointMetrics()
+        return metrics
+
+    def record_retry(self, method: str, url: str) -> None:
+        """Count a retried request."""
+        self.endpoint(method, url).retries += 1
+
+    @property
+    def endpoints(self) -> dict[str, EndpointMetrics]:
+        """Return the metrics by "METHOD endpoint"."""
+        return self._endpoints
+
+    def get_diagnostic_info(self) -> dict[str, Any]:
+        """Return the metrics of every endpoint for diagnostics."""
+        return {key: metrics.as_dict() for key, metrics in self._endpoints.items()}
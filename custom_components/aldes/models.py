@@ -1,11 +1,18 @@
 """Models for Aldes integration."""
 
 import logging
+from abc import ABC, abstractmethod
 from enum import IntEnum, StrEnum
-from typing import Any
+from typing import Any, ClassVar, Self
+
+from .decoder import Field, PayloadError, decode_fields
+from .planning import PlanningTimeline, compile_planning
 
 _LOGGER = logging.getLogger(__name__)
 
+_NUMBER = (int, float)
+_CODE = (str, int)
+
 
 class ApiHealthState(StrEnum):
     """API Health states."""
@@ -16,6 +23,22 @@ class ApiHealthState(StrEnum):
     OFFLINE = "offline"
 
 
+class ApiEvent(StrEnum):
+    """Changes published by the API client to its listeners."""
+
+    HEALTH = "health"  # health_state changed
+    QUEUE = "queue"  # A command was queued, started or finished
+    HISTORY = "history"  # A command was added to the history
+
+
+class AlertLevel(StrEnum):
+    """System alert levels."""
+
+    OK = "OK"
+    WARNING = "Warning"
+    CRITICAL = "Critical"
+
+
 class CommandUid(IntEnum):
     """Command UIDs for API requests."""
 
@@ -68,43 +91,168 @@ class AntilegionellaCycle(StrEnum):
     SUNDAY = "7"
 
 
-class SettingsApiEntity:
+class _FrozenModel(ABC):
+    """
+    Base of the API models: slotted, and immutable once initialized.
+
+    Subclasses list their attributes in ``__slots__`` and build their values
+    from a payload in ``_parse``. Models compare equal when all their public
+    slots do. ``updated`` shares the unchanged parts of a model with the one
+    built from the next payload instead of rebuilding them.
+    """
+
+    __slots__ = ()
+
+    # Nested models, which report the changes of their own fields
+    _NESTED: ClassVar[frozenset[str]] = frozenset()
+
+    def __init__(self, data: dict[str, Any] | None) -> None:
+        """Initialize from a payload."""
+        self._assign(self._parse(data, None, set()))
+
+    @classmethod
+    @abstractmethod
+    def _parse(
+        cls, data: dict[str, Any] | None, previous: Self | None, changed: set[str]
+    ) -> dict[str, Any]:
+        """
+        Return the slot values of a payload.
+
+        With a previous model, nested models are updated from it and the
+        paths of their changed fields added to changed.
+        """
+
+    def _assign(self, values: dict[str, Any]) -> None:
+        """Set the slots of a new model."""
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def updated(self, data: dict[str, Any] | None) -> tuple[Self, frozenset[str]]:
+        """
+        Return the model of a new payload and the paths of the changed fields.
+
+        The model itself is returned when nothing changed. Otherwise unchanged
+        values and nested models are shared with the new model, and changed
+        fields of nested models are reported as ``"child.field"``.
+        """
+        changed: set[str] = set()
+        values = self._parse(data, self, changed)
+        for name, value in values.items():
+            if name.startswith("_") or name in self._NESTED:
+                continue
+            current = getattr(self, name)
+            if value == current:
+                values[name] = current
+            else:
+                changed.add(name)
+        if not changed:
+            return self, frozenset()
+        model = object.__new__(type(self))
+        model._assign(values)
+        return model, frozenset(changed)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Refuse changes, models are shared between entities."""
+        msg = f"{type(self).__name__} is immutable"
+        raise AttributeError(msg)
+
+    def __delattr__(self, name: str) -> None:
+        """Refuse changes, models are shared between entities."""
+        msg = f"{type(self).__name__} is immutable"
+        raise AttributeError(msg)
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if other is the same model with equal values."""
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name)
+            for name in self.__slots__
+            if not name.startswith("_")
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return the model values."""
+        values = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for name in self.__slots__
+            if not name.startswith("_")
+        )
+        return f"{type(self).__name__}({values})"
+
+
+class SettingsApiEntity(_FrozenModel):
     """Settings Api Entity."""
 
+    __slots__ = ("people", "antilegio", "kwh_creuse", "kwh_pleine")
+
     people: HouseholdComposition | None
     antilegio: int | None
     kwh_creuse: float | None
     kwh_pleine: float | None
 
-    def __init__(self, data: dict[str, Any] | None) -> None:
-        """Initialize."""
-        self.people = data.get("people") if data else None
-        self.antilegio = data.get("antilegio") if data else None
-        self.kwh_creuse = data.get("kwh_creuse") if data else None
-        self.kwh_pleine = data.get("kwh_pleine") if data else None
+    _FIELDS = (
+        Field("people", "people", _CODE),
+        Field("antilegio", "antilegio", _CODE),
+        Field("kwh_creuse", "kwh_creuse", _NUMBER),
+        Field("kwh_pleine", "kwh_pleine", _NUMBER),
+    )
 
+    @classmethod
+    def _parse(
+        cls, data: dict[str, Any] | None, _previous: Self | None, _changed: set[str]
+    ) -> dict[str, Any]:
+        """Return the slot values of a payload, which has no nested models."""
+        return decode_fields(data, cls._FIELDS, "settings")
 
-class ThermostatApiEntity:
+
+class ThermostatApiEntity(_FrozenModel):
     """Thermistat Api Entity."""
 
+    __slots__ = ("id", "name", "number", "temperature_set", "current_temperature")
+
     id: int
     name: str
     number: int
     temperature_set: int
     current_temperature: float
 
-    def __init__(self, data: dict[str, Any]) -> None:
-        """Initialize."""
-        self.id = data["ThermostatId"]
-        self.name = data["Name"]
-        self.number = data["Number"]
-        self.temperature_set = data["TemperatureSet"]
-        self.current_temperature = data["CurrentTemperature"]
+    _FIELDS = (
+        Field("id", "ThermostatId", int, required=True),
+        Field("name", "Name", str, required=True),
+        Field("number", "Number", int, required=True),
+        Field("temperature_set", "TemperatureSet", _NUMBER, required=True),
+        Field("current_temperature", "CurrentTemperature", _NUMBER, required=True),
+    )
+
+    @classmethod
+    def _parse(
+        cls, data: dict[str, Any] | None, _previous: Self | None, _changed: set[str]
+    ) -> dict[str, Any]:
+        """Return the slot values of a payload, which has no nested models."""
+        return decode_fields(data, cls._FIELDS, "thermostat")
 
 
-class IndicatorApiEntity:
+class IndicatorApiEntity(_FrozenModel):
     """Thermistat Api Entity."""
 
+    __slots__ = (
+        "fmist",
+        "fmast",
+        "cmast",
+        "cmist",
+        "hot_water_quantity",
+        "main_temperature",
+        "current_air_mode",
+        "current_water_mode",
+        "settings",
+        "thermostats",
+        "_thermostats_by_id",
+    )
+    _NESTED = frozenset({"settings", "thermostats"})
+
     # Heat temperatur min
     fmist: int
     # Heat temperatur max
@@ -118,37 +266,131 @@ class IndicatorApiEntity:
     # Main temperature in °C
     main_temperature: float
     # Current air mode, default A = OFF
-    current_air_mode: AirMode = AirMode.OFF
+    current_air_mode: AirMode
     # Current water mode, default L = OFF
-    current_water_mode: WaterMode = WaterMode.OFF
+    current_water_mode: WaterMode
 
     settings: SettingsApiEntity
-    thermostats: list[ThermostatApiEntity]
-
-    def __init__(self, data: dict[str, Any] | None) -> None:
-        """Initialize."""
-        self.fmist = data.get("fmist", 0) if data else 0
-        self.fmast = data.get("fmast", 0) if data else 0
-        self.cmast = data.get("cmast", 0) if data else 0
-        self.cmist = data.get("cmist", 0) if data else 0
-        self.hot_water_quantity = data.get("qte_eau_chaude", 0) if data else 0
-        self.main_temperature = data.get("tmp_principal", 0) if data else 0
-        self.current_air_mode = data.get("current_air_mode") if data else AirMode.OFF
-        self.current_water_mode = (
-            data.get("current_water_mode") if data else WaterMode.OFF
+    thermostats: tuple[ThermostatApiEntity, ...]
+
+    _FIELDS = (
+        Field("fmist", "fmist", _NUMBER, default=0),
+        Field("fmast", "fmast", _NUMBER, default=0),
+        Field("cmast", "cmast", _NUMBER, default=0),
+        Field("cmist", "cmist", _NUMBER, default=0),
+        Field("hot_water_quantity", "qte_eau_chaude", _NUMBER, default=0),
+        Field("main_temperature", "tmp_principal", _NUMBER, default=0),
+        Field("current_air_mode", "current_air_mode", str, default=AirMode.OFF),
+        Field("current_water_mode", "current_water_mode", str, default=WaterMode.OFF),
+    )
+
+    @classmethod
+    def _parse(
+        cls, data: dict[str, Any] | None, previous: Self | None, changed: set[str]
+    ) -> dict[str, Any]:
+        """Return the slot values of a payload."""
+        values = decode_fields(data, cls._FIELDS, "indicator")
+        settings_data = data.get("settings") if data else None
+        if previous is None:
+            settings = SettingsApiEntity(settings_data)
+        else:
+            settings, settings_changed = previous.settings.updated(settings_data)
+            changed.update(f"settings.{name}" for name in settings_changed)
+
+        thermostats = cls._parse_thermostats(
+            data.get("thermostats") if data else None, previous, changed
         )
-        self.settings = SettingsApiEntity(data.get("settings") if data else None)
-        self.thermostats = []
-
-        if data and data.get("thermostats"):
-            self.thermostats = [
-                ThermostatApiEntity(t) for t in data["thermostats"]
-            ]
-
-
-class DataApiEntity:
+        if previous is not None and thermostats is previous.thermostats:
+            thermostats_by_id = previous.thermostats_by_id
+        else:
+            # Thermostats by id, built once so lookups do not scan the list
+            thermostats_by_id = {t.id: t for t in thermostats}
+
+        values["settings"] = settings
+        values["thermostats"] = thermostats
+        values["_thermostats_by_id"] = thermostats_by_id
+        return values
+
+    @staticmethod
+    def _parse_thermostats(
+        payloads: list[dict[str, Any]] | None,
+        previous: "IndicatorApiEntity | None",
+        changed: set[str],
+    ) -> tuple[ThermostatApiEntity, ...]:
+        """Return the thermostats of a payload, reusing the unchanged ones."""
+        if payloads is not None and not isinstance(payloads, list):
+            msg = (
+                "indicator.thermostats: expected a list, "
+                f"got {type(payloads).__name__}"
+            )
+            raise PayloadError(msg)
+        if not payloads:
+            if previous is not None and previous.thermostats:
+                changed.add("thermostats")
+            return ()
+        if previous is None:
+            return tuple(ThermostatApiEntity(t) for t in payloads)
+
+        thermostats = []
+        for payload in payloads:
+            current = (
+                previous.get_thermostat(payload.get("ThermostatId"))
+                if isinstance(payload, dict)
+                else None
+            )
+            if current is None:
+                thermostats.append(ThermostatApiEntity(payload))
+                continue
+            thermostat, thermostat_changed = current.updated(payload)
+            changed.update(
+                f"thermostats.{thermostat.id}.{name}" for name in thermostat_changed
+            )
+            thermostats.append(thermostat)
+
+        if len(thermostats) == len(previous.thermostats) and all(
+            new is old
+            for new, old in zip(thermostats, previous.thermostats, strict=True)
+        ):
+            return previous.thermostats
+        if [t.id for t in thermostats] != [t.id for t in previous.thermostats]:
+            changed.add("thermostats")
+        return tuple(thermostats)
+
+    @property
+    def thermostats_by_id(self) -> dict[int, ThermostatApiEntity]:
+        """Return the thermostats by id."""
+        return self._thermostats_by_id
+
+    def get_thermostat(self, thermostat_id: int) -> ThermostatApiEntity | None:
+        """Return the thermostat with the given id, if present."""
+        return self._thermostats_by_id.get(thermostat_id)
+
+
+class DataApiEntity(_FrozenModel):
     """Data API Entity."""
 
+    __slots__ = (
+        "indicator",
+        "last_updated_date",
+        "modem",
+        "reference",
+        "serial_number",
+        "type",
+        "filter_wear",
+        "date_last_filter_update",
+        "has_filter",
+        "is_connected",
+        "week_planning",
+        "week_planning2",
+        "week_planning3",
+        "week_planning4",
+        "holidays_start",
+        "holidays_end",
+        "hors_gel",
+        "_timelines",
+    )
+    _NESTED = frozenset({"indicator"})
+
     indicator: IndicatorApiEntity
     last_updated_date: str
     modem: str
@@ -167,35 +409,31 @@ class DataApiEntity:
     holidays_end: str | None
     hors_gel: bool
 
+    _FIELDS = (
+        Field("last_updated_date", "lastUpdatedDate", str, default=""),
+        Field("modem", "modem", str, default=""),
+        Field("reference", "reference", str, default=""),
+        Field("serial_number", "serial_number", str, default=""),
+        Field("type", "type", str, default=""),
+        Field("filter_wear", "usureFiltre", bool, default=False),
+        Field("date_last_filter_update", "dateLastFilterUpdate", str, default=""),
+        Field("has_filter", "hasFilter", bool, default=False),
+        Field("is_connected", "isConnected", bool, default=False),
+        Field("week_planning", "week_planning", list, default_factory=list),
+        Field("week_planning2", "week_planning2", list, default_factory=list),
+        Field("week_planning3", "week_planning3", list, default_factory=list),
+        Field("week_planning4", "week_planning4", list, default_factory=list),
+    )
+    # Holidays dates and frost protection come from the indicator
+    _INDICATOR_FIELDS = (
+        Field("holidays_start", "date_debut_vac", str),
+        Field("holidays_end", "date_fin_vac", str),
+        Field("hors_gel", "hors_gel", bool, default=False),
+    )
+
     def __init__(self, data: dict[str, Any] | None) -> None:
         """Initialize."""
-        self.indicator = IndicatorApiEntity(data.get("indicator") if data else None)
-        self.last_updated_date = data.get("lastUpdatedDate", "") if data else ""
-        self.modem = data.get("modem", "") if data else ""
-        self.reference = data.get("reference", "") if data else ""
-        self.serial_number = data.get("serial_number", "") if data else ""
-        self.type = data.get("type", "") if data else ""
-        self.filter_wear = data.get("usureFiltre", False) if data else False
-        self.date_last_filter_update = (
-            data.get("dateLastFilterUpdate", "") if data else ""
-        )
-        self.has_filter = data.get("hasFilter", False) if data else False
-        self.is_connected = data.get("isConnected", False) if data else False
-        self.week_planning = data.get("week_planning", []) if data else []
-        self.week_planning2 = data.get("week_planning2", []) if data else []
-        self.week_planning3 = data.get("week_planning3", []) if data else []
-        self.week_planning4 = data.get("week_planning4", []) if data else []
-
-        # Parse holidays dates and frost protection from indicator if available
-        self.holidays_start = None
-        self.holidays_end = None
-        self.hors_gel = False
-        if data and "indicator" in data and data["indicator"]:
-            indicator_data = data["indicator"]
-            self.holidays_start = indicator_data.get("date_debut_vac")
-            self.holidays_end = indicator_data.get("date_fin_vac")
-            self.hors_gel = indicator_data.get("hors_gel", False)
-
+        super().__init__(data)
         _LOGGER.debug(
             "DataApiEntity initialized - Device: %s (%s), Connected: %s, "
             "Plannings loaded: week_planning=%d, week_planning2=%d, "
@@ -208,3 +446,39 @@ class DataApiEntity:
             len(self.week_planning3),
             len(self.week_planning4),
         )
+
+    @classmethod
+    def _parse(
+        cls, data: dict[str, Any] | None, previous: Self | None, changed: set[str]
+    ) -> dict[str, Any]:
+        """Return the slot values of a payload."""
+        values = decode_fields(data, cls._FIELDS, "device")
+        indicator_data = data.get("indicator") if data else None
+        if previous is None:
+            indicator = IndicatorApiEntity(indicator_data)
+        else:
+            indicator, indicator_changed = previous.indicator.updated(indicator_data)
+            changed.update(f"indicator.{name}" for name in indicator_changed)
+        values.update(decode_fields(indicator_data, cls._INDICATOR_FIELDS, "indicator"))
+        values["indicator"] = indicator
+        # Compiled plannings, built on first use and shared by all entities
+        values["_timelines"] = {}
+        return values
+
+    def updated(self, data: dict[str, Any] | None) -> tuple[Self, frozenset[str]]:
+        """Return the device of a new payload and the paths of changed fields."""
+        device, changed = super().updated(data)
+        if device is not self:
+            # Keep the compiled plannings that did not change
+            for planning_key, timeline in self._timelines.items():
+                if planning_key not in changed:
+                    device._timelines[planning_key] = timeline
+        return device, changed
+
+    def get_planning_timeline(self, planning_key: str) -> PlanningTimeline:
+        """Return the compiled timeline of a week_planning* attribute."""
+        timeline = self._timelines.get(planning_key)
+        if timeline is None:
+            timeline = compile_planning(getattr(self, planning_key, None))
+            self._timelines[planning_key] = timeline
+        return timeline
@@ -10,7 +10,7 @@ from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.const import EntityCategory
 from homeassistant.helpers.device_registry import DeviceInfo
 
-from .const import DOMAIN, FRIENDLY_NAMES, MANUFACTURER
+from .const import DATA_GROUP_SETTINGS, DOMAIN, FRIENDLY_NAMES, MANUFACTURER
 from .entity import AldesEntity, DeviceContext
 
 if TYPE_CHECKING:
@@ -58,6 +58,7 @@ async def async_setup_entry(
 class AldesKwhPriceNumber(AldesEntity, NumberEntity):
     """Base class for kWh price number entities."""
 
+    _data_groups = frozenset({DATA_GROUP_SETTINGS})
     _attr_native_min_value = 0.0
     _attr_native_max_value = 0.999
     _attr_native_step = 0.001
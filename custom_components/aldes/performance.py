@@ -0,0 +1,197 @@
+"""Rolling evaluation of the integration performance for the system alert."""
+
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from .const import (
+    PERFORMANCE_HYSTERESIS,
+    PERFORMANCE_MIN_REQUESTS,
+    PERFORMANCE_THRESHOLDS,
+    PERFORMANCE_WINDOW,
+)
+from .metrics import ApiMetrics, LatencyHistogram
+from .models import AlertLevel
+
+_SEVERITY = {AlertLevel.OK: 0, AlertLevel.WARNING: 1, AlertLevel.CRITICAL: 2}
+
+
+@dataclass(frozen=True, slots=True)
+class _ApiSnapshot:
+    """Cumulative API counters at one point in time."""
+
+    at: float
+    latency: LatencyHistogram
+    requests: int
+    errors: int
+    retries: int
+
+
+@dataclass(frozen=True, slots=True)
+class PerformanceReport:
+    """Evaluated performance of one device."""
+
+    level: AlertLevel
+    # Measurement behind the level, None when everything is OK
+    bottleneck: str | None
+    measurements: dict[str, float | None]
+    levels: dict[str, AlertLevel]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report as state attributes."""
+        return {
+            "level": self.level.value,
+            "bottleneck": self.bottleneck,
+            "bottleneck_value": (
+                self.measurements[self.bottleneck] if self.bottleneck else None
+            ),
+            "checks": {
+                name: {"value": value, "level": self.levels[name].value}
+                for name, value in self.measurements.items()
+            },
+        }
+
+
+def data_staleness(last_updated_date: str, now: datetime) -> float | None:
+    """Return the age in seconds of a device lastUpdatedDate, if valid."""
+    try:
+        updated = datetime.fromisoformat(last_updated_date)
+    except (TypeError, ValueError):
+        return None
+    if updated.tzinfo is None:
+        updated = updated.replace(tzinfo=UTC)
+    return max(0.0, (now - updated).total_seconds())
+
+
+def check_level(
+    value: float | None,
+    thresholds: tuple[float, float],
+    previous: AlertLevel = AlertLevel.OK,
+) -> AlertLevel:
+    """
+    Return the level of a measurement, with hysteresis.
+
+    A level is entered at its threshold but only left once the measurement
+    is PERFORMANCE_HYSTERESIS below it, so values around a threshold do not
+    make the alert flap.
+    """
+    if value is None:
+        return AlertLevel.OK
+    warning, critical = thresholds
+    release = 1 - PERFORMANCE_HYSTERESIS
+    if value >= critical or (
+        previous is AlertLevel.CRITICAL and value >= critical * release
+    ):
+        return AlertLevel.CRITICAL
+    if value >= warning or (
+        previous is not AlertLevel.OK and value >= warning * release
+    ):
+        return AlertLevel.WARNING
+    return AlertLevel.OK
+
+
+class PerformanceEvaluator:
+    """
+    Per-device alert levels from API, queue, update and data measurements.
+
+    API latency, error and retry rates are account-wide and computed over
+    the last PERFORMANCE_WINDOW seconds; the other measurements are given
+    per device at each evaluation.
+    """
+
+    def __init__(
+        self,
+        metrics: ApiMetrics,
+        window: float = PERFORMANCE_WINDOW,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize with no evaluation done."""
+        self._metrics = metrics
+        self._window = window
+        self._clock = clock
+        self._snapshots: deque[_ApiSnapshot] = deque()
+        self._levels: dict[str, dict[str, AlertLevel]] = {}
+        self.reports: dict[str, PerformanceReport] = {}
+
+    def _snapshot(self) -> _ApiSnapshot:
+        """Return the current API counters."""
+        endpoints = self._metrics.endpoints.values()
+        return _ApiSnapshot(
+            at=self._clock(),
+            latency=LatencyHistogram.combined(
+                endpoint.latency for endpoint in endpoints
+            ),
+            requests=sum(endpoint.requests for endpoint in endpoints),
+            errors=sum(endpoint.error_count for endpoint in endpoints),
+            retries=sum(endpoint.retries for endpoint in endpoints),
+        )
+
+    def _api_measurements(self) -> dict[str, float | None]:
+        """Return the API latency and rates over the rolling window."""
+        current = self._snapshot()
+        # Keep the newest snapshot older than the window as its start
+        while len(self._snapshots) > 1 and (
+            current.at - self._snapshots[1].at >= self._window
+        ):
+            self._snapshots.popleft()
+        start = self._snapshots[0] if self._snapshots else None
+        self._snapshots.append(current)
+
+        if start is None:
+            latency, requests = current.latency, current.requests
+            errors, retries = current.errors, current.retries
+        else:
+            latency = current.latency.since(start.latency)
+            requests = current.requests - start.requests
+            errors = current.errors - start.errors
+            retries = current.retries - start.retries
+        # A few slow requests, e.g. after startup, do not make a percentile
+        enough = requests >= PERFORMANCE_MIN_REQUESTS
+        return {
+            "api_p95_latency_ms": latency.percentile(95) if enough else None,
+            "api_error_rate": round(errors / requests, 3) if enough else None,
+            "api_retry_rate": round(retries / requests, 3) if enough else None,
+        }
+
+    def evaluate(
+        self, devices: dict[str, dict[str, float | None]]
+    ) -> dict[str, PerformanceReport]:
+        """Evaluate the devices from their own measurements and the API ones."""
+        api = self._api_measurements()
+        reports = {}
+        for device_key, device_measurements in devices.items():
+            measurements = {**api, **device_measurements}
+            previous = self._levels.get(device_key, {})
+            levels = {
+                name: check_level(
+                    value,
+                    PERFORMANCE_THRESHOLDS[name],
+                    previous.get(name, AlertLevel.OK),
+                )
+                for name, value in measurements.items()
+            }
+            reports[device_key] = _report(measurements, levels)
+            self._levels[device_key] = levels
+        for device_key in self._levels.keys() - devices.keys():
+            del self._levels[device_key]
+        self.reports = reports
+        return reports
+
+
+def _report(
+    measurements: dict[str, float | None], levels: dict[str, AlertLevel]
+) -> PerformanceReport:
+    """Return the report of a device, naming its worst measurement."""
+    level = max(levels.values(), key=_SEVERITY.__getitem__, default=AlertLevel.OK)
+    bottleneck = None
+    if level is not AlertLevel.OK:
+        # Among the measurements at the worst level, the furthest past it
+        index = _SEVERITY[level] - 1
+        bottleneck = max(
+            (name for name, name_level in levels.items() if name_level is level),
+            key=lambda name: (measurements[name] / PERFORMANCE_THRESHOLDS[name][index]),
+        )
+    return PerformanceReport(level, bottleneck, measurements, levels)
@@ -0,0 +1,128 @@
+"""Compiled week plannings for Aldes devices."""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from .const import HOUR_TO_CHAR_THRESHOLD, SLOT_MIN_LENGTH, AirMode
+
+DAYS_PER_WEEK = 7
+HOURS_PER_DAY = 24
+SLOTS_PER_WEEK = DAYS_PER_WEEK * HOURS_PER_DAY
+
+# Planning followed by each program air mode
+PROGRAM_PLANNINGS = {
+    AirMode.HEAT_PROG_A: "week_planning",
+    AirMode.HEAT_PROG_B: "week_planning2",
+    AirMode.COOL_PROG_A: "week_planning3",
+    AirMode.COOL_PROG_B: "week_planning4",
+}
+
+# Compiled timelines kept across polls, most recently used last
+_TIMELINE_CACHE_SIZE = 16
+_timeline_cache: OrderedDict[tuple[str, ...], "PlanningTimeline"] = OrderedDict()
+
+
+def encode_hour(hour: int) -> str:
+    """Return the planning character of an hour (0-9, then A-N for 10-23h)."""
+    if hour < HOUR_TO_CHAR_THRESHOLD:
+        return str(hour)
+    return chr(ord("A") + hour - HOUR_TO_CHAR_THRESHOLD)
+
+
+def decode_hour(char: str) -> int | None:
+    """Return the hour of a planning character, None if it is not one."""
+    if char.isdigit():
+        return int(char)
+    hour = ord(char) - ord("A") + HOUR_TO_CHAR_THRESHOLD
+    if HOUR_TO_CHAR_THRESHOLD <= hour < HOURS_PER_DAY:
+        return hour
+    return None
+
+
+def slot_index(day: int, hour: int) -> int:
+    """Return the slot of a weekday (0=Monday) and hour in the week."""
+    return day * HOURS_PER_DAY + hour
+
+
+def planning_commands(planning: list[Any] | None) -> tuple[str, ...]:
+    """Return the "[hour][day][mode]" strings of a raw planning."""
+    if not planning:
+        return ()
+    commands = []
+    for item in planning:
+        command = item.get("command") if isinstance(item, dict) else item
+        if isinstance(command, str):
+            commands.append(command)
+    return tuple(commands)
+
+
+@dataclass(frozen=True, slots=True)
+class PlanningTimeline:
+    """
+    Week planning compiled to one program character per hour slot.
+
+    Slot ``day * 24 + hour`` holds the program character of that hour, or None
+    when the planning does not cover it. ``transitions`` lists, in order, the
+    slots whose program differs from the slot before them.
+    """
+
+    slots: tuple[str | None, ...]
+    transitions: tuple[int, ...]
+
+    @classmethod
+    def compile(cls, commands: tuple[str, ...]) -> "PlanningTimeline":
+        """Parse planning commands into a timeline."""
+        slots: list[str | None] = [None] * SLOTS_PER_WEEK
+        for command in commands:
+            if len(command) < SLOT_MIN_LENGTH or not command[1].isdigit():
+                continue
+            hour = decode_hour(command[0])
+            day = int(command[1])
+            if hour is None or day >= DAYS_PER_WEEK:
+                continue
+            # Like the raw lookup, the first entry of a slot wins
+            if slots[slot_index(day, hour)] is None:
+                slots[slot_index(day, hour)] = command[-1]
+        transitions = tuple(
+            index for index in range(SLOTS_PER_WEEK) if slots[index] != slots[index - 1]
+        )
+        return cls(tuple(slots), transitions)
+
+    def program_at(self, when: datetime) -> str | None:
+        """Return the program character active at a local time."""
+        return self.slots[slot_index(when.weekday(), when.hour)]
+
+    def next_change(self, when: datetime) -> datetime | None:
+        """Return when the program changes next after a local time."""
+        if not self.transitions:
+            return None
+        current = slot_index(when.weekday(), when.hour)
+        position = bisect_right(self.transitions, current)
+        # Wrap around to the first transition of next week
+        if position == len(self.transitions):
+            hours = self.transitions[0] + SLOTS_PER_WEEK - current
+        else:
+            hours = self.transitions[position] - current
+        return when.replace(minute=0, second=0, microsecond=0) + timedelta(hours=hours)
+
+
+EMPTY_TIMELINE = PlanningTimeline((None,) * SLOTS_PER_WEEK, ())
+
+
+def compile_planning(planning: list[Any] | None) -> PlanningTimeline:
+    """Return the timeline of a raw planning, reusing an identical one."""
+    commands = planning_commands(planning)
+    if not commands:
+        return EMPTY_TIMELINE
+    timeline = _timeline_cache.get(commands)
+    if timeline is not None:
+        _timeline_cache.move_to_end(commands)
+        return timeline
+    timeline = PlanningTimeline.compile(commands)
+    _timeline_cache[commands] = timeline
+    if len(_timeline_cache) > _TIMELINE_CACHE_SIZE:
+        _timeline_cache.popitem(last=False)
+    return timeline
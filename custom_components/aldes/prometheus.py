@@ -0,0 +1,159 @@
+"""Prometheus text exposition of the Aldes integration metrics."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .coordinator import AldesDataUpdateCoordinator
+    from .metrics import LatencyHistogram
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Metric families: name -> (type, help)
+_FAMILIES = {
+    "aldes_api_request_duration_seconds": (
+        "histogram",
+        "Duration of the Aldes API request attempts.",
+    ),
+    "aldes_api_requests_total": ("counter", "Aldes API request attempts."),
+    "aldes_api_errors_total": ("counter", "Failed Aldes API request attempts."),
+    "aldes_api_retries_total": ("counter", "Retried Aldes API requests."),
+    "aldes_api_bytes_received_total": (
+        "counter",
+        "Bytes of the Aldes API response bodies.",
+    ),
+    "aldes_api_bytes_sent_total": (
+        "counter",
+        "Bytes of the Aldes API request bodies.",
+    ),
+    "aldes_command_queue_depth": ("gauge", "Commands waiting for a device."),
+    "aldes_commands_total": ("counter", "Commands run, by outcome."),
+    "aldes_verification_retries_total": (
+        "counter",
+        "Commands re-sent because the device did not apply them.",
+    ),
+    "aldes_cache_hits_total": ("counter", "Responses served from the cache."),
+    "aldes_cache_misses_total": ("counter", "Cache lookups without a response."),
+    "aldes_cache_hit_ratio": ("gauge", "Share of the cache lookups served."),
+    "aldes_coordinator_update_duration_seconds": (
+        "histogram",
+        "Duration of the coordinator updates.",
+    ),
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(name: str, labels: Labels, value: float) -> str:
+    """Return one sample line."""
+    if labels:
+        pairs = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels)
+        name = f"{name}{{{pairs}}}"
+    if isinstance(value, float):
+        return f"{name} {value!r}"
+    return f"{name} {value}"
+
+
+class _Samples:
+    """Samples grouped by metric family, in the order of _FAMILIES."""
+
+    def __init__(self) -> None:
+        """Initialize with no sample."""
+        self._lines: dict[str, list[str]] = {name: [] for name in _FAMILIES}
+
+    def add(self, family: str, labels: Labels, value: float, suffix: str = "") -> None:
+        """Add a sample to a family."""
+        self._lines[family].append(_format(family + suffix, labels, value))
+
+    def add_histogram(
+        self, family: str, labels: Labels, histogram: LatencyHistogram
+    ) -> None:
+        """Add the buckets, sum and count of a millisecond histogram."""
+        for bound_ms, count in histogram.buckets():
+            bucket = (*labels, ("le", repr(bound_ms / 1000)))
+            self.add(family, bucket, count, "_bucket")
+        self.add(family, (*labels, ("le", "+Inf")), histogram.count, "_bucket")
+        self.add(family, labels, histogram.total_ms / 1000, "_sum")
+        self.add(family, labels, histogram.count, "_count")
+
+    def render(self) -> str:
+        """Return the exposition text of the families with samples."""
+        output = []
+        for family, lines in self._lines.items():
+            if not lines:
+                continue
+            kind, description = _FAMILIES[family]
+            output.append(f"# HELP {family} {description}")
+            output.append(f"# TYPE {family} {kind}")
+            output.extend(lines)
+        return "\n".join(output) + "\n" if output else ""
+
+
+def _add_coordinator(
+    samples: _Samples, entry_id: str, coordinator: AldesDataUpdateCoordinator
+) -> None:
+    """Add the samples of one config entry."""
+    entry: Labels = (("entry", entry_id),)
+    api = coordinator.api
+
+    for key, metrics in api.metrics.endpoints.items():
+        method, endpoint = key.split(" ", 1)
+        labels = (*entry, ("method", method), ("endpoint", endpoint))
+        samples.add_histogram(
+            "aldes_api_request_duration_seconds", labels, metrics.latency
+        )
+        samples.add("aldes_api_requests_total", labels, metrics.requests)
+        samples.add("aldes_api_retries_total", labels, metrics.retries)
+        samples.add("aldes_api_bytes_received_total", labels, metrics.bytes_in)
+        samples.add("aldes_api_bytes_sent_total", labels, metrics.bytes_out)
+        for error_class, count in metrics.errors.items():
+            samples.add(
+                "aldes_api_errors_total",
+                (*labels, ("error_class", error_class)),
+                count,
+            )
+
+    for modem, lane in api.lanes.items():
+        labels = (*entry, ("modem", modem))
+        samples.add("aldes_command_queue_depth", labels, len(lane.pending))
+        samples.add(
+            "aldes_commands_total", (*labels, ("outcome", "success")), lane.succeeded
+        )
+        samples.add(
+            "aldes_commands_total", (*labels, ("outcome", "failure")), lane.failed
+        )
+        samples.add(
+            "aldes_verification_retries_total", labels, lane.verification_retries
+        )
+
+    cache = api.cache
+    lookups = cache.hits + cache.misses
+    samples.add("aldes_cache_hits_total", entry, cache.hits)
+    samples.add("aldes_cache_misses_total", entry, cache.misses)
+    samples.add(
+        "aldes_cache_hit_ratio", entry, cache.hits / lookups if lookups else 0.0
+    )
+
+    samples.add_histogram(
+        "aldes_coordinator_update_duration_seconds",
+        entry,
+        coordinator.update_duration,
+    )
+
+
+def render_metrics(coordinators: Mapping[str, AldesDataUpdateCoordinator]) -> str:
+    """Return the metrics of the config entries in Prometheus text format."""
+    samples = _Samples()
+    for entry_id, coordinator in coordinators.items():
+        if getattr(coordinator, "api", None) is None:
+            continue
+        _add_coordinator(samples, entry_id, coordinator)
+    return samples.render()
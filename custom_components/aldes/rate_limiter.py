@@ -0,0 +1,176 @@
+"""Adaptive token-bucket rate limiter for the Aldes API."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from .const import (
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_DEFAULT_BACKOFF,
+    RATE_LIMIT_INCREASE_STEP,
+    RATE_LIMIT_INITIAL_RATE,
+    RATE_LIMIT_MAX_DELAY,
+    RATE_LIMIT_MAX_RATE,
+    RATE_LIMIT_MIN_RATE,
+    RATE_LIMIT_SLOW_LATENCY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Weight of the newest sample in the latency moving average
+_LATENCY_EWMA_WEIGHT = 0.2
+# Multiplicative factors applied to the rate
+_SLOW_DECREASE_FACTOR = 0.9
+_ERROR_DECREASE_FACTOR = 0.5
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the delay in seconds requested by a Retry-After header."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate adapts to the health of the API.
+
+    Up to ``burst`` requests can go out back to back while tokens are
+    available. Successful fast responses slowly raise the rate (additive
+    increase); slow responses lower it a little and 429/5xx responses halve it
+    (multiplicative decrease). A Retry-After delay, capped at
+    RATE_LIMIT_MAX_DELAY, blocks every request until it has elapsed.
+
+    Each caller reserves its slot at once and waits for it on its own, so a
+    long wait does not hold back callers that give up earlier.
+    """
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_INITIAL_RATE,
+        burst: float = RATE_LIMIT_BURST,
+        min_rate: float = RATE_LIMIT_MIN_RATE,
+        max_rate: float = RATE_LIMIT_MAX_RATE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the limiter with a full bucket."""
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._rate = min(max(rate, min_rate), max_rate)
+        self._burst = burst
+        self._tokens = burst
+        self._clock = clock
+        self._last_refill = clock()
+        self._blocked_until = 0.0
+        self._latency_ewma: float | None = None
+
+    @property
+    def rate(self) -> float:
+        """Return the current refill rate in requests per second."""
+        return self._rate
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = self._clock()
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+            self._last_refill = now
+
+    def _wait_time(self) -> float:
+        """Return the seconds until the next token may be used."""
+        self._refill()
+        wait = max(0.0, self._blocked_until - self._clock())
+        if self._tokens < 1:
+            wait = max(wait, (1 - self._tokens) / self._rate)
+        return wait
+
+    async def acquire(self, max_wait: float | None = None) -> None:
+        """
+        Consume a token, waiting until the request may be sent.
+
+        Raises TimeoutError, without consuming a token, if the wait would
+        exceed max_wait seconds. A Retry-After received while the caller is
+        waiting holds it back too.
+        """
+        wait = self._wait_time()
+        if max_wait is not None and wait > max_wait:
+            msg = f"Rate limiter would hold the request for {wait:.1f}s"
+            raise TimeoutError(msg)
+        deadline = None if max_wait is None else self._clock() + max_wait
+        # Tokens go negative so that the next callers wait after this one
+        self._tokens -= 1
+        try:
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = max(0.0, self._blocked_until - self._clock())
+                if deadline is not None and self._clock() + wait > deadline:
+                    msg = f"Rate limiter would hold the request for {wait:.1f}s"
+                    raise TimeoutError(msg)
+        except (asyncio.CancelledError, TimeoutError):
+            # Give the reserved slot back to the callers behind this one
+            self._tokens = min(self._burst, self._tokens + 1)
+            raise
+
+    def record_success(self, latency: float) -> None:
+        """Adjust the rate from the latency of a successful request."""
+        if self._latency_ewma is None:
+            self._latency_ewma = latency
+        else:
+            self._latency_ewma += _LATENCY_EWMA_WEIGHT * (latency - self._latency_ewma)
+
+        self._refill()
+        if self._latency_ewma > RATE_LIMIT_SLOW_LATENCY:
+            self._rate = max(self._min_rate, self._rate * _SLOW_DECREASE_FACTOR)
+        else:
+            self._rate = min(self._max_rate, self._rate + RATE_LIMIT_INCREASE_STEP)
+
+    def record_throttled(self, retry_after: float | None = None) -> None:
+        """Back off after a 429 or 5xx response."""
+        self._refill()
+        self._rate = max(self._min_rate, self._rate * _ERROR_DECREASE_FACTOR)
+        self._tokens = 0
+        delay = (
+            RATE_LIMIT_DEFAULT_BACKOFF
+            if retry_after is None
+            else min(retry_after, RATE_LIMIT_MAX_DELAY)
+        )
+        self._blocked_until = max(self._blocked_until, self._clock() + delay)
+        _LOGGER.warning(
+            "Aldes API is throttling: rate lowered to %.2f req/s, pausing %.1fs",
+            self._rate,
+            delay,
+        )
+
+    def get_diagnostic_info(self) -> dict[str, Any]:
+        """Return the limiter state for diagnostics."""
+        return {
+            "rate": round(self._rate, 3),
+            "tokens": round(self.tokens, 2),
+            "burst": self._burst,
+            "blocked_for": round(max(0.0, self._blocked_until - self._clock()), 1),
+            "latency_ewma_ms": (
+                round(self._latency_ewma * 1000, 1)
+                if self._latency_ewma is not None
+                else None
+            ),
+        }
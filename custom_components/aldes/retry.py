@@ -0,0 +1,108 @@
+"""Retry budget shared by the retry layers of a command."""
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from .const import RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX, RETRY_MIN_ATTEMPT_TIME
+
+_T = TypeVar("_T")
+
+
+class RetryBudgetExhaustedError(TimeoutError):
+    """No attempt or no time is left in a retry budget."""
+
+
+class RetryBudget:
+    """
+    Attempts and wall-clock time allowed for one command or request.
+
+    Every request sent for a command, retries, re-authentication replays and
+    re-sends of commands the device did not apply included, draws one attempt
+    from the same budget. Nothing is sent once the attempts are used or the
+    deadline has passed.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        max_time: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a budget starting now."""
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self.deadline = clock() + max_time
+        self.attempts = 0
+
+    @property
+    def remaining_attempts(self) -> int:
+        """Return the number of requests that may still be sent."""
+        return max(0, self.max_attempts - self.attempts)
+
+    def remaining_time(self) -> float:
+        """Return the seconds left before the deadline."""
+        return max(0.0, self.deadline - self._clock())
+
+    @property
+    def exhausted(self) -> bool:
+        """Return True if no request may be sent anymore."""
+        return not self.remaining_attempts or not self.remaining_time()
+
+    def consume(self) -> None:
+        """Draw one attempt, raising RetryBudgetExhaustedError if none is left."""
+        if self.exhausted:
+            msg = (
+                f"Retry budget exhausted after {self.attempts} attempt(s)"
+                f" ({self.remaining_time():.0f}s left)"
+            )
+            raise RetryBudgetExhaustedError(msg)
+        self.attempts += 1
+
+    def backoff_delay(self, retry: int) -> float:
+        """Return the wait before a retry: exponential, with full jitter."""
+        ceiling = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (retry - 1))
+        return random.uniform(0, ceiling)  # noqa: S311
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the budget state for diagnostics."""
+        return {
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "remaining_time": round(self.remaining_time(), 1),
+        }
+
+
+async def run_with_retries(
+    budget: RetryBudget,
+    attempt: Callable[[], Awaitable[_T]],
+    retry_on: tuple[type[BaseException], ...],
+    on_retry: Callable[[BaseException, float], None] | None = None,
+) -> _T:
+    """
+    Call attempt until it succeeds, drawing each call from a budget.
+
+    Errors of the retry_on types are retried after an exponential backoff,
+    as long as the budget has an attempt left. Near the deadline the wait is
+    shortened to half the time left, leaving the other half to the retry;
+    with less than RETRY_MIN_ATTEMPT_TIME for it, the last error is raised.
+    RetryBudgetExhaustedError raised by an attempt is never retried.
+    """
+    retry = 0
+    while True:
+        budget.consume()
+        try:
+            return await attempt()
+        except RetryBudgetExhaustedError:
+            raise
+        except retry_on as err:
+            retry += 1
+            half_left = budget.remaining_time() / 2
+            if budget.exhausted or half_left < RETRY_MIN_ATTEMPT_TIME:
+                raise
+            wait = min(budget.backoff_delay(retry), half_left)
+            if on_retry is not None:
+                on_retry(err, wait)
+            await asyncio.sleep(wait)
@@ -21,6 +21,9 @@ from custom_components.aldes.models import (
 )
 
 from .const import (
+    DATA_GROUP_DEVICE,
+    DATA_GROUP_INDICATOR,
+    DATA_GROUP_SETTINGS,
     DOMAIN,
     FRIENDLY_NAMES,
     MANUFACTURER,
@@ -94,6 +97,8 @@ async def async_setup_entry(
 class AldesAirModeEntity(AldesEntity, SelectEntity):
     """Representation of the current air mode select entity."""
 
+    _data_groups = frozenset({DATA_GROUP_INDICATOR, DATA_GROUP_DEVICE})
+
     def __init__(
         self,
         coordinator: AldesDataUpdateCoordinator,
@@ -167,12 +172,11 @@ class AldesAirModeEntity(AldesEntity, SelectEntity):
     @property
     def state(self) -> str:
         """Return the current state of the air mode."""
-        # Access the `current_air_mode` from the coordinator data
-        device = self._get_device()
-        if device is None or device.indicator is None:
+        # Access the air mode from the derived device state
+        state = self._get_device_state()
+        if state is None or state.air_mode is None:
             return "unavailable"
-        mode = device.indicator.current_air_mode
-        return self._attr_display_names.get(mode, mode)
+        return self._attr_display_names.get(state.air_mode, state.air_mode)
 
     @property
     def available(self) -> bool:
@@ -257,10 +261,14 @@ class AldesAirModeEntity(AldesEntity, SelectEntity):
                     current_mode,
                 )
 
-                # Retry the API call
-                await self.coordinator.api.change_mode(
-                    self.modem, expected_mode.value, CommandUid.AIR_MODE
-                )
+                # Retry the API call, within the retry budget of the first send
+                if not await self.coordinator.api.retry_unapplied_command(
+                    self.modem,
+                    lambda: self.coordinator.api.change_mode(
+                        self.modem, expected_mode.value, CommandUid.AIR_MODE
+                    ),
+                ):
+                    return
 
                 # Force another refresh after retry
                 await asyncio.sleep(2)
@@ -293,6 +301,8 @@ class AldesAirModeEntity(AldesEntity, SelectEntity):
 class AldesWaterModeEntity(AldesEntity, SelectEntity):
     """Representation of the current water mode sensor as a selectable option."""
 
+    _data_groups = frozenset({DATA_GROUP_INDICATOR, DATA_GROUP_DEVICE})
+
     def __init__(
         self,
         coordinator: AldesDataUpdateCoordinator,
@@ -445,6 +455,7 @@ class AldesWaterModeEntity(AldesEntity, SelectEntity):
 class AldesHouseholdCompositionEntity(AldesEntity, SelectEntity):
     """Representation of the current household composition sensor."""
 
+    _data_groups = frozenset({DATA_GROUP_SETTINGS, DATA_GROUP_DEVICE})
     _state = None
     _attr_entity_category = EntityCategory.CONFIG
 
@@ -561,6 +572,7 @@ class AldesHouseholdCompositionEntity(AldesEntity, SelectEntity):
 class AldesAntilegionellaCycleEntity(AldesEntity, SelectEntity):
     """Representation of the current antilegionella cycle sensor."""
 
+    _data_groups = frozenset({DATA_GROUP_SETTINGS, DATA_GROUP_DEVICE})
     _state = None
     _attr_entity_category = EntityCategory.CONFIG
 
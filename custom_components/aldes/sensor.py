@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import SensorEntity
@@ -17,9 +17,19 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.util import dt as dt_util
 
 from .const import (
+    API_STATE_CHECK_INTERVAL,
+    DATA_GROUP_DEVICE,
+    DATA_GROUP_INDICATOR,
+    DATA_GROUP_LAST_UPDATE,
+    DATA_GROUP_PERFORMANCE,
+    DATA_GROUP_PLANNINGS,
+    DATA_GROUP_SCHEDULE,
+    DATA_GROUP_SETTINGS,
+    DATA_GROUP_THERMOSTATS,
     DOMAIN,
     FRIENDLY_NAMES,
     MANUFACTURER,
@@ -27,8 +37,8 @@ from .const import (
     VERSION,
     WATER_LEVEL_THRESHOLDS,
 )
-from .entity import AldesEntity, DeviceContext, ThermostatApiEntity
-from .models import ApiHealthState, ThermostatApiEntity
+from .entity import AldesEntity, DeviceContext
+from .models import AlertLevel, ApiEvent, ApiHealthState, ThermostatApiEntity
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -243,6 +253,8 @@ class BaseAldesSensorEntity(AldesEntity, SensorEntity):
 class AldesThermostatSensorEntity(BaseAldesSensorEntity):
     """Define an Aldes thermostat sensor."""
 
+    _data_groups = frozenset({DATA_GROUP_THERMOSTATS})
+
     thermostat: ThermostatApiEntity
 
     def __init__(
@@ -291,14 +303,7 @@ class AldesThermostatSensorEntity(BaseAldesSensorEntity):
         if not device or not device.indicator:
             return
 
-        thermostat = next(
-            (
-                t
-                for t in device.indicator.thermostats
-                if t.id == self.thermostat.id
-            ),
-            None,
-        )
+        thermostat = device.indicator.get_thermostat(self.thermostat.id)
 
         self._update_state(thermostat.current_temperature if thermostat else None)
         super()._handle_coordinator_update()
@@ -307,6 +312,8 @@ class AldesThermostatSensorEntity(BaseAldesSensorEntity):
 class AldesWaterEntity(BaseAldesSensorEntity):
     """Define an Aldes Water Quantity sensor."""
 
+    _data_groups = frozenset({DATA_GROUP_INDICATOR, DATA_GROUP_DEVICE})
+
     def __init__(
         self,
         coordinator: AldesDataUpdateCoordinator,
@@ -356,6 +363,8 @@ class AldesWaterEntity(BaseAldesSensorEntity):
 class AldesMainRoomTemperatureEntity(BaseAldesSensorEntity):
     """Define an Aldes Main Room Temperature sensor."""
 
+    _data_groups = frozenset({DATA_GROUP_INDICATOR, DATA_GROUP_DEVICE})
+
     def __init__(
         self,
         coordinator: AldesDataUpdateCoordinator,
@@ -393,6 +402,7 @@ class AldesMainRoomTemperatureEntity(BaseAldesSensorEntity):
 class AldesPlanningEntity(BaseAldesSensorEntity):
     """Sensor entity for weekly planning data."""
 
+    _data_groups = frozenset({DATA_GROUP_PLANNINGS})
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
     def __init__(
@@ -494,6 +504,7 @@ def _parse_utc_to_local(timestamp_str: str | None) -> datetime | None:
 class AldesFilterDateSensorEntity(BaseAldesSensorEntity):
     """Define an Aldes filter last change date sensor."""
 
+    _data_groups = frozenset({DATA_GROUP_DEVICE})
     _attr_icon = "mdi:air-filter"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_device_class = SensorDeviceClass.TIMESTAMP
@@ -523,6 +534,7 @@ class AldesFilterDateSensorEntity(BaseAldesSensorEntity):
 class AldesLastUpdatedSensorEntity(BaseAldesSensorEntity):
     """Define an Aldes last updated date sensor."""
 
+    _data_groups = frozenset({DATA_GROUP_LAST_UPDATE})
     _attr_icon = "mdi:update"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_device_class = SensorDeviceClass.TIMESTAMP
@@ -548,6 +560,7 @@ class AldesLastUpdatedSensorEntity(BaseAldesSensorEntity):
 class BaseStatisticsSensor(BaseAldesSensorEntity):
     """Base class for statistics sensors."""
 
+    _data_groups: frozenset[str] = frozenset()
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _statistics_data: list[Any] | dict[str, Any] | None = None
     _fetch_task: Any | None = None
@@ -813,6 +826,7 @@ class AldesCoolingCostSensor(BaseStatisticsSensor):
 class AldesHolidaysStartSensor(BaseAldesSensorEntity):
     """Sensor for holidays start date."""
 
+    _data_groups = frozenset({DATA_GROUP_INDICATOR})
     _attr_device_class = SensorDeviceClass.TIMESTAMP
     _attr_icon = "mdi:calendar-start"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
@@ -848,6 +862,7 @@ class AldesHolidaysStartSensor(BaseAldesSensorEntity):
 class AldesHolidaysEndSensor(BaseAldesSensorEntity):
     """Sensor for holidays end date."""
 
+    _data_groups = frozenset({DATA_GROUP_INDICATOR})
     _attr_device_class = SensorDeviceClass.TIMESTAMP
     _attr_icon = "mdi:calendar-end"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
@@ -883,6 +898,7 @@ class AldesHolidaysEndSensor(BaseAldesSensorEntity):
 class AldesHorsGelSensor(BaseAldesSensorEntity):
     """Sensor for frost protection mode."""
 
+    _data_groups = frozenset({DATA_GROUP_INDICATOR})
     _attr_device_class = None
     _attr_icon = "mdi:snowflake-alert"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
@@ -905,9 +921,59 @@ class AldesHorsGelSensor(BaseAldesSensorEntity):
         return "Actif" if device.hors_gel else "Inactif"
 
 
-class AldesApiHealthSensor(AldesEntity, SensorEntity):
+class BaseApiEventSensor(AldesEntity, SensorEntity):
+    """
+    Diagnostic sensor written on API change events instead of polling.
+
+    The state is only written when what it depends on, given by
+    _state_key, differs from the last written one. Sensors showing
+    account-wide values set _account_wide to handle the events of every
+    modem.
+    """
+
+    _data_groups: frozenset[str] = frozenset()
+    _api_events: frozenset[ApiEvent] = frozenset()
+    _account_wide: bool = False
+    _written_state: Any = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the API change events."""
+        await super().async_added_to_hass()
+        self._written_state = self._state_key()
+        self.async_on_remove(
+            self.coordinator.api.async_add_listener(
+                self._handle_api_event, self._api_events
+            )
+        )
+
+    @callback
+    def _handle_api_event(self, _event: ApiEvent, modem: str | None) -> None:
+        """Handle a change of the API state, of this modem or account-wide."""
+        if modem is None or self._account_wide or modem == self.modem:
+            self._async_write_state_if_changed()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle a full coordinator update, e.g. an availability change."""
+        self._async_write_state_if_changed()
+
+    @callback
+    def _async_write_state_if_changed(self) -> None:
+        """Write the state if it changed since the last write."""
+        state = self._state_key()
+        if state != self._written_state:
+            self._written_state = state
+            self.async_write_ha_state()
+
+    def _state_key(self) -> Any:
+        """Return the values the written state depends on."""
+        return (self.available, self.native_value)
+
+
+class AldesApiHealthSensor(BaseApiEventSensor):
     """Sensor for API connectivity status."""
 
+    _api_events = frozenset({ApiEvent.HEALTH})
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_device_class = SensorDeviceClass.ENUM
     _attr_options = [state.value for state in ApiHealthState]
@@ -921,32 +987,47 @@ class AldesApiHealthSensor(AldesEntity, SensorEntity):
         """Initialize."""
         super().__init__(coordinator, context)
         self._attr_unique_id = f"{self.device_identifier}_api_health"
-        self._attr_native_value = ApiHealthState.ONLINE.value
 
-    @property
-    def available(self) -> bool:
-        return True
+    async def async_added_to_hass(self) -> None:
+        """Also check the API state shown as attributes once per interval."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self._handle_api_state_check,
+                timedelta(seconds=API_STATE_CHECK_INTERVAL),
+            )
+        )
 
-    @property
-    def should_poll(self) -> bool:
-        return True
+    @callback
+    def _handle_api_state_check(self, _now: datetime) -> None:
+        """Write the state if the API state changed since the last write."""
+        self._async_write_state_if_changed()
 
-    async def async_update(self) -> None:
+    def _state_key(self) -> Any:
+        """Return the health state and the attributes, built once per check."""
         try:
-            self._attr_native_value = self.coordinator.api.health_state.value
-        except Exception:
-            pass
+            info = self.coordinator.api.get_health_info()
+        except Exception as e:
+            _LOGGER.warning("Error getting API health info: %s", e)
+            info = {}
+        self._attr_extra_state_attributes = {
+            **info,
+            "integration_version": VERSION,
+        }
+        return (self.available, self.native_value, self._attr_extra_state_attributes)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        self.async_schedule_update_ha_state(True)
+    @property
+    def available(self) -> bool:
+        return True
 
     def _friendly_name_internal(self) -> str | None:
         return "État API Aldes"
 
     @property
     def native_value(self) -> str:
-        return self._attr_native_value
+        api = self.coordinator.api
+        return api.health_state.value if api else ApiHealthState.ONLINE.value
 
     @property
     def icon(self) -> str:
@@ -956,22 +1037,13 @@ class AldesApiHealthSensor(AldesEntity, SensorEntity):
             "degraded": "mdi:cloud-alert",
             "offline": "mdi:cloud-off-outline",
         }
-        return state_map.get(self._attr_native_value, "mdi:cloud-question")
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        try:
-            info = self.coordinator.api.get_diagnostic_info()
-            info["integration_version"] = VERSION
-            return info
-        except Exception as e:
-            _LOGGER.warning("Error getting API diagnostic info: %s", e)
-            return {"integration_version": VERSION}
+        return state_map.get(self.native_value, "mdi:cloud-question")
 
 
 class AldesDeviceInfoSensor(BaseAldesSensorEntity):
     """Sensor for device information and diagnostics."""
 
+    _data_groups = frozenset({DATA_GROUP_DEVICE, DATA_GROUP_THERMOSTATS})
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_icon = "mdi:information"
     _attr_entity_registry_visible_default = False
@@ -1016,6 +1088,7 @@ class AldesDeviceInfoSensor(BaseAldesSensorEntity):
 class AldesThermostatsCountSensor(BaseAldesSensorEntity):
     """Sensor for thermostat count."""
 
+    _data_groups = frozenset({DATA_GROUP_THERMOSTATS})
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_icon = "mdi:thermometer"
     _attr_entity_registry_visible_default = False
@@ -1029,16 +1102,6 @@ class AldesThermostatsCountSensor(BaseAldesSensorEntity):
         """Return the friendly name."""
         return "Nombre de Thermostats"
 
-    @property
-    def should_poll(self) -> bool:
-        """Return True to force polling."""
-        return True
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
-
     @property
     def native_value(self) -> int:
         """Return the state."""
@@ -1071,6 +1134,9 @@ class AldesThermostatsCountSensor(BaseAldesSensorEntity):
 class AldesTemperatureLimitsSensor(BaseAldesSensorEntity):
     """Sensor for temperature limits (heating and cooling)."""
 
+    _data_groups = frozenset(
+        {DATA_GROUP_INDICATOR, DATA_GROUP_PLANNINGS, DATA_GROUP_SCHEDULE}
+    )
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_icon = "mdi:thermometer-lines"
     _attr_entity_registry_visible_default = False
@@ -1104,12 +1170,17 @@ class AldesTemperatureLimitsSensor(BaseAldesSensorEntity):
             return {"integration_version": VERSION}
 
         indicator = device.indicator
+        state = self._get_device_state()
         return {
             "heat_min": indicator.fmist,
             "heat_max": indicator.fmast,
             "cool_min": indicator.cmist,
             "cool_max": indicator.cmast,
             "main_temperature": indicator.main_temperature,
+            "effective_mode": state.effective_air_mode if state else None,
+            "active_program": state.program_char if state else None,
+            "current_min": state.min_temp if state else None,
+            "current_max": state.max_temp if state else None,
             "integration_version": VERSION,
         }
 
@@ -1117,6 +1188,7 @@ class AldesTemperatureLimitsSensor(BaseAldesSensorEntity):
 class AldesSettingsSensor(BaseAldesSensorEntity):
     """Sensor for device settings."""
 
+    _data_groups = frozenset({DATA_GROUP_SETTINGS})
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_icon = "mdi:cog"
     _attr_entity_registry_visible_default = False
@@ -1157,9 +1229,12 @@ class AldesSettingsSensor(BaseAldesSensorEntity):
 
 
 
-class AldesPendingCommandsSensorEntity(AldesEntity, SensorEntity):
+class AldesPendingCommandsSensorEntity(BaseApiEventSensor):
     """Diagnostic sensor for Aldes pending commands queue size."""
 
+    _api_events = frozenset({ApiEvent.QUEUE, ApiEvent.HISTORY})
+    # History, failed commands and lanes cover the whole account
+    _account_wide = True
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_icon = "mdi:tray-full"
     _attr_state_class = SensorStateClass.MEASUREMENT
@@ -1177,22 +1252,26 @@ class AldesPendingCommandsSensorEntity(AldesEntity, SensorEntity):
         self._attr_native_value = 0
         _LOGGER.debug("Initialized Pending Commands sensor: %s", self._attr_unique_id)
 
-    @property
-    def should_poll(self) -> bool:
-        """Return True to force polling."""
-        return True
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
+    def _state_key(self) -> Any:
+        """Return the availability, queue and history shown by the sensor."""
+        attributes = self.extra_state_attributes
+        return (
+            self.available,
+            self.native_value,
+            attributes["current"],
+            tuple(attributes["pending"]),
+            tuple(attributes["history"]),
+            tuple(attributes["failed"]),
+            attributes["coalesced"],
+            tuple(attributes["lanes"].items()),
+        )
 
     @property
     def native_value(self) -> int:
-        """Return the number of pending commands in the queue."""
+        """Return the number of pending commands in this device's queue."""
         if not self.coordinator or not self.coordinator.api:
             return 0
-        return len(self.coordinator.api._pending_commands)
+        return len(self.coordinator.api.get_pending_commands(self.modem))
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -1202,32 +1281,42 @@ class AldesPendingCommandsSensorEntity(AldesEntity, SensorEntity):
         
         worker_active = False
         
-        # We access the lists directly. Since they are modified in the worker,
-        # we copy them to avoid 'RuntimeError: dictionary changed size during iteration' 
-        # or similar list modification errors.
+        # History lines are rendered from the command log records
         history = []
         pending = []
         failed = []
         current = None
+        coalesced = 0
+        lanes = {}
+        request_rate = None
+        stats = {}
 
         if api:
-            if api._worker_task:
-                worker_active = not api._worker_task.done()
-            history = list(api._command_history)
+            worker_active = api.worker_active
+            history = api.command_history
             pending = [
-                f"{item[4].strftime('%H:%M:%S')} - {item[3]}"
-                for item in api._pending_commands
+                f"{item.queue_time.strftime('%H:%M:%S')} - {item.description}"
+                for item in api.get_pending_commands(self.modem)
             ]
-            failed = list(api._failed_commands)
-            current = api._current_command
+            failed = api.failed_commands
+            current = api.get_current_command(self.modem)
+            coalesced = api.coalesced_commands
+            # Queue depth of every modem lane on the account
+            lanes = {modem: len(lane.pending) for modem, lane in api.lanes.items()}
+            request_rate = round(api.request_rate, 3)
+            # Mean queue wait, mean execution time and failure ratio
+            stats = api.command_log.summary()
 
         return {
             "worker_active": worker_active,
-            "delay_between_requests": 5,  # From const.REQUEST_DELAY
+            "request_rate": request_rate,
             "history": history,
             "pending": pending,
             "failed": failed,
             "current": current,
+            "coalesced": coalesced,
+            "lanes": lanes,
+            "stats": stats,
             "integration_version": VERSION,
         }
 
@@ -1235,6 +1324,8 @@ class AldesPendingCommandsSensorEntity(AldesEntity, SensorEntity):
 class AldesSystemAlertSensor(AldesEntity, SensorEntity):
     """Diagnostic sensor for Aldes system performance alerts."""
 
+    # Written when the alert level or the bottleneck changes
+    _data_groups = frozenset({DATA_GROUP_PERFORMANCE})
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_icon = "mdi:alert-outline"
     _attr_entity_registry_visible_default = True
@@ -1250,25 +1341,24 @@ class AldesSystemAlertSensor(AldesEntity, SensorEntity):
         self._attr_unique_id = f"{self.device_identifier}_system_alert"
         self._attr_native_value = "OK"
 
-    @property
-    def should_poll(self) -> bool:
-        """Return True to force polling."""
-        return True
-
     @property
     def native_value(self) -> str:
-        """Evaluate system performance."""
+        """Return the alert level of the last performance evaluation."""
         device = self._get_device()
         if not device or not device.indicator:
             return "Unknown"
 
-        return "OK"
+        report = self.coordinator.get_performance_report(self._device_key)
+        return report.level.value if report else AlertLevel.OK.value
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra state attributes."""
+        """Return the bottleneck and the evaluated measurements."""
+        report = self.coordinator.get_performance_report(self._device_key)
+        degraded = report is not None and report.level is not AlertLevel.OK
         return {
             "last_check": dt_util.now().isoformat(),
-            "performance_mode": "Normal",
+            "performance_mode": "Degraded" if degraded else "Normal",
+            **(report.as_dict() if report else {}),
             "integration_version": VERSION,
         }
@@ -0,0 +1,45 @@
+"""Single-flight de-duplication of concurrent identical operations."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers using the same key.
+
+    The first caller for a key starts the operation as a task; callers that
+    arrive while it is running await the same task and receive the same result
+    or exception. The key is released as soon as the task finishes, so later
+    callers start a fresh operation. Cancelling one waiter does not cancel the
+    shared operation for the others.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no operation in flight."""
+        self._in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+        self.shared_count = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return True if an operation for key is in flight."""
+        return key in self._in_flight
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run func for key, or join the call already in flight for it."""
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._release(key, task))
+        else:
+            self.shared_count += 1
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        """Forget a finished task, unless a newer one already took its key."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieve the exception so an unawaited failure is not reported twice
+        if not task.cancelled():
+            task.exception()
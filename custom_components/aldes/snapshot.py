@@ -0,0 +1,86 @@
+"""Persisted copy of the last /products payload, for fast startups."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+from .api import parse_products
+from .const import SNAPSHOT_SAVE_DELAY
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.storage import Store
+
+    from .models import DataApiEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+# Device fields changing on every poll, not worth a save on their own
+_TIMESTAMP_FIELDS = frozenset({"last_updated_date"})
+
+
+def _worth_saving(changes: dict[str, frozenset[str] | None]) -> bool:
+    """Return True if a poll changed devices beyond their timestamps."""
+    return any(paths is None or paths - _TIMESTAMP_FIELDS for paths in changes.values())
+
+
+class DeviceSnapshot:
+    """
+    Last good /products payload, saved to a store and restored at startup.
+
+    Saves are delayed by SNAPSHOT_SAVE_DELAY. A poll is only saved when it
+    changed more than the timestamp fields, which move on every poll, so the
+    store is not rewritten at each poll interval.
+    """
+
+    def __init__(self, store: Store[dict[str, Any]] | None) -> None:
+        """Initialize with nothing saved yet."""
+        self._store = store
+        self._saved_payload: list[Any] | None = None
+
+    async def async_load(self) -> dict[str, DataApiEntity] | None:
+        """Return the devices of the stored payload, None if there are none."""
+        if self._store is None:
+            return None
+        try:
+            snapshot = await self._store.async_load()
+        except Exception:
+            _LOGGER.exception("Could not load the Aldes snapshot")
+            return None
+        if not isinstance(snapshot, dict):
+            return None
+
+        devices = parse_products(snapshot.get("products"))
+        if not devices:
+            return None
+        self._saved_payload = snapshot["products"]
+        _LOGGER.info(
+            "Restored %d Aldes device(s) from snapshot saved at %s",
+            len(devices),
+            snapshot.get("saved_at"),
+        )
+        return devices
+
+    def save(
+        self,
+        payload: list[Any] | None,
+        changes: dict[str, frozenset[str] | None],
+    ) -> None:
+        """
+        Schedule persisting the payload of a poll.
+
+        changes are the changed field paths per modem since the previous
+        poll, see update_products. Nothing is saved if the payload is the
+        one already saved or restored, or if only timestamps changed since.
+        """
+        if self._store is None or payload is None or payload is self._saved_payload:
+            return
+        if self._saved_payload is not None and not _worth_saving(changes):
+            return
+        self._saved_payload = payload
+        self._store.async_delay_save(
+            lambda: {"products": payload, "saved_at": dt_util.utcnow().isoformat()},
+            SNAPSHOT_SAVE_DELAY,
+        )
@@ -10,7 +10,7 @@ from homeassistant.const import EntityCategory
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import Entity
 
-from .const import DOMAIN, FRIENDLY_NAMES, MANUFACTURER
+from .const import DATA_GROUP_PLANNINGS, DOMAIN, FRIENDLY_NAMES, MANUFACTURER
 from .entity import AldesEntity, DeviceContext
 
 if TYPE_CHECKING:
@@ -83,6 +83,7 @@ async def async_setup_entry(
 class AldesPlanningEntity(AldesEntity, Entity):
     """Representation of the weekly planning as a diagnostic entity."""
 
+    _data_groups = frozenset({DATA_GROUP_PLANNINGS})
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_entity_registry_visible_default = False
 
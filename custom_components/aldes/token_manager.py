@@ -0,0 +1,191 @@
+"""Access token lifecycle for the Aldes API."""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable, Coroutine
+from contextlib import suppress
+from typing import Any
+
+from .const import TOKEN_REFRESH_MARGIN, TOKEN_REFRESH_RETRY_DELAY
+from .single_flight import SingleFlight
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def decode_jwt_claims(token: str) -> dict[str, Any]:
+    """Return the claims of a JWT without verifying its signature."""
+    payload = token.split(".")[1]
+    payload += "=" * (-len(payload) % 4)
+    return json.loads(base64.urlsafe_b64decode(payload).decode("utf-8"))
+
+
+def get_token_expiry(token: str) -> float | None:
+    """Return the 'exp' timestamp of a JWT, or None if it cannot be read."""
+    if not token:
+        return None
+    try:
+        exp = decode_jwt_claims(token).get("exp")
+    except (IndexError, ValueError, UnicodeDecodeError):
+        return None
+    return float(exp) if exp else None
+
+
+class TokenManager:
+    """
+    Keep the access token fresh before it expires.
+
+    The expiry is read from the JWT 'exp' claim. A background task renews the
+    token TOKEN_REFRESH_MARGIN seconds before that, using the refresh_token
+    grant, and only falls back to a full password grant when the refresh
+    fails or no refresh token is known.
+    """
+
+    def __init__(
+        self,
+        refresh_grant: Callable[[str], Awaitable[dict[str, Any]]],
+        password_grant: Callable[[], Awaitable[None]],
+        access_token: str = "",
+        margin: float = TOKEN_REFRESH_MARGIN,
+    ) -> None:
+        """
+        Initialize the token manager.
+
+        Args:
+            refresh_grant: Exchanges a refresh token for a token response
+            password_grant: Re-authenticates with the user credentials and
+                stores the result through update()
+            access_token: Access token known at startup, if any
+            margin: Seconds before expiry at which the token is renewed
+
+        """
+        self._refresh_grant = refresh_grant
+        self._password_grant = password_grant
+        self._access_token = access_token
+        self._refresh_token: str | None = None
+        self._expires_at = get_token_expiry(access_token)
+        self._margin = margin
+        self._task: asyncio.Task[None] | None = None
+        # Set whenever the tokens change, to reschedule the refresh loop
+        self._tokens_changed = asyncio.Event()
+        self._single_flight = SingleFlight()
+        self.refresh_count = 0
+        self.password_fallback_count = 0
+
+    @property
+    def access_token(self) -> str:
+        """Return the current access token."""
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, value: str) -> None:
+        """Replace the access token, keeping the refresh token."""
+        self._access_token = value
+        self._expires_at = get_token_expiry(value)
+        self._tokens_changed.set()
+
+    @property
+    def has_refresh_token(self) -> bool:
+        """Return True if a refresh token is available."""
+        return bool(self._refresh_token)
+
+    @property
+    def expires_at(self) -> float | None:
+        """Return the expiry timestamp of the access token."""
+        return self._expires_at
+
+    def update(self, token_response: dict[str, Any]) -> None:
+        """Store the tokens from an OAuth2 token response."""
+        self.access_token = token_response["access_token"]
+        # Refresh tokens may be rotated, keep the previous one otherwise
+        if token_response.get("refresh_token"):
+            self._refresh_token = token_response["refresh_token"]
+
+    def start(
+        self,
+        create_task: Callable[
+            [Coroutine[Any, Any, None]], asyncio.Task[None]
+        ] = asyncio.create_task,
+    ) -> None:
+        """
+        Start the background refresh task if it is not running.
+
+        The task runs until stop() is called, so it is only started for a
+        set up config entry, with create_task tying it to the entry.
+        """
+        if self._task is None or self._task.done():
+            self._task = create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop the background refresh task."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
+
+    async def renew(self) -> None:
+        """Renew the access token, joining a renewal already in progress."""
+        await self._single_flight.run("renew", self._renew)
+
+    async def _renew(self) -> None:
+        """Renew the access token, preferring the refresh_token grant."""
+        if self._refresh_token:
+            try:
+                self.update(await self._refresh_grant(self._refresh_token))
+            except Exception as err:
+                _LOGGER.warning(
+                    "Token refresh failed (%s), falling back to password grant",
+                    err,
+                )
+            else:
+                self.refresh_count += 1
+                _LOGGER.info("Access token refreshed with refresh token")
+                return
+
+        self.password_fallback_count += 1
+        await self._password_grant()
+
+    def _seconds_until_refresh(self) -> float | None:
+        """Return how long to wait before renewing, None if unknown."""
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - self._margin - time.time())
+
+    async def _refresh_loop(self) -> None:
+        """Renew the token shortly before it expires, for as long as we run."""
+        while True:
+            self._tokens_changed.clear()
+            delay = self._seconds_until_refresh()
+            if delay is None:
+                # Nothing to schedule until a token with an expiry is stored
+                await self._tokens_changed.wait()
+                continue
+
+            try:
+                await asyncio.wait_for(self._tokens_changed.wait(), timeout=delay)
+            except TimeoutError:
+                pass
+            else:
+                # Tokens were replaced meanwhile: compute a new deadline
+                continue
+
+            _LOGGER.debug("Access token expires soon, renewing in background")
+            try:
+                await self.renew()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                _LOGGER.exception("Background token renewal failed")
+                await asyncio.sleep(TOKEN_REFRESH_RETRY_DELAY)
+
+    def get_diagnostic_info(self) -> dict[str, Any]:
+        """Return token lifecycle information for diagnostics."""
+        return {
+            "refresh_token_present": self.has_refresh_token,
+            "refresh_scheduled_in": self._seconds_until_refresh(),
+            "refresh_count": self.refresh_count,
+            "password_fallback_count": self.password_fallback_count,
+        }
@@ -24,9 +24,12 @@ sys.modules["homeassistant.components.binary_sensor"] = MagicMock()
 sys.modules["homeassistant.components.button"] = MagicMock()
 sys.modules["homeassistant.components.text"] = MagicMock()
 sys.modules["homeassistant.components.http"] = MagicMock()
+sys.modules["homeassistant.components.diagnostics"] = MagicMock()
 sys.modules["homeassistant.helpers.device_registry"] = MagicMock()
 sys.modules["homeassistant.helpers.entity"] = MagicMock()
 sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.event"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
 sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
 sys.modules["homeassistant.util"] = MagicMock()
 sys.modules["homeassistant.util.dt"] = MagicMock()
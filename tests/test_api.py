@@ -1,5 +1,8 @@
 """Tests for Aldes API client."""
 
+import asyncio
+import json
+
 import pytest
 
 
@@ -39,3 +42,489 @@ async def test_temperature_worker():
 @pytest.mark.skip(reason="Requires Home Assistant context")
 async def test_auth_interceptor_reauth():
     """Test automatic re-authentication on 401."""
+
+
+async def test_command_worker_picks_up_commands_without_polling():
+    """Test queued commands run as soon as they are queued."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    from custom_components.aldes import api as api_module
+
+    api = api_module.AldesApi("user", "pass", MagicMock())
+    command = AsyncMock()
+
+    await api._queue_command(
+        command, args=("MODEM",), description="test", key=("MODEM", "test")
+    )
+    await asyncio.wait_for(api._lanes["MODEM"].idle.wait(), timeout=1)
+
+    command.assert_awaited_once_with("MODEM")
+    assert api.command_history[-1].endswith(" - test")
+    (record,) = api.command_log
+    assert record.modem == "MODEM"
+    assert record.outcome == "success"
+    assert record.duration >= 0
+    assert not api.get_pending_commands()
+    await api.stop_worker()
+    assert not api.worker_active
+
+
+async def test_stop_worker_drains_queue():
+    """Test stop_worker waits for queued commands before stopping."""
+    from unittest.mock import MagicMock
+
+    from custom_components.aldes import api as api_module
+
+    api = api_module.AldesApi("user", "pass", MagicMock())
+    executed: list[int] = []
+
+    async def command(value: int) -> None:
+        await asyncio.sleep(0.01)
+        executed.append(value)
+
+    for value in range(3):
+        await api._queue_command(
+            command, args=(value,), description=str(value), key=("MODEM", value)
+        )
+    await asyncio.wait_for(api.stop_worker(), timeout=1)
+
+    assert executed == [0, 1, 2]
+    assert not api.worker_active
+
+
+async def test_queue_coalesces_commands_with_same_key(monkeypatch):
+    """Test a burst of changes to the same setting only sends the newest one."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    from custom_components.aldes import api as api_module
+
+    monkeypatch.setattr(api_module, "TEMPERATURE_BATCH_WINDOW", 0)
+    api = api_module.AldesApi("user", "pass", MagicMock())
+    release = asyncio.Event()
+    api._change_temperatures_direct = AsyncMock()
+
+    async def blocking_command() -> None:
+        await release.wait()
+
+    await api._queue_command(
+        blocking_command, description="blocking", key=("MODEM", "blocking")
+    )
+    await asyncio.sleep(0)
+    for temperature in (19, 20, 21):
+        await api.set_target_temperature("MODEM", 1, "Salon", temperature)
+    await api.set_target_temperature("MODEM", 1, "Salon", 22)
+
+    assert len(api.get_pending_commands("MODEM")) == 1
+    assert api._coalesced_commands == 3
+    assert api.get_diagnostic_info()["coalesced_commands"] == 3
+
+    release.set()
+    await asyncio.wait_for(api.stop_worker(), timeout=1)
+
+    api._change_temperatures_direct.assert_awaited_once_with(
+        "MODEM", [(1, "Salon", 22)]
+    )
+
+
+async def test_temperature_changes_are_batched_per_modem(monkeypatch):
+    """Test changes for several rooms of one modem are sent in one PATCH."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    from custom_components.aldes import api as api_module
+
+    monkeypatch.setattr(api_module, "TEMPERATURE_BATCH_WINDOW", 0.05)
+    api = api_module.AldesApi("user", "pass", MagicMock())
+    api._api_request = AsyncMock(return_value={})
+
+    rooms = [(thermostat_id, f"Room {thermostat_id}", 20) for thermostat_id in range(6)]
+    await api.set_target_temperatures("MODEM", rooms)
+    await api.set_target_temperature("OTHER", 9, "Bureau", 19)
+    await asyncio.wait_for(api.stop_worker(), timeout=1)
+
+    assert api._api_request.await_count == 2
+    requests = {
+        call.args[1].split("/")[-2]: call for call in api._api_request.await_args_list
+    }
+    assert requests["MODEM"].args[0] == "patch"
+    assert [item["ThermostatId"] for item in requests["MODEM"].kwargs["json"]] == list(
+        range(6)
+    )
+    assert [item["ThermostatId"] for item in requests["OTHER"].kwargs["json"]] == [9]
+
+
+async def test_modem_lanes_run_in_parallel():
+    """Test a slow command on one modem does not block another modem."""
+    from unittest.mock import MagicMock
+
+    from custom_components.aldes import api as api_module
+
+    api = api_module.AldesApi("user", "pass", MagicMock())
+    release = asyncio.Event()
+    done: list[str] = []
+
+    async def slow_command() -> None:
+        await release.wait()
+        done.append("slow")
+
+    async def fast_command() -> None:
+        done.append("fast")
+
+    await api._queue_command(slow_command, description="slow", key=("A", "slow"))
+    await api._queue_command(fast_command, description="fast", key=("B", "fast"))
+    await asyncio.wait_for(api._lanes["B"].idle.wait(), timeout=1)
+
+    assert done == ["fast"]
+    assert api.get_diagnostic_info()["lanes"]["A"]["current"] == "slow"
+
+    release.set()
+    await asyncio.wait_for(api.stop_worker(), timeout=1)
+    assert done == ["fast", "slow"]
+
+
+async def test_concurrency_cap_serializes_lanes():
+    """Test the account-wide cap limits commands executing at once."""
+    from unittest.mock import MagicMock
+
+    from custom_components.aldes import api as api_module
+
+    api = api_module.AldesApi("user", "pass", MagicMock(), max_concurrent_commands=1)
+    running = 0
+    peak = 0
+
+    async def command() -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    for modem in ("A", "B", "C"):
+        await api._queue_command(command, description=modem, key=(modem, "cmd"))
+    await asyncio.wait_for(api.stop_worker(), timeout=1)
+
+    assert peak == 1
+
+
+class _FakeResponse:
+    """Minimal aiohttp response usable as an async context manager."""
+
+    def __init__(self, status: int, payload: object) -> None:
+        self.status = status
+        self.headers: dict[str, str] = {}
+        self._payload = payload
+
+    async def __aenter__(self) -> "_FakeResponse":
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+    def raise_for_status(self) -> None:
+        return None
+
+    async def json(self) -> object:
+        return self._payload
+
+    async def read(self) -> bytes:
+        return json.dumps(self._payload).encode()
+
+    def close(self) -> None:
+        return None
+
+
+class _FakeSession:
+    """Session counting requests, rejecting the 'stale' token with a 401."""
+
+    def __init__(self) -> None:
+        self.get_urls: list[str] = []
+        self.post_count = 0
+
+    async def get(self, url: str, **kwargs: object) -> _FakeResponse:
+        self.get_urls.append(url)
+        await asyncio.sleep(0.01)
+        status = 401 if kwargs["headers"]["Authorization"].endswith("stale") else 200
+        return _FakeResponse(status, [])
+
+    def post(self, url: str, **kwargs: object) -> _FakeResponse:
+        self.post_count += 1
+        return _FakeResponse(200, {"access_token": "fresh", "refresh_token": "r"})
+
+
+def _make_api_with_fake_session(token: str) -> tuple:
+    """Build an API client on a fake session with an unthrottled limiter."""
+    from custom_components.aldes import api as api_module
+    from custom_components.aldes.rate_limiter import AdaptiveRateLimiter
+
+    session = _FakeSession()
+    api = api_module.AldesApi("user", "pass", session, token=token)
+    api._rate_limiter = AdaptiveRateLimiter(rate=1000, burst=100, max_rate=1000)
+    return api, session
+
+
+async def test_concurrent_identical_gets_share_one_request():
+    """Test 50 concurrent fetches of the products list issue a single GET."""
+    api, session = _make_api_with_fake_session("valid")
+
+    await asyncio.gather(*(api.fetch_data() for _ in range(50)))
+
+    assert len(session.get_urls) == 1
+    assert api.get_diagnostic_info()["shared_requests"] == 49
+    await api.async_close()
+
+
+async def test_health_info_leaves_out_per_poll_figures():
+    """Test polls alone do not change the health sensor attributes."""
+    api, _ = _make_api_with_fake_session("valid")
+
+    await api.fetch_data()
+    info = api.get_health_info()
+    await api.fetch_data()
+
+    assert api.get_health_info() == info
+    assert "metrics" not in info
+    assert "rate_limiter" not in info
+    assert "cache_details" not in info["cache"]
+    await api.async_close()
+
+
+async def test_requests_are_measured_per_endpoint():
+    """Test requests, 401 replays and response sizes are recorded."""
+    api, _ = _make_api_with_fake_session("stale")
+
+    await api.fetch_data()
+
+    metrics = api.get_diagnostic_info()["metrics"]
+    products = metrics["GET /aldesoc/v5/users/me/products"]
+    assert products["requests"] == 1
+    assert products["retries"] == 1
+    assert products["errors"] == 0
+    assert products["bytes_in"] == len(b"[]")
+    assert products["p50_ms"] is not None
+    await api.async_close()
+
+
+async def test_concurrent_401s_authenticate_once():
+    """Test 50 requests rejected together trigger a single authentication."""
+    api, session = _make_api_with_fake_session("stale")
+
+    await asyncio.gather(
+        *(
+            api.get_statistics("MODEM", "2025-01-01", f"{day}", "day")
+            for day in range(50)
+        )
+    )
+
+    assert session.post_count == 1
+    assert api.token == "fresh"
+    # One rejected attempt and one retry for each distinct URL
+    assert len(session.get_urls) == 100
+    await api.async_close()
+
+
+async def test_authentication_does_not_start_token_refresh():
+    """Test a login alone leaves no background task, e.g. in the config flow."""
+    api, session = _make_api_with_fake_session("")
+    tasks = asyncio.all_tasks()
+
+    await api.authenticate()
+
+    assert session.post_count == 1
+    assert asyncio.all_tasks() == tasks
+    await api.async_close()
+
+
+async def test_changes_are_published_to_listeners():
+    """Test health, queue and history changes reach their listeners."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    from custom_components.aldes import api as api_module
+    from custom_components.aldes.models import ApiEvent, ApiHealthState
+
+    api = api_module.AldesApi("user", "pass", MagicMock())
+    events: list[tuple[ApiEvent, str | None]] = []
+    health: list[tuple[ApiEvent, str | None]] = []
+    remove = api.async_add_listener(lambda *event: events.append(event))
+    api.async_add_listener(
+        lambda *event: health.append(event), frozenset({ApiEvent.HEALTH})
+    )
+
+    api.health_state = ApiHealthState.OFFLINE
+    api.health_state = ApiHealthState.OFFLINE
+    assert health == [(ApiEvent.HEALTH, None)]
+
+    await api._queue_command(
+        AsyncMock(), args=("MODEM",), description="test", key=("MODEM", "test")
+    )
+    await asyncio.wait_for(api._lanes["MODEM"].idle.wait(), timeout=1)
+    # Queued, started, added to the history and finished
+    assert events[1:] == [
+        (ApiEvent.QUEUE, "MODEM"),
+        (ApiEvent.QUEUE, "MODEM"),
+        (ApiEvent.HISTORY, "MODEM"),
+        (ApiEvent.QUEUE, "MODEM"),
+    ]
+    assert len(health) == 1
+
+    remove()
+    api.health_state = ApiHealthState.ONLINE
+    assert len(events) == 5
+    await api.stop_worker()
+
+
+async def test_command_records_count_requests():
+    """Test the record of a command gets its attempts and HTTP status."""
+    api, _ = _make_api_with_fake_session("valid")
+
+    async def command(modem: str) -> None:
+        await api._api_request("get", f"{api._API_URL_PRODUCTS}/{modem}/x")
+
+    await api._queue_command(
+        command, args=("MODEM",), description="test", key=("MODEM", "command", "x")
+    )
+    await asyncio.wait_for(api._lanes["MODEM"].idle.wait(), timeout=1)
+
+    (record,) = api.command_log
+    assert (record.command_type, record.target) == ("x", None)
+    assert (record.attempts, record.http_status) == (1, 200)
+    assert api.command_log.failure_ratio == 0
+    await api.async_close()
+
+
+class _FailingSession:
+    """Session counting requests and failing each of them."""
+
+    def __init__(self, error: type[Exception]) -> None:
+        self.error = error
+        self.requests = 0
+        self.timeouts: list[object] = []
+
+    async def _fail(self, url: str, **kwargs: object) -> _FakeResponse:
+        self.requests += 1
+        self.timeouts.append(kwargs["timeout"])
+        msg = f"connection reset on {url}"
+        raise self.error(msg)
+
+    get = post = _fail
+
+
+def _make_api_with_failing_session(monkeypatch) -> tuple:
+    """Build an API client whose requests fail at once, without retry waits."""
+    from custom_components.aldes import api as api_module
+    from custom_components.aldes.rate_limiter import AdaptiveRateLimiter
+    from custom_components.aldes.retry import RetryBudget
+
+    class ConnectionFailureError(Exception):
+        """Stand-in for the mocked aiohttp ClientError."""
+
+    monkeypatch.setattr(api_module, "ClientError", ConnectionFailureError)
+    monkeypatch.setattr(RetryBudget, "backoff_delay", lambda *_: 0.0)
+    session = _FailingSession(ConnectionFailureError)
+    # Fake token, the session never checks it
+    api = api_module.AldesApi("user", "pass", session, token="valid")  # noqa: S106
+    api._rate_limiter = AdaptiveRateLimiter(rate=1000, burst=100, max_rate=1000)
+    return api, session
+
+
+async def test_poll_retries_within_request_budget(monkeypatch):
+    """Test a failing poll sends at most REQUEST_MAX_ATTEMPTS requests."""
+    from custom_components.aldes.const import REQUEST_MAX_ATTEMPTS
+
+    api, session = _make_api_with_failing_session(monkeypatch)
+
+    assert await api.fetch_data() == {}
+
+    assert session.requests == REQUEST_MAX_ATTEMPTS
+    await api.async_close()
+
+
+async def test_command_retries_share_one_budget(monkeypatch):
+    """Test retries and verification re-sends of a command share its budget."""
+    from custom_components.aldes.const import COMMAND_MAX_ATTEMPTS
+
+    api, session = _make_api_with_failing_session(monkeypatch)
+
+    await api.change_people("MODEM", "2")
+    await asyncio.wait_for(api._lanes["MODEM"].idle.wait(), timeout=1)
+
+    assert session.requests == COMMAND_MAX_ATTEMPTS
+    (record,) = api.command_log
+    assert (record.attempts, record.outcome) == (COMMAND_MAX_ATTEMPTS, "failure")
+
+    # The device did not apply it: a re-send finds the budget spent
+    assert not await api.retry_unapplied_command(
+        "MODEM", lambda: api.change_people("MODEM", "2")
+    )
+    assert session.requests == COMMAND_MAX_ATTEMPTS
+    assert api.lanes["MODEM"].verification_retries == 0
+
+    # A new user action gets a new budget
+    await api.change_people("MODEM", "3")
+    await asyncio.wait_for(api._lanes["MODEM"].idle.wait(), timeout=1)
+    assert session.requests == 2 * COMMAND_MAX_ATTEMPTS
+    await api.async_close()
+
+
+async def test_fetch_data_ends_by_its_deadline(monkeypatch):
+    """Test request timeouts and retries of a poll fit its deadline."""
+    from custom_components.aldes import api as api_module
+
+    api, session = _make_api_with_failing_session(monkeypatch)
+    monkeypatch.setattr(api_module, "ClientTimeout", lambda total: total)
+    monkeypatch.setattr(api_module.RetryBudget, "backoff_delay", lambda *_: 30.0)
+
+    start = asyncio.get_running_loop().time()
+    assert await api.fetch_data(deadline=2.5) == {}
+    elapsed = asyncio.get_running_loop().time() - start
+
+    # Waits are cut to the time left, and no retry fits below 1 s
+    assert session.requests == 2
+    assert all(timeout <= 2.5 for timeout in session.timeouts)
+    assert session.timeouts[1] < 1.5
+    assert elapsed < 2.5
+    await api.async_close()
+
+
+async def test_fetch_data_fails_fast_when_throttled(monkeypatch):
+    """Test no request is sent if the limiter holds it past the deadline."""
+    api, session = _make_api_with_failing_session(monkeypatch)
+    api._rate_limiter.record_throttled(retry_after=30)
+
+    assert await asyncio.wait_for(api.fetch_data(deadline=2), timeout=0.5) == {}
+
+    assert session.requests == 0
+
+    # Past the deadline, no request is built with a zero (disabled) timeout
+    from custom_components.aldes import api as api_module
+    from custom_components.aldes.retry import RetryBudget, RetryBudgetExhaustedError
+
+    token = api_module._CURRENT_BUDGET.set(RetryBudget(5, 0))
+    try:
+        with pytest.raises(RetryBudgetExhaustedError):
+            api._request_timeout()
+    finally:
+        api_module._CURRENT_BUDGET.reset(token)
+    await api.async_close()
+
+
+async def test_request_body_is_encoded_once(monkeypatch):
+    """Test JSON bodies are sent encoded and measured from the bytes sent."""
+    api, session = _make_api_with_fake_session("valid")
+    bodies: list[bytes] = []
+
+    async def post(url: str, **kwargs: object) -> _FakeResponse:
+        bodies.append(kwargs["data"])
+        assert "json" not in kwargs
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+        return _FakeResponse(200, {"result": "ok"})
+
+    monkeypatch.setattr(session, "post", post)
+    await api._api_request("post", f"{api._API_URL_PRODUCTS}/M/commands", json={"a": 1})
+
+    (body,) = bodies
+    assert json.loads(body) == {"a": 1}
+    metrics = api.get_diagnostic_info()["metrics"]
+    assert metrics["POST /aldesoc/v5/users/me/products/{modem}/commands"][
+        "bytes_out"
+    ] == len(body)
+    await api.async_close()
@@ -0,0 +1,78 @@
+"""Tests for the Aldes emergency response cache."""
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Start at an arbitrary time."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def test_statistics_period_is_normalized():
+    """Test statistics URLs for different periods share one key."""
+    from custom_components.aldes.cache import normalize_cache_key
+
+    first = normalize_cache_key(
+        "GET", "https://x/products/M/statistics/20250101000000Z/20250201100000Z/day"
+    )
+    second = normalize_cache_key(
+        "get", "https://x/products/M/statistics/20250101000000Z/20250201110000Z/day"
+    )
+    assert first == second
+    assert first.endswith("/statistics/*/*/day")
+
+
+def test_lru_eviction_respects_memory_cap():
+    """Test the least recently used entries are evicted above the cap."""
+    from custom_components.aldes.cache import ResponseCache, estimate_size
+
+    entry_size = estimate_size(["x" * 100])
+    cache = ResponseCache(max_bytes=entry_size * 2)
+    cache.put("a", ["x" * 100])
+    cache.put("b", ["x" * 100])
+    assert cache.get("a") is not None  # "a" becomes the most recent
+    cache.put("c", ["x" * 100])
+
+    assert "b" not in cache
+    assert "a" in cache
+    assert "c" in cache
+    assert cache.size == entry_size * 2
+    assert cache.get_diagnostic_info()["evictions"] == 1
+
+
+def test_entries_expire_after_max_age():
+    """Test entries older than max_age are not served."""
+    from custom_components.aldes.cache import ResponseCache
+
+    clock = FakeClock()
+    cache = ResponseCache(max_age=60, clock=clock)
+    cache.put("a", {"value": 1})
+    clock.now += 30
+    assert cache.get("a") == ({"value": 1}, 30)
+    clock.now += 31
+    assert cache.get("a") is None
+
+    info = cache.get_diagnostic_info()
+    assert (info["hits"], info["misses"], info["evictions"]) == (1, 1, 1)
+    assert info["size_bytes"] == 0
+
+
+def test_put_uses_the_given_size():
+    """Test the raw response length is used instead of encoding the value."""
+    from unittest.mock import patch
+
+    from custom_components.aldes import cache as cache_module
+
+    cache = cache_module.ResponseCache(max_bytes=100)
+    with patch.object(cache_module, "estimate_size") as estimate:
+        cache.put("a", {"value": 1}, size=40)
+    estimate.assert_not_called()
+    assert cache.size == 40
+
+    cache.put("b", {"value": 2}, size=101)
+    assert "b" not in cache
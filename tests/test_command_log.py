@@ -0,0 +1,66 @@
+"""Tests for the Aldes command log."""
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.aldes.command_log import (
+    OUTCOME_FAILURE,
+    OUTCOME_SUCCESS,
+    CommandLog,
+    CommandRecord,
+)
+
+START = datetime(2025, 1, 15, 8, 0, tzinfo=UTC)
+
+
+def _record(wait: float, duration: float, outcome: str) -> CommandRecord:
+    """Return a finished record with the given timings in seconds."""
+    record = CommandRecord(
+        command_type="temperature",
+        modem="MODEM",
+        target="1000",
+        description=f"{outcome} after {duration}s",
+        queued_at=START,
+        started_at=START + timedelta(seconds=wait),
+    )
+    record.finish(record.started_at + timedelta(seconds=duration), outcome)
+    return record
+
+
+def test_log_keeps_the_newest_records():
+    """Test the oldest record is dropped once the capacity is reached."""
+    log = CommandLog(capacity=3)
+    for duration in range(5):
+        log.add(_record(1, duration, OUTCOME_SUCCESS))
+
+    assert len(log) == 3
+    assert [record.duration for record in log] == [2, 3, 4]
+
+
+def test_statistics_follow_the_buffered_records():
+    """Test the statistics only cover the records still in the log."""
+    log = CommandLog(capacity=2)
+    assert log.failure_ratio is None
+
+    log.add(_record(10, 4, OUTCOME_FAILURE))
+    log.add(_record(2, 2, OUTCOME_SUCCESS))
+    assert log.mean_queue_wait == 6
+    assert log.mean_duration == 3
+    assert log.failure_ratio == 0.5
+
+    # The failure is dropped
+    log.add(_record(4, 6, OUTCOME_SUCCESS))
+    assert log.mean_queue_wait == 3
+    assert log.mean_duration == 4
+    assert log.failure_ratio == 0
+
+
+def test_records_render_history_lines():
+    """Test the history lines keep the "queued→ended - description" format."""
+    log = CommandLog()
+    log.add(_record(1, 4, OUTCOME_SUCCESS))
+    log.add(_record(1, 2, OUTCOME_FAILURE))
+
+    (failed,) = log.records(OUTCOME_FAILURE)
+    assert failed.history_entry() == "08:00:00→08:00:03 - failure after 2s"
+    assert [record.outcome for record in log.records(limit=1)] == [OUTCOME_FAILURE]
+    assert failed.as_dict()["queue_wait_s"] == 1
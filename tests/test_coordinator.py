@@ -0,0 +1,59 @@
+"""Tests for the Aldes coordinator change tracking."""
+
+import copy
+
+from custom_components.aldes.api import parse_products, update_products
+
+_PAYLOAD = {
+    "modem": "MODEM",
+    "reference": "TONE_AIR",
+    "isConnected": True,
+    "lastUpdatedDate": "2025-01-15T08:42:17.000Z",
+    "indicator": {
+        "current_air_mode": "B",
+        "tmp_principal": 20.5,
+        "settings": {"people": "2"},
+        "thermostats": [
+            {
+                "ThermostatId": 1,
+                "Name": "Salon",
+                "Number": 1,
+                "TemperatureSet": 20,
+                "CurrentTemperature": 19.5,
+            }
+        ],
+    },
+    "week_planning": [{"command": "00C"}],
+}
+
+
+def test_changed_groups_of_changed_fields_only():
+    """Test only the data groups of the changed fields are reported."""
+    from custom_components.aldes.coordinator import changed_groups
+
+    old = parse_products([_PAYLOAD])
+    payload = copy.deepcopy(_PAYLOAD)
+    payload["lastUpdatedDate"] = "2025-01-15T08:43:17.000Z"
+    payload["indicator"]["thermostats"][0]["CurrentTemperature"] = 19.8
+
+    _, changes = update_products([payload], old)
+    assert changed_groups(changes) == {
+        "MODEM": frozenset({"thermostats", "last_update"})
+    }
+    _, changes = update_products([copy.deepcopy(_PAYLOAD)], old)
+    assert changed_groups(changes) == {}
+
+
+def test_changed_groups_new_and_removed_devices():
+    """Test added and removed devices report every data group."""
+    from custom_components.aldes.coordinator import changed_groups
+
+    other = copy.deepcopy(_PAYLOAD)
+    other["modem"] = "OTHER"
+
+    _, changes = update_products([_PAYLOAD, other], parse_products([_PAYLOAD]))
+    added = changed_groups(changes)
+    assert set(added) == {"OTHER"}
+    assert {"indicator", "plannings", "settings"} <= added["OTHER"]
+    _, changes = update_products([other], parse_products([_PAYLOAD]))
+    assert set(changed_groups(changes)) == {"MODEM", "OTHER"}
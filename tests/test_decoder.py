@@ -0,0 +1,91 @@
+"""Tests for the Aldes payload decoder."""
+
+import copy
+import json
+
+import pytest
+
+from custom_components.aldes.api import parse_products, update_products
+from custom_components.aldes.decoder import PayloadError, loads
+from custom_components.aldes.models import DataApiEntity
+
+_PAYLOAD = {
+    "modem": "MODEM",
+    "isConnected": True,
+    "indicator": {
+        "current_air_mode": "B",
+        "tmp_principal": 20.5,
+        "thermostats": [
+            {
+                "ThermostatId": 1,
+                "Name": "Salon",
+                "Number": 1,
+                "TemperatureSet": 20,
+                "CurrentTemperature": 19.5,
+            }
+        ],
+    },
+}
+
+
+def test_loads_bytes_and_text():
+    """Test JSON is decoded from bytes and text alike."""
+    assert loads(b'[{"modem": "MODEM", "fmist": 16.5}]') == [
+        {"modem": "MODEM", "fmist": 16.5}
+    ]
+    assert loads('{"a": null}') == {"a": None}
+    # orjson raises a subclass of the standard library error
+    with pytest.raises(json.JSONDecodeError):
+        loads(b"<html>")
+
+
+def test_loads_without_orjson(monkeypatch: pytest.MonkeyPatch):
+    """Test the standard library decoder is used when orjson is missing."""
+    from custom_components.aldes import decoder
+
+    monkeypatch.setattr(decoder, "orjson", None)
+
+    assert decoder.loads(b'{"a": [1, 2.5]}') == {"a": [1, 2.5]}
+
+
+def test_unexpected_types_are_rejected():
+    """Test fields with an unexpected type raise a PayloadError."""
+    payload = copy.deepcopy(_PAYLOAD)
+    payload["isConnected"] = "yes"
+    with pytest.raises(PayloadError, match="isConnected"):
+        DataApiEntity(payload)
+
+    payload = copy.deepcopy(_PAYLOAD)
+    del payload["indicator"]["thermostats"][0]["ThermostatId"]
+    with pytest.raises(PayloadError, match="ThermostatId"):
+        DataApiEntity(payload)
+
+    payload = copy.deepcopy(_PAYLOAD)
+    payload["indicator"]["thermostats"] = {"1": {}}
+    with pytest.raises(PayloadError, match="thermostats"):
+        DataApiEntity(payload)
+
+
+def test_integer_flags_are_read_as_booleans():
+    """Test 0/1 integer flags are accepted for boolean fields."""
+    payload = copy.deepcopy(_PAYLOAD)
+    payload["isConnected"] = 1
+    payload["hasFilter"] = 0
+
+    device = DataApiEntity(payload)
+
+    assert device.is_connected is True
+    assert device.has_filter is False
+
+
+def test_invalid_device_keeps_previous_model():
+    """Test an invalid device payload does not replace the last good one."""
+    previous = parse_products([_PAYLOAD])
+    payload = copy.deepcopy(_PAYLOAD)
+    payload["indicator"]["tmp_principal"] = "warm"
+
+    devices, changes = update_products([payload], previous)
+
+    assert devices["MODEM"] is previous["MODEM"]
+    assert changes == {}
+    assert parse_products([payload]) == {}
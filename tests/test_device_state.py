@@ -0,0 +1,69 @@
+"""Tests for the derived Aldes device state."""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from custom_components.aldes.models import DataApiEntity
+
+# Plannings are read in the local time of Home Assistant
+TZ = ZoneInfo("Europe/Paris")
+
+# 2025-01-13 is a Monday
+MONDAY_MORNING = datetime(2025, 1, 13, 7, 15, tzinfo=TZ)
+MONDAY_NOON = datetime(2025, 1, 13, 12, tzinfo=TZ)
+
+
+def _device(air_mode: str) -> DataApiEntity:
+    """Return a device in an air mode, with an Eco slot on Monday at 7h."""
+    return DataApiEntity(
+        {
+            "modem": "MODEM",
+            "indicator": {
+                "current_air_mode": air_mode,
+                "cmist": 16,
+                "cmast": 24,
+                "fmist": 22,
+                "fmast": 30,
+            },
+            "week_planning": [{"command": "70C"}, {"command": "C0B"}],
+            "week_planning3": [{"command": "70B"}],
+        }
+    )
+
+
+def test_program_mode_follows_planning():
+    """Test program modes use the mode of the active planning slot."""
+    from custom_components.aldes.const import AirMode
+    from custom_components.aldes.device_state import compute_device_state
+
+    state = compute_device_state(_device(AirMode.HEAT_PROG_A), MONDAY_MORNING)
+
+    assert state.air_mode == AirMode.HEAT_PROG_A
+    assert state.program_char == "C"
+    assert state.effective_air_mode == AirMode.HEAT_ECO
+    # Eco limits are shown 2°C below the heating ones
+    assert (state.min_temp, state.max_temp) == (14, 22)
+    assert state.temperature_offset == 2
+
+    state = compute_device_state(_device(AirMode.HEAT_PROG_A), MONDAY_NOON)
+
+    assert state.effective_air_mode == AirMode.HEAT_COMFORT
+    assert (state.min_temp, state.max_temp) == (16, 24)
+    assert state.temperature_offset == 0
+
+
+def test_cooling_and_uncovered_slots():
+    """Test cooling limits and the fallback to the raw air mode."""
+    from custom_components.aldes.const import AirMode
+    from custom_components.aldes.device_state import compute_device_state
+
+    state = compute_device_state(_device(AirMode.COOL_PROG_A), MONDAY_MORNING)
+
+    assert state.effective_air_mode == AirMode.COOL_COMFORT
+    assert (state.min_temp, state.max_temp) == (22, 30)
+
+    # No slot at noon: the program mode itself is kept
+    state = compute_device_state(_device(AirMode.HEAT_PROG_B), MONDAY_NOON)
+
+    assert state.program_char is None
+    assert state.effective_air_mode == AirMode.HEAT_PROG_B
@@ -0,0 +1,99 @@
+"""Tests for the Aldes diagnostics."""
+
+
+def test_modems_are_anonymized_everywhere():
+    """Test modems are replaced in keys, strings and nested lists."""
+    from custom_components.aldes.diagnostics import anonymize_modems
+
+    data = {
+        "lanes": {"MODEM1": {"pending": 0}, "MODEM2": {"pending": 1}},
+        "cache": [{"key": "get:https://host/products/MODEM2"}],
+        "payload": [{"modem": "MODEM1", "count": 3}],
+    }
+
+    assert anonymize_modems(data, ["MODEM1", "MODEM2"]) == {
+        "lanes": {"device_1": {"pending": 0}, "device_2": {"pending": 1}},
+        "cache": [{"key": "get:https://host/products/device_2"}],
+        "payload": [{"modem": "device_1", "count": 3}],
+    }
+
+
+def test_histogram_buckets_skip_empty_ranges():
+    """Test buckets start at the first sample and stop once all are counted."""
+    from custom_components.aldes.diagnostics import histogram_buckets
+    from custom_components.aldes.metrics import LatencyHistogram
+
+    histogram = LatencyHistogram()
+    assert histogram_buckets(histogram) == {}
+
+    for duration_ms in (3, 3, 100):
+        histogram.record(duration_ms)
+
+    buckets = histogram_buckets(histogram)
+    assert next(iter(buckets.items())) == ("<=4ms", 2)
+    assert list(buckets.items())[-1] == ("<=128ms", 3)
+
+
+def _redact(data, to_redact) -> object:
+    """Redact values by key, as Home Assistant's async_redact_data does."""
+    if isinstance(data, list):
+        return [_redact(item, to_redact) for item in data]
+    if not isinstance(data, dict):
+        return data
+    return {
+        key: "**REDACTED**" if key in to_redact else _redact(value, to_redact)
+        for key, value in data.items()
+    }
+
+
+async def test_config_entry_diagnostics(monkeypatch):
+    """Test the snapshot keeps token lifecycle data and masks secrets."""
+    import base64
+    import json
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    from custom_components.aldes import diagnostics
+    from custom_components.aldes.api import AldesApi
+    from custom_components.aldes.const import DOMAIN
+    from custom_components.aldes.metrics import LatencyHistogram
+
+    monkeypatch.setattr(diagnostics, "async_redact_data", _redact)
+    claims = base64.urlsafe_b64encode(
+        json.dumps({"exp": 2_000_000_000, "iat": 1_999_996_400}).encode()
+    ).decode()
+    token = f"header.{claims}.signature"
+    api = AldesApi("user@example.com", "secret", MagicMock(), token=token)
+    api.last_products_payload = [{"modem": "MODEM1", "serial_number": "SN123"}]
+    coordinator = SimpleNamespace(
+        api=api,
+        data={"MODEM1": object()},
+        update_duration=LatencyHistogram(),
+        get_diagnostic_info=lambda: {"update_duration": {}},
+    )
+    entry = SimpleNamespace(
+        entry_id="entry1",
+        data={"username": "user@example.com", "password": "secret"},
+        options={"token": token},
+    )
+    hass = SimpleNamespace(data={DOMAIN: {"entry1": coordinator}})
+
+    snapshot = await diagnostics.async_get_config_entry_diagnostics(hass, entry)
+
+    assert snapshot["api"]["token_info"]["token_expires"].startswith("2033-05-18")
+    assert snapshot["api"]["token_info"]["token_present"] is True
+    assert snapshot["api"]["command_log"]["records"] == []
+    assert "records" not in api.get_diagnostic_info()["command_log"]
+    # The health sensor attributes keep their "token" key
+    assert api.get_diagnostic_info()["token"]["token_present"] is True
+    assert snapshot["entry"]["data"] == {
+        "username": "**REDACTED**",
+        "password": "**REDACTED**",
+    }
+    assert snapshot["entry"]["options"]["token"] == "**REDACTED**"
+    assert snapshot["last_products_payload"] == [
+        {"modem": "device_1", "serial_number": "**REDACTED**"}
+    ]
+    assert "MODEM1" not in json.dumps(snapshot)
+    assert token not in json.dumps(snapshot)
+    await api.async_close()
@@ -0,0 +1,56 @@
+"""Tests for the Aldes API request metrics."""
+
+from custom_components.aldes.metrics import (
+    ApiMetrics,
+    LatencyHistogram,
+    endpoint_name,
+)
+
+
+def test_histogram_percentiles():
+    """Test percentiles are estimated within one bucket."""
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) is None
+
+    for duration_ms in range(1, 101):
+        histogram.record(duration_ms)
+
+    assert 50 <= histogram.percentile(50) <= 50 * 1.2
+    assert 95 <= histogram.percentile(95) <= 100
+    assert histogram.percentile(100) == 100
+    assert histogram.as_dict()["mean_ms"] == 50.5
+
+
+def test_histogram_memory_is_fixed():
+    """Test samples do not grow the histogram."""
+    histogram = LatencyHistogram()
+    buckets = len(histogram._counts)
+
+    for duration_ms in (0.1, 5, 250_000):
+        histogram.record(duration_ms)
+
+    assert len(histogram._counts) == buckets
+    assert histogram.percentile(99) == 250_000
+
+
+def test_metrics_per_endpoint():
+    """Test requests of one endpoint share metrics whatever the device."""
+    base = "https://host/aldesoc/v5/users/me/products"
+    metrics = ApiMetrics()
+
+    metrics.endpoint("get", f"{base}/MODEM1/statistics/2025-01/2025-02/month").record(
+        120, bytes_in=300
+    )
+    metrics.endpoint("get", f"{base}/MODEM2/statistics/2024-01/2024-02/day").record(
+        80, error="TimeoutError"
+    )
+    metrics.record_retry("post", f"{base}/MODEM1/commands")
+
+    info = metrics.get_diagnostic_info()
+    statistics = info["GET /aldesoc/v5/users/me/products/{modem}/statistics/{period}"]
+    assert statistics["requests"] == 2
+    assert statistics["errors_by_class"] == {"TimeoutError": 1}
+    assert statistics["error_rate"] == 0.5
+    assert statistics["bytes_in"] == 300
+    assert info["POST /aldesoc/v5/users/me/products/{modem}/commands"]["retries"] == 1
+    assert endpoint_name(base) == "/aldesoc/v5/users/me/products"
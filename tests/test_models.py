@@ -0,0 +1,114 @@
+"""Tests for the Aldes data models."""
+
+import pytest
+
+from custom_components.aldes.models import DataApiEntity
+
+
+def test_thermostat_index_matches_list():
+    """Test thermostats can be looked up by id."""
+    device = DataApiEntity(
+        {
+            "modem": "MODEM",
+            "indicator": {
+                "thermostats": [
+                    {
+                        "ThermostatId": thermostat_id,
+                        "Name": f"Room {thermostat_id}",
+                        "Number": thermostat_id,
+                        "TemperatureSet": 20,
+                        "CurrentTemperature": 19.5,
+                    }
+                    for thermostat_id in (11, 12, 13)
+                ]
+            },
+        }
+    )
+
+    assert device.indicator.get_thermostat(12) is device.indicator.thermostats[1]
+    assert device.indicator.get_thermostat(99) is None
+    assert DataApiEntity(None).indicator.get_thermostat(11) is None
+
+
+def test_models_are_immutable_values():
+    """Test models refuse changes and compare by value."""
+    from custom_components.aldes.models import IndicatorApiEntity
+
+    payload = {"modem": "MODEM", "indicator": {"current_air_mode": "B"}}
+    device = DataApiEntity(payload)
+
+    with pytest.raises(AttributeError):
+        device.modem = "OTHER"
+    with pytest.raises(AttributeError):
+        device.indicator.current_air_mode = "A"
+    assert not hasattr(device, "__dict__")
+    assert device == DataApiEntity(payload)
+    assert device.indicator != IndicatorApiEntity({"current_air_mode": "A"})
+
+
+def test_planning_defaults_are_not_shared():
+    """Test devices without plannings each get their own empty list."""
+    first = DataApiEntity({"modem": "MODEM1"})
+    second = DataApiEntity({"modem": "MODEM2"})
+
+    assert first.week_planning == []
+    assert first.week_planning is not second.week_planning
+
+
+def test_update_shares_unchanged_models():
+    """Test an update reports the changed fields and reuses the rest."""
+    import copy
+
+    payload = {
+        "modem": "MODEM",
+        "indicator": {
+            "current_air_mode": "B",
+            "settings": {"people": "2"},
+            "thermostats": [
+                {
+                    "ThermostatId": thermostat_id,
+                    "Name": f"Room {thermostat_id}",
+                    "Number": thermostat_id,
+                    "TemperatureSet": 20,
+                    "CurrentTemperature": 19.5,
+                }
+                for thermostat_id in (11, 12)
+            ],
+        },
+        "week_planning": [{"command": "00C"}],
+    }
+    device = DataApiEntity(payload)
+    timeline = device.get_planning_timeline("week_planning")
+
+    same, changed = device.updated(copy.deepcopy(payload))
+    assert same is device
+    assert changed == frozenset()
+
+    payload = copy.deepcopy(payload)
+    payload["indicator"]["thermostats"][1]["TemperatureSet"] = 21
+    payload["isConnected"] = True
+    updated, changed = device.updated(payload)
+
+    assert changed == {"indicator.thermostats.12.temperature_set", "is_connected"}
+    assert updated == DataApiEntity(payload)
+    indicator = updated.indicator
+    assert indicator.thermostats[0] is device.indicator.thermostats[0]
+    assert indicator.get_thermostat(12).temperature_set == 21
+    assert indicator.settings is device.indicator.settings
+    assert updated.week_planning is device.week_planning
+    assert updated.get_planning_timeline("week_planning") is timeline
+
+    payload["indicator"]["thermostats"].pop()
+    _, changed = updated.updated(payload)
+    assert changed == {"indicator.thermostats"}
+
+
+def test_models_must_implement_parse():
+    """Test a model without _parse fails when built, not on the first poll."""
+    from custom_components.aldes.models import _FrozenModel
+
+    class Incomplete(_FrozenModel):
+        __slots__ = ("value",)
+
+    with pytest.raises(TypeError):
+        Incomplete({"value": 1})
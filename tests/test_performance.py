@@ -0,0 +1,129 @@
+"""Tests for the performance evaluation behind the system alert."""
+
+from datetime import UTC, datetime
+
+from custom_components.aldes.metrics import ApiMetrics
+
+URL = "https://host/aldesoc/v5/users/me/products"
+
+
+class _Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _device(**measurements: float | None) -> dict[str, float | None]:
+    """Return healthy device measurements, with some overridden."""
+    return {
+        "queue_age_s": 0.0,
+        "update_duration_ms": 800.0,
+        "data_staleness_s": 120.0,
+        "loop_blocking_ms": 5.0,
+        **measurements,
+    }
+
+
+def test_levels_have_hysteresis():
+    """Test a level is entered at its threshold and left 20% below it."""
+    from custom_components.aldes.models import AlertLevel
+    from custom_components.aldes.performance import check_level
+
+    thresholds = (100, 200)
+    assert check_level(99, thresholds) is AlertLevel.OK
+    assert check_level(100, thresholds) is AlertLevel.WARNING
+    assert check_level(85, thresholds, AlertLevel.WARNING) is AlertLevel.WARNING
+    assert check_level(79, thresholds, AlertLevel.WARNING) is AlertLevel.OK
+    assert check_level(170, thresholds, AlertLevel.CRITICAL) is AlertLevel.CRITICAL
+    assert check_level(150, thresholds, AlertLevel.CRITICAL) is AlertLevel.WARNING
+    assert check_level(None, thresholds, AlertLevel.CRITICAL) is AlertLevel.OK
+
+
+def test_report_names_the_bottleneck():
+    """Test the worst measurement is reported as the bottleneck."""
+    from custom_components.aldes.models import AlertLevel
+    from custom_components.aldes.performance import PerformanceEvaluator
+
+    evaluator = PerformanceEvaluator(ApiMetrics())
+    reports = evaluator.evaluate(
+        {
+            "A": _device(),
+            "B": _device(queue_age_s=90, data_staleness_s=2000),
+            "C": _device(queue_age_s=90, update_duration_ms=14000),
+        }
+    )
+
+    assert reports["A"].level is AlertLevel.OK
+    assert reports["A"].bottleneck is None
+    # Both are warnings, the queue is 1.5 times its threshold
+    assert reports["B"].level is AlertLevel.WARNING
+    assert reports["B"].bottleneck == "queue_age_s"
+    assert reports["C"].level is AlertLevel.CRITICAL
+    assert reports["C"].bottleneck == "update_duration_ms"
+    assert reports["C"].as_dict()["bottleneck_value"] == 14000
+
+
+def test_api_rates_use_the_rolling_window():
+    """Test API errors age out of the window."""
+    from custom_components.aldes.models import AlertLevel
+    from custom_components.aldes.performance import PerformanceEvaluator
+
+    metrics = ApiMetrics()
+    clock = _Clock()
+    evaluator = PerformanceEvaluator(metrics, window=300, clock=clock)
+    endpoint = metrics.endpoint("GET", URL)
+    evaluator.evaluate({"A": _device()})
+
+    clock.now = 100
+    for _ in range(5):
+        endpoint.record(100, error="HTTP 503")
+    report = evaluator.evaluate({"A": _device()})["A"]
+    assert report.measurements["api_error_rate"] == 1
+    assert report.bottleneck == "api_error_rate"
+
+    # Five fast successes later, the errors are still in the window
+    clock.now = 200
+    for _ in range(5):
+        endpoint.record(100)
+    report = evaluator.evaluate({"A": _device()})["A"]
+    assert report.measurements["api_error_rate"] == 0.5
+    assert report.level is AlertLevel.CRITICAL
+
+    # Once they are older than the window, only the successes count
+    clock.now = 400
+    for _ in range(5):
+        endpoint.record(100)
+    report = evaluator.evaluate({"A": _device()})["A"]
+    assert report.measurements["api_error_rate"] == 0
+    assert report.measurements["api_p95_latency_ms"] <= 120
+    assert report.level is AlertLevel.OK
+
+
+def test_api_rates_need_enough_requests():
+    """Test a single slow failed request does not raise an alert."""
+    from custom_components.aldes.models import AlertLevel
+    from custom_components.aldes.performance import PerformanceEvaluator
+
+    metrics = ApiMetrics()
+    metrics.endpoint("GET", URL).record(30000, error="TimeoutError")
+
+    report = PerformanceEvaluator(metrics).evaluate({"A": _device()})["A"]
+
+    assert report.measurements["api_error_rate"] is None
+    assert report.measurements["api_p95_latency_ms"] is None
+    assert report.level is AlertLevel.OK
+
+
+def test_data_staleness():
+    """Test the age of lastUpdatedDate, with or without a time zone."""
+    from custom_components.aldes.performance import data_staleness
+
+    now = datetime(2025, 1, 15, 9, 0, tzinfo=UTC)
+
+    assert data_staleness("2025-01-15T08:42:17.000Z", now) == 1063
+    assert data_staleness("2025-01-15T08:59:00", now) == 60
+    assert data_staleness("", now) is None
@@ -0,0 +1,66 @@
+"""Tests for compiled Aldes plannings."""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+# Plannings are read in the local time of Home Assistant
+TZ = ZoneInfo("Europe/Paris")
+
+
+def test_hour_encoding_round_trip():
+    """Test planning hour characters encode 0-9 then A-N."""
+    from custom_components.aldes.planning import decode_hour, encode_hour
+
+    assert [encode_hour(hour) for hour in (0, 9, 10, 20, 23)] == [
+        "0",
+        "9",
+        "A",
+        "K",
+        "N",
+    ]
+    assert all(decode_hour(encode_hour(hour)) == hour for hour in range(24))
+    assert decode_hour("Z") is None
+
+
+def test_timeline_lookup():
+    """Test the program of a slot is found from the compiled timeline."""
+    from custom_components.aldes.planning import compile_planning
+
+    timeline = compile_planning(
+        [{"command": "K6B"}, {"command": "K6C"}, "700", {"command": "bad"}]
+    )
+
+    # 2025-01-19 is a Sunday (day 6), 2025-01-13 a Monday (day 0)
+    assert timeline.program_at(datetime(2025, 1, 19, 20, 30, tzinfo=TZ)) == "B"
+    assert timeline.program_at(datetime(2025, 1, 13, 7, tzinfo=TZ)) == "0"
+    assert timeline.program_at(datetime(2025, 1, 13, 8, tzinfo=TZ)) is None
+
+
+def test_timeline_next_change():
+    """Test the next program transition is found, wrapping around the week."""
+    from custom_components.aldes.planning import EMPTY_TIMELINE, compile_planning
+
+    timeline = compile_planning([{"command": "70B"}, {"command": "80C"}])
+
+    # 2025-01-13 is a Monday
+    assert timeline.next_change(datetime(2025, 1, 13, 7, 30, tzinfo=TZ)) == datetime(
+        2025, 1, 13, 8, tzinfo=TZ
+    )
+    assert timeline.next_change(datetime(2025, 1, 13, 8, tzinfo=TZ)) == datetime(
+        2025, 1, 13, 9, tzinfo=TZ
+    )
+    assert timeline.next_change(datetime(2025, 1, 13, 10, tzinfo=TZ)) == datetime(
+        2025, 1, 20, 7, tzinfo=TZ
+    )
+    assert EMPTY_TIMELINE.next_change(datetime(2025, 1, 13, 10, tzinfo=TZ)) is None
+
+
+def test_identical_plannings_share_one_timeline():
+    """Test an unchanged planning is not compiled again."""
+    from custom_components.aldes.planning import EMPTY_TIMELINE, compile_planning
+
+    first = compile_planning([{"command": "00C"}, {"command": "10B"}])
+    second = compile_planning([{"command": "00C"}, {"command": "10B"}])
+
+    assert first is second
+    assert compile_planning([]) is EMPTY_TIMELINE
@@ -0,0 +1,72 @@
+"""Tests for the Prometheus export of the Aldes metrics."""
+
+from types import SimpleNamespace
+
+from custom_components.aldes.cache import ResponseCache
+from custom_components.aldes.metrics import ApiMetrics, LatencyHistogram
+
+BASE_URL = "https://host/aldesoc/v5/users/me/products"
+
+
+def _coordinator() -> SimpleNamespace:
+    """Return a coordinator with one request, one command and one lookup."""
+    metrics = ApiMetrics()
+    metrics.endpoint("GET", f"{BASE_URL}/MODEM").record(
+        250, bytes_in=100, error="HTTP 503"
+    )
+    metrics.record_retry("GET", f"{BASE_URL}/MODEM")
+    lane = SimpleNamespace(
+        pending=[object(), object()], succeeded=3, failed=1, verification_retries=2
+    )
+    cache = ResponseCache(max_bytes=1024)
+    cache.get("missing")
+    update_duration = LatencyHistogram()
+    update_duration.record(1500)
+    api = SimpleNamespace(metrics=metrics, lanes={'MO"DEM': lane}, cache=cache)
+    return SimpleNamespace(api=api, update_duration=update_duration)
+
+
+def test_render_metrics():
+    """Test samples are labelled per entry, endpoint and modem."""
+    from custom_components.aldes.prometheus import render_metrics
+
+    text = render_metrics({"entry1": _coordinator()})
+    lines = text.splitlines()
+
+    assert "# TYPE aldes_api_request_duration_seconds histogram" in lines
+    labels = (
+        'entry="entry1",method="GET",endpoint="/aldesoc/v5/users/me/products/{modem}"'
+    )
+    assert f"aldes_api_requests_total{{{labels}}} 1" in lines
+    assert f"aldes_api_retries_total{{{labels}}} 1" in lines
+    assert f"aldes_api_bytes_received_total{{{labels}}} 100" in lines
+    assert f'aldes_api_errors_total{{{labels},error_class="HTTP 503"}} 1' in lines
+    duration = "aldes_api_request_duration_seconds"
+    assert f'{duration}_bucket{{{labels},le="0.128"}} 0' in lines
+    assert f'{duration}_bucket{{{labels},le="0.256"}} 1' in lines
+    assert f'{duration}_bucket{{{labels},le="+Inf"}} 1' in lines
+    assert f"{duration}_sum{{{labels}}} 0.25" in lines
+
+    # Label values are escaped
+    modem = 'entry="entry1",modem="MO\\"DEM"'
+    assert f"aldes_command_queue_depth{{{modem}}} 2" in lines
+    assert f'aldes_commands_total{{{modem},outcome="success"}} 3' in lines
+    assert f'aldes_commands_total{{{modem},outcome="failure"}} 1' in lines
+    assert f"aldes_verification_retries_total{{{modem}}} 2" in lines
+
+    assert 'aldes_cache_misses_total{entry="entry1"} 1' in lines
+    assert 'aldes_cache_hit_ratio{entry="entry1"} 0.0' in lines
+    update = "aldes_coordinator_update_duration_seconds"
+    assert f'{update}_count{{entry="entry1"}} 1' in lines
+
+    # One HELP and TYPE line per family, even with several entries
+    text = render_metrics({"entry1": _coordinator(), "entry2": _coordinator()})
+    assert text.count("# TYPE aldes_api_requests_total counter") == 1
+    assert 'aldes_cache_misses_total{entry="entry2"} 1' in text
+
+
+def test_render_metrics_without_entries():
+    """Test an empty export while no entry is loaded."""
+    from custom_components.aldes.prometheus import render_metrics
+
+    assert render_metrics({}) == ""
@@ -0,0 +1,150 @@
+"""Tests for the adaptive rate limiter."""
+
+import asyncio
+
+import pytest
+
+from custom_components.aldes.rate_limiter import (
+    AdaptiveRateLimiter,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def test_parse_retry_after():
+    """Test Retry-After parsing for seconds, dates and garbage."""
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+async def test_burst_then_refill():
+    """Test tokens allow a burst and refill at the current rate."""
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(rate=1, burst=3, clock=clock)
+
+    for _ in range(3):
+        await asyncio.wait_for(limiter.acquire(), timeout=0.1)
+    assert limiter.tokens < 1
+
+    clock.now += 2
+    assert limiter.tokens == 2
+
+
+def test_rate_adapts_to_outcomes():
+    """Test fast successes raise the rate and throttling halves it."""
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(
+        rate=1, burst=3, min_rate=0.1, max_rate=2, clock=clock
+    )
+
+    limiter.record_success(0.1)
+    assert limiter.rate > 1
+
+    rate = limiter.rate
+    limiter.record_throttled(retry_after=30)
+    assert limiter.rate == rate / 2
+    assert limiter.tokens == 0
+    assert limiter.get_diagnostic_info()["blocked_for"] == 30
+
+    for _ in range(50):
+        limiter.record_success(10)
+    assert limiter.rate == 0.1
+
+
+async def test_acquire_waits_for_retry_after():
+    """Test requests are held back until the Retry-After delay has passed."""
+    limiter = AdaptiveRateLimiter(rate=100, burst=1, max_rate=100)
+    limiter.record_throttled(retry_after=0.05)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await limiter.acquire()
+    assert loop.time() - start >= 0.04
+
+
+def test_retry_after_is_capped():
+    """Test a very long Retry-After only pauses for RATE_LIMIT_MAX_DELAY."""
+    from custom_components.aldes.const import RATE_LIMIT_MAX_DELAY
+
+    limiter = AdaptiveRateLimiter(clock=FakeClock())
+    limiter.record_throttled(retry_after=3600)
+
+    assert limiter.get_diagnostic_info()["blocked_for"] == RATE_LIMIT_MAX_DELAY
+
+
+async def test_acquire_fails_fast_past_max_wait():
+    """Test a caller with a deadline is not held behind a long pause."""
+    limiter = AdaptiveRateLimiter(rate=100, burst=1, max_rate=100)
+    limiter.record_throttled(retry_after=30)
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(limiter.acquire(max_wait=1), timeout=0.1)
+    # The refused caller did not take a token
+    assert limiter.tokens >= 0
+
+
+async def test_waiting_callers_do_not_block_each_other():
+    """Test callers wait for their own slot, in order, without a lock."""
+    limiter = AdaptiveRateLimiter(rate=20, burst=1, max_rate=20)
+    await limiter.acquire()
+    loop = asyncio.get_running_loop()
+    done: list[int] = []
+
+    async def request(index: int) -> None:
+        await limiter.acquire()
+        done.append(index)
+
+    start = loop.time()
+    waiters = [asyncio.create_task(request(index)) for index in range(2)]
+    await asyncio.sleep(0)
+    # A caller with a short deadline is refused while the others wait
+    with pytest.raises(TimeoutError):
+        await limiter.acquire(max_wait=0.01)
+    await asyncio.gather(*waiters)
+
+    assert done == [0, 1]
+    # Two slots at 20 req/s after the first request
+    assert 0.08 <= loop.time() - start < 0.2
+
+
+async def test_cancelled_waiter_gives_its_slot_back():
+    """Test a caller cancelled while waiting does not keep its token."""
+    limiter = AdaptiveRateLimiter(rate=1, burst=1, max_rate=1)
+    await limiter.acquire()
+    tokens = limiter.tokens
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.tokens == pytest.approx(tokens, abs=0.01)
+
+
+async def test_waiting_caller_honours_later_retry_after():
+    """Test a Retry-After received during the wait also holds back the caller."""
+    limiter = AdaptiveRateLimiter(rate=50, burst=1, max_rate=50)
+    await limiter.acquire()
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    limiter.record_throttled(retry_after=0.1)
+    await waiter
+
+    assert loop.time() - start >= 0.09
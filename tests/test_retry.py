@@ -0,0 +1,150 @@
+"""Tests for the retry budget."""
+
+import pytest
+
+from custom_components.aldes.retry import (
+    RetryBudget,
+    RetryBudgetExhaustedError,
+    run_with_retries,
+)
+
+
+class _Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_budget_attempts_and_deadline():
+    """Test a budget is spent by its attempts or by its deadline."""
+    clock = _Clock()
+    budget = RetryBudget(2, 10, clock=clock)
+
+    budget.consume()
+    budget.consume()
+    assert budget.exhausted
+    with pytest.raises(RetryBudgetExhaustedError):
+        budget.consume()
+    assert budget.attempts == 2
+
+    budget = RetryBudget(5, 10, clock=clock)
+    clock.now = 10
+    assert budget.remaining_time() == 0
+    with pytest.raises(RetryBudgetExhaustedError):
+        budget.consume()
+
+
+def test_backoff_delay_is_capped():
+    """Test the jittered wait stays below the exponential ceiling."""
+    budget = RetryBudget(5, 300)
+
+    assert all(0 <= budget.backoff_delay(1) <= 1 for _ in range(20))
+    assert all(0 <= budget.backoff_delay(20) <= 30 for _ in range(20))
+
+
+async def test_run_with_retries_stops_at_budget(monkeypatch):
+    """Test failing attempts are retried until the budget is spent."""
+    monkeypatch.setattr(RetryBudget, "backoff_delay", lambda *_: 0.0)
+    budget = RetryBudget(3, 300)
+    calls = 0
+    retries: list[BaseException] = []
+
+    async def attempt() -> None:
+        nonlocal calls
+        calls += 1
+        msg = "down"
+        raise OSError(msg)
+
+    with pytest.raises(OSError, match="down"):
+        await run_with_retries(
+            budget, attempt, (OSError,), on_retry=lambda err, _wait: retries.append(err)
+        )
+
+    assert calls == 3
+    assert len(retries) == 2
+
+
+async def test_run_with_retries_shared_budget(monkeypatch):
+    """Test calls drawing from one budget are capped together."""
+    monkeypatch.setattr(RetryBudget, "backoff_delay", lambda *_: 0.0)
+    budget = RetryBudget(4, 300)
+    results = iter([OSError("down"), "ok"])
+
+    async def attempt() -> str:
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert await run_with_retries(budget, attempt, (OSError,)) == "ok"
+    assert budget.remaining_attempts == 2
+
+    async def failing() -> None:
+        msg = "down"
+        raise OSError(msg)
+
+    with pytest.raises(OSError, match="down"):
+        await run_with_retries(budget, failing, (OSError,))
+    assert budget.exhausted
+
+
+async def test_run_with_retries_waits_fit_the_deadline(monkeypatch):
+    """Test waits shrink near the deadline and stop when no time is left."""
+    from custom_components.aldes import retry as retry_module
+
+    clock = _Clock()
+    waits: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        waits.append(delay)
+        clock.now += delay
+
+    monkeypatch.setattr(retry_module.asyncio, "sleep", sleep)
+    monkeypatch.setattr(RetryBudget, "backoff_delay", lambda *_: 20.0)
+    budget = RetryBudget(10, 10, clock=clock)
+    calls = 0
+
+    async def attempt() -> None:
+        nonlocal calls
+        calls += 1
+        clock.now += 1
+        msg = "down"
+        raise OSError(msg)
+
+    with pytest.raises(OSError, match="down"):
+        await run_with_retries(budget, attempt, (OSError,))
+
+    # Half the time left is waited each time, until less than 1 s is left
+    assert waits == [4.5, 1.75]
+    assert calls == 3
+    assert clock.now < 10
+
+
+async def test_other_errors_are_not_retried():
+    """Test errors outside retry_on are raised at once."""
+    budget = RetryBudget(5, 300)
+
+    async def attempt() -> None:
+        msg = "bad"
+        raise ValueError(msg)
+
+    with pytest.raises(ValueError, match="bad"):
+        await run_with_retries(budget, attempt, (OSError,))
+    assert budget.attempts == 1
+
+
+async def test_budget_exhaustion_is_not_retried():
+    """Test an attempt refused for lack of budget ends the retries."""
+    budget = RetryBudget(5, 300)
+
+    async def attempt() -> None:
+        msg = "deadline"
+        raise RetryBudgetExhaustedError(msg)
+
+    with pytest.raises(RetryBudgetExhaustedError):
+        await run_with_retries(budget, attempt, (TimeoutError,))
+    assert budget.attempts == 1
@@ -0,0 +1,77 @@
+"""Tests for the persisted /products snapshot."""
+
+from typing import Any
+
+from custom_components.aldes.snapshot import DeviceSnapshot
+
+_PAYLOAD = [{"modem": "MODEM", "reference": "TONE_AIR", "indicator": {}}]
+
+
+class _Store:
+    """In-memory stand-in for a Home Assistant Store."""
+
+    def __init__(self, data: Any = None, error: Exception | None = None) -> None:
+        self.data = data
+        self.error = error
+        self.saves: list[dict[str, Any]] = []
+
+    async def async_load(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.data
+
+    def async_delay_save(self, data_func: Any, delay: float) -> None:
+        self.saves.append(data_func())
+
+
+async def test_restore_from_valid_snapshot():
+    """Test the devices of a stored payload are restored."""
+    store = _Store({"products": _PAYLOAD, "saved_at": "2025-01-15T08:42:17"})
+    snapshot = DeviceSnapshot(store)
+
+    devices = await snapshot.async_load()
+
+    assert list(devices) == ["MODEM"]
+    # The restored payload is not saved back
+    snapshot.save(store.data["products"], {})
+    assert store.saves == []
+
+
+async def test_empty_or_corrupt_snapshot_is_ignored():
+    """Test missing, empty, malformed and unreadable snapshots restore nothing."""
+    for store in (
+        None,
+        _Store(None),
+        _Store({}),
+        _Store({"products": []}),
+        _Store({"products": "garbage"}),
+        _Store({"products": [{"no_modem": True}]}),
+        _Store(["not", "a", "dict"]),
+        _Store(error=ValueError("bad json")),
+    ):
+        assert await DeviceSnapshot(store).async_load() is None
+
+
+def test_save_skips_polls_changing_only_timestamps():
+    """Test a poll is saved only when it changed more than timestamps."""
+    store = _Store()
+    snapshot = DeviceSnapshot(store)
+
+    snapshot.save(None, {})
+    # Nothing saved yet: the first payload is always saved
+    snapshot.save(_PAYLOAD, {"MODEM": frozenset({"last_updated_date"})})
+    assert [save["products"] for save in store.saves] == [_PAYLOAD]
+
+    # Every poll returns a new payload, with at least a new timestamp
+    snapshot.save([dict(_PAYLOAD[0])], {"MODEM": frozenset({"last_updated_date"})})
+    snapshot.save([dict(_PAYLOAD[0])], {})
+    assert len(store.saves) == 1
+
+    changed = [dict(_PAYLOAD[0])]
+    snapshot.save(
+        changed,
+        {"MODEM": frozenset({"last_updated_date", "indicator.current_air_mode"})},
+    )
+    added = [dict(_PAYLOAD[0])]
+    snapshot.save(added, {"OTHER": None})
+    assert [save["products"] for save in store.saves[1:]] == [changed, added]
@@ -0,0 +1,84 @@
+"""Tests for the Aldes access token manager."""
+
+import asyncio
+import base64
+import json
+import time
+
+
+def _make_jwt(exp: float) -> str:
+    """Build an unsigned JWT carrying the given expiry."""
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).rstrip(b"=")
+    return f"header.{payload.decode()}.signature"
+
+
+def test_get_token_expiry():
+    """Test the expiry is read from the JWT exp claim."""
+    from custom_components.aldes.token_manager import get_token_expiry
+
+    assert get_token_expiry(_make_jwt(1_700_000_000)) == 1_700_000_000
+    assert get_token_expiry("") is None
+    assert get_token_expiry("not-a-jwt") is None
+
+
+async def test_renew_prefers_refresh_token():
+    """Test renewal uses the refresh_token grant when one is known."""
+    from unittest.mock import AsyncMock
+
+    from custom_components.aldes.token_manager import TokenManager
+
+    new_token = _make_jwt(time.time() + 3600)
+    refresh_grant = AsyncMock(
+        return_value={"access_token": new_token, "refresh_token": "rotated"}
+    )
+    password_grant = AsyncMock()
+    manager = TokenManager(refresh_grant, password_grant)
+    manager.update({"access_token": _make_jwt(time.time()), "refresh_token": "r1"})
+
+    await manager.renew()
+
+    refresh_grant.assert_awaited_once_with("r1")
+    password_grant.assert_not_awaited()
+    assert manager.access_token == new_token
+    assert manager.get_diagnostic_info()["refresh_count"] == 1
+
+
+async def test_renew_falls_back_to_password_grant():
+    """Test a failing refresh falls back to the password grant."""
+    from unittest.mock import AsyncMock
+
+    from custom_components.aldes.token_manager import TokenManager
+
+    refresh_grant = AsyncMock(side_effect=RuntimeError("invalid_grant"))
+    password_grant = AsyncMock()
+    manager = TokenManager(refresh_grant, password_grant)
+    manager.update({"access_token": _make_jwt(time.time()), "refresh_token": "r1"})
+
+    await manager.renew()
+
+    password_grant.assert_awaited_once()
+    assert manager.password_fallback_count == 1
+
+
+async def test_background_refresh_before_expiry():
+    """Test the token is renewed in the background once inside the margin."""
+    from custom_components.aldes.token_manager import TokenManager
+
+    renewed = asyncio.Event()
+
+    async def refresh_grant(refresh_token: str) -> dict:
+        renewed.set()
+        return {"access_token": _make_jwt(time.time() + 3600)}
+
+    async def password_grant() -> None:
+        msg = "password grant should not be used"
+        raise AssertionError(msg)
+
+    manager = TokenManager(refresh_grant, password_grant, margin=60)
+    manager.update({"access_token": _make_jwt(time.time() + 30), "refresh_token": "r1"})
+    manager.start()
+
+    await asyncio.wait_for(renewed.wait(), timeout=1)
+    await asyncio.sleep(0)
+    assert manager.expires_at > time.time() + 3000
+    await manager.stop()